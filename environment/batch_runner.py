@@ -0,0 +1,168 @@
+"""
+Batch episode runner
+
+Runs a persona × goal × seed matrix of simulated conversations across a
+process pool and appends one JSON line per finished episode to a results
+file. Episodes are almost entirely network-bound (LLM and tool API calls),
+so running them side by side is what makes large sweeps practical.
+
+Personas are referenced by their module path under `user_simulator.persona`
+(e.g. "JsonPersona.persona_2"). Goals are looked up in the persona module's
+own GOALS dict, or in the GoalBased module with the same name.
+
+`arun_batch` is the asyncio-native alternative: episodes interleave on a
+single event loop (bounded by a concurrency cap) instead of each one
+occupying an OS process.
+"""
+
+from argparse import Namespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from importlib import import_module
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import random
+import time
+
+from tools import http_client
+
+
+LOGGER = logging.getLogger("environment.batch")
+PERSONA_PACKAGE = "user_simulator.persona"
+
+
+@dataclass(frozen=True)
+class EpisodeSpec:
+    persona: str
+    goal: str
+    seed: int
+
+
+def build_matrix(personas: Iterable[str], goals: Iterable[str], seeds: Iterable[int]) -> List[EpisodeSpec]:
+    """Return the cartesian product of personas, goals and seeds."""
+    return [EpisodeSpec(p, g, s) for p, g, s in product(personas, goals, seeds)]
+
+
+def load_persona(persona: str, goal: str) -> Tuple[str, str, str]:
+    """Resolve (persona_text, raw_review, goal_text) for a persona module path."""
+    module = import_module(f"{PERSONA_PACKAGE}.{persona}")
+    goals: Optional[Dict[str, str]] = getattr(module, "GOALS", None)
+    if goals is None:
+        basename = persona.rsplit(".", 1)[-1]
+        goals_module = import_module(f"{PERSONA_PACKAGE}.GoalBased.{basename}")
+        goals = getattr(goals_module, "GOALS", {})
+    if goal not in goals:
+        raise KeyError(f"Goal {goal!r} not defined for persona {persona!r}")
+    return module.PERSONA, module.RAW_REVIEW, goals[goal]
+
+
+def _build_episode(spec: EpisodeSpec, evaluate: bool):
+    from recommender.basic_recommender.implementation import RecommenderImplementation
+    from user_simulator.simulator.implementation import UserImplementation
+    from environment.environment import Environment
+
+    persona, raw_review, goal = load_persona(spec.persona, spec.goal)
+    args = Namespace(chat=False, verbose=False, evaluate=evaluate)
+    recommender = RecommenderImplementation()
+    user = UserImplementation(args, persona=persona, raw_review=raw_review, goal=goal)
+    return Environment(args, user, recommender)
+
+
+def _finish_record(record: dict, env, outcome, error: Optional[Exception], started: float) -> dict:
+    record["outcome"] = outcome
+    record["turns"] = sum(1 for m in env.conversation_log if m["role"] == "user") if env else None
+    record["error"] = f"{type(error).__name__}: {error}" if error else None
+    record["turn_latencies"] = env.turn_latencies if env else None
+    record["duration_s"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def run_episode(spec: EpisodeSpec, evaluate: bool = False) -> dict:
+    """Run a single simulated conversation and return its result record.
+
+    Executed inside worker processes, so imports of the heavy recommender /
+    simulator stacks happen here rather than at module import time.
+    """
+    random.seed(spec.seed)
+    started = time.perf_counter()
+    env, outcome, error = None, None, None
+    try:
+        env = _build_episode(spec, evaluate)
+        outcome = env.run()
+    except Exception as e:
+        LOGGER.exception(f"Episode failed: {spec}")
+        error = e
+    return _finish_record(asdict(spec), env, outcome, error, started)
+
+
+async def arun_episode(spec: EpisodeSpec, evaluate: bool = False) -> dict:
+    """Async variant of `run_episode` for use on a shared event loop."""
+    # Seeding a process-wide RNG is only meaningful before the episode's
+    # first await; location sampling happens during construction.
+    random.seed(spec.seed)
+    started = time.perf_counter()
+    env, outcome, error = None, None, None
+    try:
+        env = _build_episode(spec, evaluate)
+        outcome = await env.arun()
+    except Exception as e:
+        LOGGER.exception(f"Episode failed: {spec}")
+        error = e
+    return _finish_record(asdict(spec), env, outcome, error, started)
+
+
+def run_batch(specs: List[EpisodeSpec], output_path: str, workers: int = 8, evaluate: bool = False) -> int:
+    """Run episodes on a process pool, appending each result to `output_path` as JSONL.
+
+    Results are written as soon as each episode finishes, so a partially
+    completed batch still leaves usable output behind.
+    :return: number of episodes that finished without error
+    """
+    succeeded = 0
+    print(f"Running {len(specs)} episodes with {workers} workers -> {output_path}")
+    with open(output_path, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_episode, spec, evaluate): spec for spec in specs}
+        for done, future in enumerate(as_completed(futures), start=1):
+            record = future.result()
+            out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+            if record["error"] is None:
+                succeeded += 1
+            print(f"[{done}/{len(specs)}] {futures[future]} -> "
+                  f"{(record['outcome'] or {}).get('decision')} in {record['duration_s']}s")
+    return succeeded
+
+
+async def arun_batch(specs: List[EpisodeSpec], output_path: str, concurrency: int = 64,
+                     evaluate: bool = False) -> int:
+    """Run episodes concurrently on the current event loop, at most `concurrency` at a time.
+
+    :return: number of episodes that finished without error
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    succeeded = 0
+
+    async def _bounded(spec: EpisodeSpec) -> dict:
+        async with semaphore:
+            return await arun_episode(spec, evaluate)
+
+    print(f"Running {len(specs)} episodes with concurrency {concurrency} -> {output_path}")
+    try:
+        with open(output_path, "a", encoding="utf-8") as out:
+            tasks = [asyncio.create_task(_bounded(spec)) for spec in specs]
+            for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+                record = await task
+                out.write(json.dumps(record, default=str) + "\n")
+                out.flush()
+                if record["error"] is None:
+                    succeeded += 1
+                print(f"[{done}/{len(specs)}] {record['persona']}/{record['goal']}/{record['seed']} -> "
+                      f"{(record['outcome'] or {}).get('decision')} in {record['duration_s']}s")
+    finally:
+        # Episodes share the loop's HTTP client; release its connections with the batch
+        await http_client.aclose()
+    return succeeded
@@ -0,0 +1,161 @@
+"""
+Record / replay cassettes for LLM and HTTP calls
+
+A cassette stores every external request/response an episode makes on disk,
+keyed by a stable hash of the request. In "record" mode calls go to the
+network and their responses are saved; in "replay" mode responses are served
+from disk and a missing entry raises `CassetteMiss`. With mode "off" (the
+default) the layer is a pass-through.
+
+Configured via `configure_cassette(mode, directory)` or the CASSETTE_MODE /
+CASSETTE_DIR environment variables. Covered call sites:
+- LangChain chat models (ChatOpenAI) through the global LLM cache hook
+- litellm completions made by the user simulator
+- HTTP requests made through tools.http_client (FuelEconomy.gov, NHTSA,
+  Auto.dev and Nominatim)
+
+Replaying a simulated episode also requires a fixed seed, since the user
+simulator samples its location at random.
+"""
+
+from typing import Any, Callable, Optional, Sequence
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from langchain_core.caches import BaseCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import Generation
+
+
+LOGGER = logging.getLogger("cassette")
+MODES = ("off", "record", "replay")
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+class Cassette:
+    def __init__(self, mode: str = "off", directory: str = "cassettes"):
+        if mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {MODES}")
+        self.mode = mode
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, request: Any) -> str:
+        payload = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(f"{kind}\n{payload}".encode("utf-8")).hexdigest()
+
+    def _path(self, kind: str, key: str) -> str:
+        return os.path.join(self.directory, kind, f"{key}.json")
+
+    def lookup(self, kind: str, request: Any) -> Any:
+        path = self._path(kind, self.key(kind, request))
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            raise CassetteMiss(f"No recorded {kind} response for request {request!r}")
+
+    def store(self, kind: str, request: Any, response: Any) -> None:
+        path = self._path(kind, self.key(kind, request))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"kind": kind, "request": request, "response": response}, f, default=str)
+            os.replace(tmp_path, path)
+
+    def call(self, kind: str, request: Any, fn: Callable[[], Any]) -> Any:
+        """Serve `request` from the cassette or execute `fn` (recording its result)."""
+        if self.mode == "replay":
+            return self.lookup(kind, request)
+        response = fn()
+        if self.mode == "record":
+            self.store(kind, request, response)
+        return response
+
+    async def acall(self, kind: str, request: Any, afn: Callable[[], Any]) -> Any:
+        """Async counterpart of `call`; `afn` returns an awaitable."""
+        if self.mode == "replay":
+            return self.lookup(kind, request)
+        response = await afn()
+        if self.mode == "record":
+            self.store(kind, request, response)
+        return response
+
+
+def _strip_message_ids(node: Any) -> Any:
+    """Drop per-run message ids (uuid4 assigned by add_messages) from a serialized prompt."""
+    if isinstance(node, dict):
+        out = {k: _strip_message_ids(v) for k, v in node.items()}
+        kwargs = out.get("kwargs")
+        if out.get("lc") and isinstance(kwargs, dict):
+            kwargs.pop("id", None)
+        return out
+    if isinstance(node, list):
+        return [_strip_message_ids(v) for v in node]
+    return node
+
+
+class CassetteLLMCache(BaseCache):
+    """LangChain cache adapter so every chat model call goes through the cassette."""
+
+    KIND = "langchain"
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def _request(self, prompt: str, llm_string: str) -> dict:
+        try:
+            prompt_obj = _strip_message_ids(json.loads(prompt))
+        except json.JSONDecodeError:
+            prompt_obj = prompt
+        return {"prompt": prompt_obj, "llm": llm_string}
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        if self.cassette.mode == "off":
+            return None
+        try:
+            recorded = self.cassette.lookup(self.KIND, self._request(prompt, llm_string))
+        except CassetteMiss:
+            if self.cassette.mode == "replay":
+                raise
+            return None
+        return [loads(g) for g in recorded]
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        if self.cassette.mode == "record":
+            self.cassette.store(self.KIND, self._request(prompt, llm_string), [dumps(g) for g in return_val])
+
+    def clear(self, **kwargs: Any) -> None:
+        pass
+
+
+CASSETTE = Cassette(os.getenv("CASSETTE_MODE", "off"), os.getenv("CASSETTE_DIR", "cassettes"))
+
+
+def configure_cassette(mode: str, directory: Optional[str] = None) -> Cassette:
+    """Switch the process-wide cassette mode and install the LangChain cache hook."""
+    global CASSETTE
+    CASSETTE = Cassette(mode, directory or CASSETTE.directory)
+    # Export so spawned worker processes (batch runner) pick up the same setup
+    os.environ["CASSETTE_MODE"] = CASSETTE.mode
+    os.environ["CASSETTE_DIR"] = CASSETTE.directory
+    set_llm_cache(CassetteLLMCache(CASSETTE) if mode != "off" else None)
+    LOGGER.info(f"Cassette mode={mode} directory={CASSETTE.directory}")
+    return CASSETTE
+
+
+def get_cassette() -> Cassette:
+    return CASSETTE
+
+
+if CASSETTE.mode != "off":
+    set_llm_cache(CassetteLLMCache(CASSETTE))
@@ -2,7 +2,9 @@ from user_simulator.user_interface import IUserSimulator
 from recommender.recommender_interface import IRecommenderSystem
 from judge.judge_interface import IJudge
 from evaluation.conversation_evaluator import ConversationEvaluator
+import asyncio
 import re
+import time
 
 
 class Environment:
@@ -12,6 +14,7 @@ class Environment:
         self.recommender = recommender
         self.conversation_log = []
         self.outcome = None  # store outcome as dict
+        self.turn_latencies = []  # per recommender turn: time to first token and total
 
     def run(self):
         print("Environment is running ...")
@@ -20,6 +23,7 @@ class Environment:
         next_recommender_response = None
         self.conversation_log = []
         self.outcome = None
+        self.turn_latencies = []
 
         while True:
             # User simulation or direct chat
@@ -32,36 +36,129 @@ class Environment:
                 user_msg = self.user.chat(next_recommender_response)
             self.conversation_log.append({"role": "user", "content": user_msg})
             # End of conversation
-            if "###BUY###" in user_msg or "###ABORT###" in user_msg:
-                if self.args.verbose:
-                    print("\n" + "*"*90 + "\n" + f"User: {user_msg}")
+            if self._is_terminal(user_msg):
+                break  # terminate loop
+
+            # Recommender simulation
+            if not self.args.chat:
+                print("\n" + "="*90 + "\n" + f"User: {user_msg}")
+            next_recommender_response = self._print_reply(self.recommender.stream(user_msg))
+            self.conversation_log.append({"role": "assistant", "content": next_recommender_response})
 
-                if "###BUY###" in user_msg and self.args.evaluate:
-                    match = re.search(r"^(.*?)###BUY###", user_msg.strip(), re.IGNORECASE)
-                    car_name = match.group(1).strip() if match and match.group(1).strip() else None
-                    self.outcome = {"decision": "BUY", "car_name": car_name}
+        # ---- run evaluator AFTER loop ends ----
+        if self.outcome and self.args.evaluate:
+            evaluator = self._build_evaluator()
+            extra_metrics = evaluator.evaluate_all()
+            self.outcome.update(extra_metrics)
+
+            print(f"\nConversation Outcome: {self.outcome}")
+
+        return self.outcome
+
+    async def arun(self):
+        """Async counterpart of `run`, so many episodes can share one event loop."""
+        print("Environment is running ...")
+        print("-" * 40)
 
-                elif "###ABORT###" in user_msg and self.args.evaluate:
-                    self.outcome = {"decision": "ABORT", "car_name": None}
+        next_recommender_response = None
+        self.conversation_log = []
+        self.outcome = None
+        self.turn_latencies = []
 
+        while True:
+            # User simulation or direct chat
+            if self.args.chat:
+                user_msg = (await asyncio.to_thread(input, "You: ")).strip()
+                if user_msg.lower() in {"exit", "quit"}:
+                    self.outcome = {"decision": "EXIT", "car_name": None}
+                    break
+            else:
+                user_msg = await self.user.achat(next_recommender_response)
+            self.conversation_log.append({"role": "user", "content": user_msg})
+            # End of conversation
+            if self._is_terminal(user_msg):
                 break  # terminate loop
 
             # Recommender simulation
             if not self.args.chat:
                 print("\n" + "="*90 + "\n" + f"User: {user_msg}")
-            next_recommender_response = self.recommender.chat(user_msg)
+            next_recommender_response = await self._aprint_reply(self.recommender.astream(user_msg))
             self.conversation_log.append({"role": "assistant", "content": next_recommender_response})
-            print("\n" + "="*90 + "\n" + f"Recommender: {next_recommender_response}")
 
         # ---- run evaluator AFTER loop ends ----
         if self.outcome and self.args.evaluate:
-            user_location = getattr(self.user, "location", None) if not self.args.chat else None
-            evaluator = ConversationEvaluator(self.args, self.conversation_log, user_location)
-            extra_metrics = evaluator.evaluate_all()
+            evaluator = self._build_evaluator()
+            extra_metrics = await asyncio.to_thread(evaluator.evaluate_all)
             self.outcome.update(extra_metrics)
 
             print(f"\nConversation Outcome: {self.outcome}")
 
+        return self.outcome
+
+    def _streams_tokens(self) -> bool:
+        # Token-by-token output is for a person watching; episodes run concurrently
+        # (batch) would interleave their replies, so they print each reply once
+        return bool(self.args.chat or self.args.verbose)
+
+    def _print_reply(self, tokens) -> str:
+        """Print a streamed reply (as it arrives in chat/verbose mode) and record its latencies."""
+        started, first, parts = time.perf_counter(), None, []
+        for token in tokens:
+            first = self._take_token(token, parts, first)
+        return self._finish_reply(parts, started, first)
+
+    async def _aprint_reply(self, tokens) -> str:
+        started, first, parts = time.perf_counter(), None, []
+        async for token in tokens:
+            first = self._take_token(token, parts, first)
+        return self._finish_reply(parts, started, first)
+
+    def _take_token(self, token: str, parts, first):
+        if first is None:
+            first = time.perf_counter()
+            if self._streams_tokens():
+                print("\n" + "="*90 + "\n" + "Recommender: ", end="", flush=True)
+        parts.append(token)
+        if self._streams_tokens():
+            print(token, end="", flush=True)
+        return first
+
+    def _finish_reply(self, parts, started: float, first) -> str:
+        done = time.perf_counter()
+        self.turn_latencies.append({
+            "ttft_s": round((first or done) - started, 3),
+            "total_s": round(done - started, 3),
+        })
+        reply = "".join(parts)
+        if self._streams_tokens():
+            print()
+        else:
+            print("\n" + "="*90 + "\n" + f"Recommender: {reply}", flush=True)
+        if self.args.verbose:
+            print(f"[latency] {self.turn_latencies[-1]}")
+        return reply
+
+    def _is_terminal(self, user_msg: str) -> bool:
+        """Record the outcome and return True if the user ended the conversation."""
+        if "###BUY###" not in user_msg and "###ABORT###" not in user_msg:
+            return False
+
+        if self.args.verbose:
+            print("\n" + "*"*90 + "\n" + f"User: {user_msg}")
+
+        if "###BUY###" in user_msg:
+            match = re.search(r"^(.*?)###BUY###", user_msg.strip(), re.IGNORECASE)
+            car_name = match.group(1).strip() if match and match.group(1).strip() else None
+            self.outcome = {"decision": "BUY", "car_name": car_name}
+
+        elif "###ABORT###" in user_msg:
+            self.outcome = {"decision": "ABORT", "car_name": None}
+
+        return True
+
+    def _build_evaluator(self) -> ConversationEvaluator:
+        user_location = getattr(self.user, "location", None) if not self.args.chat else None
+        return ConversationEvaluator(self.args, self.conversation_log, user_location)
 
     def evaluate(self, judge: IJudge):
         print("Evaluation is running ...")
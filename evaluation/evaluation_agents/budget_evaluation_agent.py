@@ -1,7 +1,7 @@
 import logging
 from typing import List, Optional
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
+from llm_provider.provider import get_chat_model
 from langchain.schema import SystemMessage, HumanMessage
 
 LOGGER = logging.getLogger(__name__)
@@ -60,7 +60,7 @@ class BudgetEvalInput(BaseModel):
 def run_budget_eval_agent(conversation_log, budget) -> str:
     LOGGER.info("BudgetEvalAgent start")
 
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.0)
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0.0)
 
     conv_text = "\n".join([f"{m['role']}: {m['content']}" for m in conversation_log])
 
@@ -1,18 +1,18 @@
 from typing import Optional, List
 from pydantic import BaseModel, Field
 import logging
-from langchain_openai import ChatOpenAI
+from llm_provider.provider import get_chat_model, get_compiled
 from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.tools import StructuredTool
-from tools.distance_checker import distance_check
+from tools.distance_checker import distance_batch_check, distance_check
 
 AGENT_SYSTEM_PROMPT = """
 You are a Dealer Range Evaluation Specialist.
 Your job:
 1. Scan the provided conversation log (assistant and user messages) for dealer mentions.
 2. Extract each dealer’s city and state robustly, using flexible parsing rules.
-3. For each city/state found, call the 'distance_check' tool to verify distance from user.
+3. Verify the distance of every city/state found with ONE 'distance_batch_check' call (use 'distance_check' only for a single dealer).
 4. OUTPUT RULE: Return ONLY the word True, False, or None — in lowercase or uppercase — on a single line, with no explanation, no extra text, no markdown.
 
 Rules:
@@ -32,13 +32,16 @@ class DealerRangeQueryInput(BaseModel):
     user_state: str = Field(..., description="State of the user")
     threshold_miles: Optional[int] = Field(100, description="Maximum allowed distance in miles")
 
+def _build_agent():
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0.1)
+    tools = [DistanceCheckTool, distance_batch_check]
+
+    return create_react_agent(model=llm, tools=tools)
+
 def run_dealer_eval_agent(conversation_log, user_city, user_state, threshold_miles=100) -> str:
     LOGGER.info("DealerEvalAgent start")
     
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
-    tools = [DistanceCheckTool]
-    
-    agent = create_react_agent(model=llm, tools=tools)
+    agent = get_compiled("dealer_eval_agent", _build_agent)
 
     # Convert conversation log to readable text form
     conv_text = "\n".join([f"{m['role']}: {m['content']}" for m in conversation_log])
@@ -1,7 +1,7 @@
 from typing import Optional, List
 from pydantic import BaseModel, Field
 import logging
-from langchain_openai import ChatOpenAI
+from llm_provider.provider import get_chat_model
 from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import SystemMessage, HumanMessage
 
@@ -39,7 +39,7 @@ class ShortlistEvalInput(BaseModel):
 def run_shortlist_eval_agent(conversation_log, max_items=5) -> str:
     LOGGER.info("ShortlistEvalAgent start")
 
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.0)
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0.0)
 
     conv_text = "\n".join([f"{m['role']}: {m['content']}" for m in conversation_log])
 
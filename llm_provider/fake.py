@@ -0,0 +1,170 @@
+"""
+Deterministic fake models for load and overhead benchmarking
+
+`FakeChatModel` is a LangChain chat model that never touches the network.
+It sleeps for a configurable latency and then answers from a script, so the
+LangGraph pipeline, tool parsing and state handling can be profiled on an
+offline machine.
+
+Script format (JSON, see `load_script`):
+{
+  "chat": [                                   # cycled, one step per call
+    {"content": "Here are two trucks ..."},
+    {"tool_calls": [{"name": "nhtsa_agent", "args": {"make": "Toyota"}}]}
+  ],
+  "user": ["I need a truck", "I'm in Austin, TX 78701", "###ABORT###"]
+}
+
+Rules for chat steps:
+- When a tool is forced (structured output), the model calls that tool with
+  the args from the step if it names the same tool, otherwise with `{}`.
+- A tool-call step is only emitted if the tools are bound and the last
+  message is not a tool result, so react agents always terminate. Its
+  "content", if any, is sent along with the calls.
+- When streamed, the latency is paid before the first chunk and text
+  replies are split into word-sized chunks.
+"""
+
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence
+import asyncio
+import itertools
+import json
+import re
+import threading
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+
+DEFAULT_CHAT_REPLY = "Here are a couple of options that match your profile. Which one would you like details on?"
+DEFAULT_USER_LINES = [
+    "I'm looking for a reliable truck, budget is around 40k.",
+    "I'm in Austin, Texas, 78701.",
+    "How do their safety ratings compare?",
+]
+
+
+def load_script(path: Optional[str]) -> Dict[str, Any]:
+    if not path:
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FakeChatModel(BaseChatModel):
+    """Scripted chat model with configurable latency and tool-call support."""
+
+    latency: float = 0.0
+    script: List[Dict[str, Any]] = []
+    model_name: str = "fake-chat"
+
+    _cursor: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        self._cursor = itertools.cycle(self.script) if self.script else None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name, "latency": self.latency}
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Optional[Any] = None, **kwargs: Any):
+        formatted = [convert_to_openai_tool(t) for t in tools]
+        return self.bind(tools=formatted, tool_choice=tool_choice, **kwargs)
+
+    def _next_step(self) -> Dict[str, Any]:
+        if self._cursor is None:
+            return {}
+        with self._lock:
+            return next(self._cursor)
+
+    def _respond(self, messages: List[BaseMessage], tools: Optional[List[dict]],
+                 tool_choice: Optional[Any]) -> AIMessage:
+        step = self._next_step()
+        tool_names = [t["function"]["name"] for t in tools or []]
+
+        forced = None
+        if tool_names and tool_choice not in (None, "auto", "none"):
+            if isinstance(tool_choice, dict):
+                forced = tool_choice.get("function", {}).get("name")
+            elif isinstance(tool_choice, str) and tool_choice in tool_names:
+                forced = tool_choice
+            else:
+                forced = tool_names[0]
+        if forced:
+            args = next((c.get("args", {}) for c in step.get("tool_calls", []) if c.get("name") == forced), {})
+            return AIMessage(content="", tool_calls=[_tool_call(0, forced, args)])
+
+        calls = step.get("tool_calls")
+        after_tool = bool(messages) and isinstance(messages[-1], ToolMessage)
+        if calls and not after_tool and all(c.get("name") in tool_names for c in calls):
+            return AIMessage(content=step.get("content", ""),
+                             tool_calls=[_tool_call(i, c["name"], c.get("args", {})) for i, c in enumerate(calls)])
+        return AIMessage(content=step.get("content", DEFAULT_CHAT_REPLY))
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        message = self._respond(messages, kwargs.get("tools"), kwargs.get("tool_choice"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        message = self._respond(messages, kwargs.get("tools"), kwargs.get("tool_choice"))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        if self.latency:
+            time.sleep(self.latency)
+        message = self._respond(messages, kwargs.get("tools"), kwargs.get("tool_choice"))
+        for chunk in _chunks(message):
+            if run_manager and chunk.message.content:
+                run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Any = None, **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        message = self._respond(messages, kwargs.get("tools"), kwargs.get("tool_choice"))
+        for chunk in _chunks(message):
+            if run_manager and chunk.message.content:
+                await run_manager.on_llm_new_token(chunk.message.content, chunk=chunk)
+            yield chunk
+
+
+def _chunks(message: AIMessage) -> List[ChatGenerationChunk]:
+    words = re.findall(r"\S+\s*|\s+", message.content)
+    chunks = [ChatGenerationChunk(message=AIMessageChunk(content=word)) for word in words]
+    if message.tool_calls:
+        chunks.append(ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=[
+            {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+            for i, c in enumerate(message.tool_calls)
+        ])))
+    return chunks or [ChatGenerationChunk(message=AIMessageChunk(content=""))]
+
+
+def _tool_call(index: int, name: str, args: Dict[str, Any]) -> Dict[str, Any]:
+    return {"name": name, "args": args, "id": f"call_{index}_{name}", "type": "tool_call"}
+
+
+def fake_user_reply(messages: List[Dict[str, str]], lines: Optional[List[str]] = None) -> str:
+    """Scripted user-simulator reply; aborts the conversation once the lines run out."""
+    turn = sum(1 for m in messages if m.get("role") == "assistant")
+    lines = lines or DEFAULT_USER_LINES
+    if turn >= len(lines):
+        return "###ABORT###"
+    return lines[turn]
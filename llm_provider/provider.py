@@ -0,0 +1,157 @@
+"""
+Pluggable LLM provider
+
+Single place where chat models and raw completions are created, so the
+whole stack (recommender nodes, specialist agents, evaluators and the user
+simulator) can be switched from OpenAI to the local scripted fake model.
+
+Configuration (environment or `configure_provider`):
+- LLM_PROVIDER      "openai" (default) or "fake"
+- FAKE_LLM_LATENCY  seconds each fake call sleeps (default 0)
+- FAKE_LLM_SCRIPT   path to a JSON script, see llm_provider.fake
+
+Models are pooled: identical (model, temperature, kwargs) requests share one
+client and therefore one HTTP connection pool. Objects compiled on top of
+them (react agents, structured-output runnables) are kept in a registry via
+`get_compiled`. Both are reset when the provider is reconfigured.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from langchain_core.language_models.chat_models import BaseChatModel
+
+from environment.cassette import get_cassette
+from llm_provider.fake import FakeChatModel, fake_user_reply, load_script
+
+
+LOGGER = logging.getLogger("llm_provider")
+PROVIDERS = ("openai", "fake")
+
+T = TypeVar("T")
+
+_config: Dict[str, Any] = {}
+_models: Dict[Tuple, BaseChatModel] = {}
+_compiled: Dict[str, Any] = {}
+_lock = threading.RLock()
+
+
+def configure_provider(provider: str, latency: Optional[float] = None, script_path: Optional[str] = None) -> None:
+    """Select the provider for every model created afterwards."""
+    if provider not in PROVIDERS:
+        raise ValueError(f"Unknown LLM provider {provider!r}; expected one of {PROVIDERS}")
+    with _lock:
+        _models.clear()
+        _compiled.clear()
+        _config.clear()
+        _config.update({
+            "provider": provider,
+            "latency": float(latency) if latency is not None else float(os.getenv("FAKE_LLM_LATENCY", "0")),
+            "script": load_script(script_path or os.getenv("FAKE_LLM_SCRIPT")),
+        })
+    # Export so spawned worker processes (batch runner) use the same provider
+    os.environ["LLM_PROVIDER"] = provider
+    os.environ["FAKE_LLM_LATENCY"] = str(_config["latency"])
+    if script_path:
+        os.environ["FAKE_LLM_SCRIPT"] = script_path
+    LOGGER.info(f"LLM provider={provider} latency={_config['latency']}")
+
+
+def _settings() -> Dict[str, Any]:
+    if not _config:
+        with _lock:
+            if not _config:
+                configure_provider(os.getenv("LLM_PROVIDER", "openai"))
+    return _config
+
+
+def current_provider() -> str:
+    """Name of the configured provider ("openai" or "fake")."""
+    return _settings()["provider"]
+
+
+def get_chat_model(model: str = "gpt-4o-mini", temperature: float = 0.1, **kwargs: Any) -> BaseChatModel:
+    """Return a pooled LangChain chat model for the configured provider.
+
+    Chat models are safe to share between threads and sessions; reusing one
+    keeps its HTTP connections (and TLS sessions) warm across turns.
+    """
+    settings = _settings()
+    key = (settings["provider"], model, temperature, tuple(sorted((k, str(v)) for k, v in kwargs.items())))
+    llm = _models.get(key)
+    if llm is None:
+        with _lock:
+            llm = _models.get(key)
+            if llm is None:
+                llm = _models[key] = _create_chat_model(settings, model, temperature, **kwargs)
+    return llm
+
+
+def _create_chat_model(settings: Dict[str, Any], model: str, temperature: float, **kwargs: Any) -> BaseChatModel:
+    if settings["provider"] == "fake":
+        return FakeChatModel(
+            model_name=f"fake-{model}",
+            latency=settings["latency"],
+            script=settings["script"].get("chat", []),
+        )
+
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=model, temperature=temperature, **kwargs)
+
+
+def get_compiled(name: str, factory: Callable[[], T]) -> T:
+    """Build `factory()` once per provider configuration and share it process-wide.
+
+    Used for react agents and structured-output runnables so they are not
+    recompiled on every invocation.
+    """
+    _settings()
+    obj = _compiled.get(name)
+    if obj is None:
+        with _lock:
+            obj = _compiled.get(name)
+            if obj is None:
+                obj = _compiled[name] = factory()
+    return obj
+
+
+def complete(model: str, messages: List[Dict[str, str]]) -> str:
+    """litellm-style completion returning the reply text."""
+    settings = _settings()
+    if settings["provider"] == "fake":
+        return _fake_complete(messages)
+
+    from litellm import completion
+    return get_cassette().call(
+        "litellm",
+        {"model": model, "messages": messages},
+        lambda: completion(model=model, messages=messages).choices[0].message.content
+    )
+
+
+async def acomplete(model: str, messages: List[Dict[str, str]]) -> str:
+    """Async counterpart of `complete`."""
+    settings = _settings()
+    if settings["provider"] == "fake":
+        if settings["latency"]:
+            await asyncio.sleep(settings["latency"])
+        return fake_user_reply(messages, settings["script"].get("user"))
+
+    from litellm import acompletion
+
+    async def _complete():
+        response = await acompletion(model=model, messages=messages)
+        return response.choices[0].message.content
+
+    return await get_cassette().acall("litellm", {"model": model, "messages": messages}, _complete)
+
+
+def _fake_complete(messages: List[Dict[str, str]]) -> str:
+    settings = _settings()
+    if settings["latency"]:
+        time.sleep(settings["latency"])
+    return fake_user_reply(messages, settings["script"].get("user"))
@@ -8,12 +8,40 @@ from user_simulator.persona.GoalBased.persona_2 import PERSONA as GPERSONA, RAW_
 from user_simulator.persona.JsonPersona.persona_2 import PERSONA as PPERSONA, RAW_REVIEW as PRAW_REVIEW
 from environment.environment import Environment
 from judge.basic_judge.implementation import JudgeImplementation
+from environment.batch_runner import build_matrix, run_batch, arun_batch
+import asyncio
+import os
+import random
+from environment.cassette import configure_cassette
+from llm_provider.provider import configure_provider
+from tools.structured_log import configure_json_sink
 
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("--evaluate", action='store_true', help="Evaluate conversation after termination")
     parser.add_argument("--verbose", action='store_true', help="Print for debugging")
     parser.add_argument("--chat", action='store_true', help="Chat directly with the agent")
+    parser.add_argument("--batch", action='store_true', help="Run a persona x goal x seed matrix of episodes")
+    parser.add_argument("--personas", nargs="+", default=["JsonPersona.persona_2"],
+                        help="Persona modules under user_simulator.persona (batch mode)")
+    parser.add_argument("--goals", nargs="+", default=["LOYAL"], help="Goal keys to run (batch mode)")
+    parser.add_argument("--seeds", type=int, default=1, help="Number of seeds per persona/goal (batch mode)")
+    parser.add_argument("--workers", type=int, default=8, help="Worker processes (batch mode)")
+    parser.add_argument("--output", default="batch_results.jsonl", help="JSONL results file (batch mode)")
+    parser.add_argument("--async", dest="use_async", action='store_true',
+                        help="Run episodes on one asyncio event loop instead of a process pool")
+    parser.add_argument("--cassette", choices=["off", "record", "replay"], default=None,
+                        help="Record LLM/HTTP calls to disk or replay them offline")
+    parser.add_argument("--cassette-dir", default="cassettes", help="Directory holding recorded cassettes")
+    parser.add_argument("--seed", type=int, default=None, help="Seed the simulator (needed for replay)")
+    parser.add_argument("--llm-provider", choices=["openai", "fake"], default=None,
+                        help="Model backend; 'fake' is a scripted local model for benchmarking")
+    parser.add_argument("--fake-latency", type=float, default=None, help="Seconds per fake model call")
+    parser.add_argument("--fake-script", default=None, help="JSON script for the fake model")
+    parser.add_argument("--concurrency", type=int, default=64, help="Max concurrent episodes (--async batch mode)")
+    parser.add_argument("--log-json", default=None, help="Also write INFO+ logs as JSON lines to this file")
+    parser.add_argument("--fused-profile", action='store_true',
+                        help="Extract the profile inside the reasoning call instead of a separate LLM call")
 
     return parser.parse_args()
 
@@ -25,6 +53,25 @@ def main():
         # level=logging.INFO,
         format="%(asctime)s %(levelname)s %(name)s: %(message)s",
     )
+    configure_json_sink(args.log_json)
+    if args.cassette:
+        configure_cassette(args.cassette, args.cassette_dir)
+    if args.llm_provider:
+        configure_provider(args.llm_provider, latency=args.fake_latency, script_path=args.fake_script)
+    if args.seed is not None:
+        random.seed(args.seed)
+    if args.fused_profile:
+        # Exported so batch worker processes build the same graph variant
+        os.environ["FUSED_PROFILE"] = "1"
+
+    if args.batch:
+        specs = build_matrix(args.personas, args.goals, range(args.seeds))
+        if args.use_async:
+            asyncio.run(arun_batch(specs, args.output, concurrency=args.concurrency, evaluate=args.evaluate))
+        else:
+            run_batch(specs, args.output, workers=args.workers, evaluate=args.evaluate)
+        return
+
     # llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
     # judge = JudgeImplementation(llm)
     recommender = RecommenderImplementation()
@@ -36,7 +83,10 @@ def main():
     else:
         user = UserImplementation(args, persona=PPERSONA, raw_review=PRAW_REVIEW, goal=GOALS["LOYAL"])
     env = Environment(args, user, recommender)
-    env.run()
+    if args.use_async:
+        asyncio.run(env.arun())
+    else:
+        env.run()
     # resp = recommender.chat("Find the availibility of 2024 Ford Mustang in Montgomery!")
     # print(resp)
 
@@ -22,6 +22,8 @@ You have access to these tools:
 - **fueleconomy_agent**: Get authoritative vehicle data from FuelEconomy.gov.
 - **NHTSA API tool**: Get official car safety ratings.
 - **Distance check tool**: Compare user’s coordinates to dealer’s coordinates and calculate distance.
+- **fueleconomy_batch** / **nhtsa_batch**: Same lookups for several cars in ONE call. When comparing 2 or more cars, use these instead of calling the single-car tools once per car.
+- **distance_batch_check**: Distance and within-threshold flag for ALL dealers in one call. Use it instead of calling the distance check tool once per dealer.
 
 [Rules for Recommendations]
 1. ALWAYS ask for the user’s **city, state, and ZIP code** before recommending a car.
@@ -51,4 +53,26 @@ You have access to these tools:
 3. Focused shortlist with compelling reasoning.
 4. Engaging, structured presentation.
 5. Incorporate financial viability (monthly payment vs. budget) and long-term cost metrics into recommendations.
-"""
\ No newline at end of file
+"""
+CONTEXT_SUMMARY_PROMPT = """
+You maintain a running summary of a car-shopping conversation between a user and a recommendation assistant.
+Update the existing summary with the new messages below. Keep it short (under 200 words) and factual:
+- user requirements, constraints and preferences (including ones they rejected)
+- cars already recommended, with key facts quoted (price, dealer, safety, MPG)
+- open questions or next steps
+
+[Existing Summary]
+{summary}
+
+[New Messages]
+{messages}
+"""
+
+FUSED_PROFILE_UPDATE_PROMPT = """
+[Profile Updates]
+The profile above may be missing details from the user's latest message.
+If that message states a budget, preferred brands, fuel type, location or ZIP code that is not yet in the profile,
+call **update_user_profile** with just those fields in the same response as your answer (or as your other tool calls).
+The update is recorded silently and returns nothing, so never wait for its result.
+Use the updated values in your answer; do not mention the tool to the user.
+"""
@@ -1,28 +1,55 @@
 # recommender/graph_builder.py
+from functools import lru_cache
 from langgraph.graph import StateGraph, END
-from recommender.basic_recommender.main_agent import CarRecommendationState
-from recommender.basic_recommender.nodes.profile_extractor import profile_extractor_node
-from recommender.basic_recommender.nodes.fueleconomy_node import fueleconomy_node
-from recommender.basic_recommender.nodes.nhtsa_node import nhtsa_node
-from recommender.basic_recommender.nodes.distance_node import distance_node
-from recommender.basic_recommender.nodes.reasoning_node import reasoning_node  # this will finalize recommendations
-
-def build_car_recommender_graph():
+from langchain_core.runnables import RunnableLambda
+from recommender.basic_recommender.state import CarRecommendationState
+from recommender.basic_recommender.nodes.profile_extractor import profile_extractor_node, aprofile_extractor_node, profile_rules_node
+from recommender.basic_recommender.nodes.fueleconomy_node import fueleconomy_node, afueleconomy_node
+from recommender.basic_recommender.nodes.nhtsa_node import nhtsa_node, anhtsa_node
+from recommender.basic_recommender.nodes.compaction_node import compaction_node, acompaction_node
+from recommender.basic_recommender.nodes.reasoning_node import (  # this will finalize recommendations
+    reasoning_node, areasoning_node, fused_reasoning_node, afused_reasoning_node,
+)
+
+# Enrichment nodes only read the profile and are independent of each other,
+# so they run as parallel branches and join before reasoning. Dealer distances
+# need actual listings, so the reasoning agent checks them with its distance tools.
+ENRICHMENT_NODES = ["nhtsa", "fueleconomy"]
+
+
+def build_car_recommender_graph(fused_profile: bool = False):
+    """
+    With `fused_profile`, the turn makes a single serial LLM round trip: only the
+    rule-based extractor runs up front and the reasoning model reports anything
+    else through its `update_user_profile` tool call.
+    """
     graph = StateGraph(CarRecommendationState)
 
     # --- register nodes ---
-    graph.add_node("extract_profile", profile_extractor_node)
-    graph.add_node("distance_check", distance_node)
-    graph.add_node("fueleconomy", fueleconomy_node)
-    graph.add_node("nhtsa", nhtsa_node)
-    graph.add_node("reason_and_recommend", reasoning_node)
-
-    # --- define edges ---
-    graph.add_edge("extract_profile", "distance_check")
-    graph.add_edge("distance_check", "nhtsa")
-    graph.add_edge("nhtsa", "fueleconomy")
-    graph.add_edge("fueleconomy", "reason_and_recommend")
+    if fused_profile:
+        graph.add_node("extract_profile", profile_rules_node)
+    else:
+        graph.add_node("extract_profile", RunnableLambda(profile_extractor_node, afunc=aprofile_extractor_node))
+    graph.add_node("fueleconomy", RunnableLambda(fueleconomy_node, afunc=afueleconomy_node))
+    graph.add_node("nhtsa", RunnableLambda(nhtsa_node, afunc=anhtsa_node))
+    graph.add_node("compact_context", RunnableLambda(compaction_node, afunc=acompaction_node))
+    if fused_profile:
+        graph.add_node("reason_and_recommend", RunnableLambda(fused_reasoning_node, afunc=afused_reasoning_node))
+    else:
+        graph.add_node("reason_and_recommend", RunnableLambda(reasoning_node, afunc=areasoning_node))
+
+    # --- define edges: fan out after profile extraction, fan in before compaction ---
+    for node in ENRICHMENT_NODES:
+        graph.add_edge("extract_profile", node)
+    graph.add_edge(ENRICHMENT_NODES, "compact_context")
+    graph.add_edge("compact_context", "reason_and_recommend")
     graph.add_edge("reason_and_recommend", END)
 
     graph.set_entry_point("extract_profile")
     return graph.compile()
+
+
+@lru_cache(maxsize=None)
+def get_compiled_graph(fused_profile: bool = False):
+    """Shared compiled graph; it is stateless, so every session can reuse it."""
+    return build_car_recommender_graph(fused_profile)
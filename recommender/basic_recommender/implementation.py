@@ -1,11 +1,64 @@
-from langchain_core.messages import HumanMessage
+import os
+from langchain_core.messages import AIMessageChunk, HumanMessage
 from recommender.recommender_interface import IRecommenderSystem
-from recommender.basic_recommender.graph_builder import build_car_recommender_graph
+from recommender.basic_recommender.graph_builder import get_compiled_graph
 from recommender.basic_recommender.main_agent import CarRecommendationState
-from typing import Optional
+from recommender.basic_recommender.nodes.reasoning_node import UPDATE_PROFILE_TOOL
+from typing import AsyncIterator, Iterator, List, Optional
+
+# Only the final answer is streamed: tokens of the reasoning agent itself, not of
+# profile extraction, compaction or the specialist agents running inside its tools.
+STREAM_NODE = "reason_and_recommend"
+STREAM_MODES = ["messages", "values"]
+# Fused-mode profile updates are taken off the final answer, so they do not make it a tool step
+PASSIVE_TOOLS = {UPDATE_PROFILE_TOOL.name}
+
+
+def _reply_chunk(chunk, metadata) -> Optional[AIMessageChunk]:
+    """The chunk if it was produced by the reasoning model itself."""
+    if not isinstance(chunk, AIMessageChunk):
+        return None
+    namespace = metadata.get("langgraph_checkpoint_ns", "").split("|")
+    if not namespace[0].startswith(STREAM_NODE) or any(ns.startswith("tools:") for ns in namespace):
+        return None
+    return chunk
+
+
+class _StepBuffer:
+    """Holds the reasoning model's tokens until its step ends.
+
+    A step that ends in tool calls is an intermediate one ("Let me look that
+    up...") and is dropped; only a step without them is the reply.
+    """
 
-class RecommenderImplementation(IRecommenderSystem):
     def __init__(self):
+        self.message_id = None
+        self.tokens: List[str] = []
+        self.calls_tools = False
+
+    def feed(self, chunk: AIMessageChunk) -> List[str]:
+        released = self.finish() if chunk.id != self.message_id else []
+        self.message_id = chunk.id
+        if isinstance(chunk.content, str) and chunk.content:
+            self.tokens.append(chunk.content)
+        # Only the first chunk of each call carries its name
+        if any(c.get("name") and c["name"] not in PASSIVE_TOOLS for c in chunk.tool_call_chunks):
+            self.calls_tools = True
+        if chunk.response_metadata.get("finish_reason"):
+            released += self.finish()
+        return released
+
+    def finish(self) -> List[str]:
+        released = [] if self.calls_tools else self.tokens
+        self.message_id, self.tokens, self.calls_tools = None, [], False
+        return released
+
+
+class RecommenderImplementation(IRecommenderSystem):
+    def __init__(self, fused_profile: Optional[bool] = None):
+        # Fused mode extracts the profile inside the reasoning call (one LLM round trip per turn)
+        if fused_profile is None:
+            fused_profile = os.getenv("FUSED_PROFILE", "0") == "1"
         self.state = CarRecommendationState(
             messages=[],
             budget=None,
@@ -13,8 +66,12 @@ class RecommenderImplementation(IRecommenderSystem):
             fuel_type=None,
             location=None,
             zipcode=None,
+            safety_info={},
+            fuel_economy_info={},
+            conversation_summary=None,
+            enrichment_fingerprints={},
         )
-        self.compiled_graph = build_car_recommender_graph()
+        self.compiled_graph = get_compiled_graph(fused_profile)
 
     def chat(self, text: Optional[str]) -> str:
         # Append the user's latest message
@@ -25,3 +82,46 @@ class RecommenderImplementation(IRecommenderSystem):
 
         # Return the final LLM output
         return self.state["messages"][-1].content
+
+    async def achat(self, text: Optional[str]) -> str:
+        self.state["messages"].append(HumanMessage(content=text))
+        self.state = await self.compiled_graph.ainvoke(self.state)
+        return self.state["messages"][-1].content
+
+    def stream(self, text: Optional[str]) -> Iterator[str]:
+        """Yield the reply's tokens once the reasoning model's final step is known; the state is updated at the end."""
+        self.state["messages"].append(HumanMessage(content=text))
+        buffer, streamed = _StepBuffer(), False
+        # The react agent runs as a nested graph, so its tokens only surface with subgraphs=True
+        for namespace, mode, payload in self.compiled_graph.stream(self.state, stream_mode=STREAM_MODES, subgraphs=True):
+            if mode == "values":
+                if not namespace:
+                    self.state = payload
+            elif (chunk := _reply_chunk(*payload)) is not None:
+                for token in buffer.feed(chunk):
+                    streamed = True
+                    yield token
+        for token in buffer.finish():
+            streamed = True
+            yield token
+        # Models that do not stream deliver the whole reply with the final state
+        if not streamed:
+            yield self.state["messages"][-1].content
+
+    async def astream(self, text: Optional[str]) -> AsyncIterator[str]:
+        self.state["messages"].append(HumanMessage(content=text))
+        buffer, streamed = _StepBuffer(), False
+        # The react agent runs as a nested graph, so its tokens only surface with subgraphs=True
+        async for namespace, mode, payload in self.compiled_graph.astream(self.state, stream_mode=STREAM_MODES, subgraphs=True):
+            if mode == "values":
+                if not namespace:
+                    self.state = payload
+            elif (chunk := _reply_chunk(*payload)) is not None:
+                for token in buffer.feed(chunk):
+                    streamed = True
+                    yield token
+        for token in buffer.finish():
+            streamed = True
+            yield token
+        if not streamed:
+            yield self.state["messages"][-1].content
@@ -0,0 +1,72 @@
+# recommender/nodes/compaction_node.py
+import os
+from typing import List
+from langchain_core.messages import BaseMessage, HumanMessage, RemoveMessage
+from langchain_core.messages.utils import count_tokens_approximately
+from llm_provider.provider import get_chat_model
+from prompts.recommender_prompts import CONTEXT_SUMMARY_PROMPT
+from recommender.basic_recommender.state import CarRecommendationState
+
+# Last N user turns (with everything that followed them) stay verbatim
+KEEP_TURNS = max(1, int(os.getenv("CONTEXT_KEEP_TURNS", "4")))
+# Approximate token budget for the verbatim part; older turns are rolled up until it fits
+TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+
+
+def _split_turns(messages: List[BaseMessage]) -> List[List[BaseMessage]]:
+    """Group messages into turns, each starting at a user message."""
+    turns: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, HumanMessage) or not turns:
+            turns.append([message])
+        else:
+            turns[-1].append(message)
+    return turns
+
+
+def messages_to_compact(messages: List[BaseMessage]) -> List[BaseMessage]:
+    """Return the oldest messages that fall outside the turn window or token budget."""
+    turns = _split_turns(messages)
+    old, keep = turns[:-KEEP_TURNS], turns[-KEEP_TURNS:]
+    # Always keep the current turn, even if it alone exceeds the budget
+    while len(keep) > 1 and count_tokens_approximately([m for t in keep for m in t]) > TOKEN_BUDGET:
+        old.append(keep.pop(0))
+    return [m for t in old for m in t if m.id is not None]
+
+
+def _summary_prompt(state: CarRecommendationState, to_compact: List[BaseMessage]) -> List[HumanMessage]:
+    transcript = "\n".join(f"{m.type.upper()}: {m.content}" for m in to_compact)
+    return [HumanMessage(CONTEXT_SUMMARY_PROMPT.format(
+        summary=state.get("conversation_summary") or "(none yet)",
+        messages=transcript,
+    ))]
+
+
+def _compaction_update(to_compact: List[BaseMessage], summary: str) -> dict:
+    return {
+        "messages": [RemoveMessage(id=m.id) for m in to_compact],
+        "conversation_summary": summary,
+    }
+
+
+def compaction_node(state: CarRecommendationState):
+    """Rolls turns beyond the verbatim window into `conversation_summary`."""
+    to_compact = messages_to_compact(state["messages"])
+    if not to_compact:
+        return {}
+
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0)
+    summary = llm.invoke(_summary_prompt(state, to_compact)).content
+    print(f"[Compaction Node] Rolled {len(to_compact)} messages into the summary.")
+    return _compaction_update(to_compact, summary)
+
+
+async def acompaction_node(state: CarRecommendationState):
+    to_compact = messages_to_compact(state["messages"])
+    if not to_compact:
+        return {}
+
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0)
+    summary = (await llm.ainvoke(_summary_prompt(state, to_compact))).content
+    print(f"[Compaction Node] Rolled {len(to_compact)} messages into the summary.")
+    return _compaction_update(to_compact, summary)
@@ -0,0 +1,15 @@
+# recommender/nodes/fingerprint.py
+import hashlib
+import json
+from recommender.basic_recommender.state import CarRecommendationState
+
+
+def input_fingerprint(**inputs) -> str:
+    """Stable hash of the profile values an enrichment node depends on."""
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def inputs_unchanged(state: CarRecommendationState, node: str, fingerprint: str) -> bool:
+    """True if `node` already ran successfully on exactly these inputs."""
+    return (state.get("enrichment_fingerprints") or {}).get(node) == fingerprint
@@ -1,38 +1,61 @@
 # recommender/nodes/fueleconomy_node.py
-from langgraph.graph import END
 from recommender.basic_recommender.state import CarRecommendationState
 from recommender.basic_recommender.specialist_agents.fueleconomy_agent import FUELECONOMY_AGENT_TOOL
+from recommender.basic_recommender.nodes.fingerprint import input_fingerprint, inputs_unchanged
 
-def fueleconomy_node(state: CarRecommendationState):
-    """
-    Uses FuelEconomy.gov API to enrich recommendations with MPG, cost, etc.
-    """
+NODE_NAME = "fueleconomy"
+
+
+def _prepare(state: CarRecommendationState):
+    """Returns (tool request, fuel type, fingerprint), or None when the node has nothing (new) to do."""
     user_brands = state.get("preferred_brands", [])
     fuel_type = state.get("fuel_type")
 
     # If the user has not provided enough info, skip gracefully
     if not user_brands or not fuel_type:
         print("[FuelEconomyNode] Insufficient data, skipping.")
-        return state
+        return None
+
+    fingerprint = input_fingerprint(brand=user_brands[0], fuel_type=str(fuel_type))
+    if inputs_unchanged(state, NODE_NAME, fingerprint):
+        print("[FuelEconomyNode] Inputs unchanged, reusing previous result.")
+        return None
+    return {"make": user_brands[0], "query": f"{user_brands[0]} {fuel_type.value}"}, fuel_type, fingerprint
+
+
+def _update(request: dict, fuel_type, fingerprint: str, result) -> dict:
+    # Runs as a parallel branch: return only the fields this node owns.
+    # Keyed by the hint that was looked up ("toyota hybrid"), not a specific car
+    return {
+        "fuel_economy_info": {request["query"].lower(): f"({fuel_type.value}) {result}"},
+        "enrichment_fingerprints": {NODE_NAME: fingerprint},
+    }
+
+
+def fueleconomy_node(state: CarRecommendationState):
+    """
+    Uses FuelEconomy.gov API to enrich recommendations with MPG, cost, etc.
+    """
+    prepared = _prepare(state)
+    if prepared is None:
+        return {}
+    request, fuel_type, fingerprint = prepared
+    try:
+        result = FUELECONOMY_AGENT_TOOL.invoke(request)
+    except Exception as e:
+        print(f"[FuelEconomyNode] Error accessing API: {e}")
+        return {}
+    return _update(request, fuel_type, fingerprint, result)
+
 
-    # Example call — adapt depending on how FUELECONOMY_AGENT_TOOL works
+async def afueleconomy_node(state: CarRecommendationState):
+    prepared = _prepare(state)
+    if prepared is None:
+        return {}
+    request, fuel_type, fingerprint = prepared
     try:
-        result = FUELECONOMY_AGENT_TOOL.invoke(
-            {"brand": user_brands[0], "fuel_type": str(fuel_type)}
-        )
-        # Assume the tool returns structured info like {"mpg": 35, "emission": "low"}
-        state["messages"].append(
-            {
-                "role": "assistant",
-                "content": f"FuelEconomy data for {user_brands[0]} ({fuel_type}): {result}",
-            }
-        )
+        result = await FUELECONOMY_AGENT_TOOL.ainvoke(request)
     except Exception as e:
-        state["messages"].append(
-            {
-                "role": "assistant",
-                "content": f"[FuelEconomyNode] Error accessing API: {e}",
-            }
-        )
-
-    return state
+        print(f"[FuelEconomyNode] Error accessing API: {e}")
+        return {}
+    return _update(request, fuel_type, fingerprint, result)
@@ -1,22 +1,56 @@
 # recommender/nodes/nhtsa_node.py
 from recommender.basic_recommender.state import CarRecommendationState
 from recommender.basic_recommender.specialist_agents.nhtsa_agent import NHTSA_AGENT_TOOL
+from recommender.basic_recommender.nodes.fingerprint import input_fingerprint, inputs_unchanged
 
-def nhtsa_node(state: CarRecommendationState):
-    """Fetches official car safety data."""
+NODE_NAME = "nhtsa"
+
+
+def _prepare(state: CarRecommendationState):
+    """Returns (tool request, fingerprint), or None when the node has nothing (new) to do."""
     user_brands = state.get("preferred_brands", [])
     if not user_brands:
         print("[NHTSA Node] No brand info, skipping.")
-        return state
+        return None
+
+    fingerprint = input_fingerprint(brand=user_brands[0])
+    if inputs_unchanged(state, NODE_NAME, fingerprint):
+        print("[NHTSA Node] Inputs unchanged, reusing previous result.")
+        return None
+    return {"make": user_brands[0], "query": user_brands[0]}, fingerprint
+
+
+def _update(request: dict, fingerprint: str, result) -> dict:
+    # Runs as a parallel branch: return only the fields this node owns.
+    # Keyed by the hint that was looked up (the brand), not a specific car
+    return {
+        "safety_info": {request["query"].lower(): str(result)},
+        "enrichment_fingerprints": {NODE_NAME: fingerprint},
+    }
 
+
+def nhtsa_node(state: CarRecommendationState):
+    """Fetches official car safety data."""
+    prepared = _prepare(state)
+    if prepared is None:
+        return {}
+    request, fingerprint = prepared
     try:
-        result = NHTSA_AGENT_TOOL.invoke({"brand": user_brands[0]})
-        state["messages"].append(
-            {"role": "assistant", "content": f"NHTSA safety info: {result}"}
-        )
+        result = NHTSA_AGENT_TOOL.invoke(request)
     except Exception as e:
-        state["messages"].append(
-            {"role": "assistant", "content": f"[NHTSA Node] Error: {e}"}
-        )
+        print(f"[NHTSA Node] Error: {e}")
+        return {}
+    return _update(request, fingerprint, result)
 
-    return state
+
+async def anhtsa_node(state: CarRecommendationState):
+    prepared = _prepare(state)
+    if prepared is None:
+        return {}
+    request, fingerprint = prepared
+    try:
+        result = await NHTSA_AGENT_TOOL.ainvoke(request)
+    except Exception as e:
+        print(f"[NHTSA Node] Error: {e}")
+        return {}
+    return _update(request, fingerprint, result)
@@ -1,8 +1,9 @@
 # basic_recommender/nodes/profile_extractor.py
-from langchain_openai import ChatOpenAI
+from llm_provider.provider import get_chat_model, get_compiled
 from langchain_core.messages import SystemMessage
 from pydantic import BaseModel, Field
 from recommender.basic_recommender.state import CarRecommendationState, FuelType
+from recommender.basic_recommender.nodes.profile_rules import extract_profile_rules
 from typing import Optional, List
 
 class UpdateCarProfileSchema(BaseModel):
@@ -12,25 +13,69 @@ class UpdateCarProfileSchema(BaseModel):
     location: Optional[List[str]] = Field(None)
     zipcode: Optional[int] = Field(None)
 
+def profile_fields(update: UpdateCarProfileSchema) -> dict:
+    """Explicitly set, non-empty fields of a profile update."""
+    return {field: value for field, value in update.model_dump(exclude_unset=True).items() if value is not None}
+
 def merge_partial_update(state: CarRecommendationState, update: UpdateCarProfileSchema):
-    updates = {}
-    for field, value in update.model_dump(exclude_unset=True).items():
-        if value is not None:
-            updates[field] = value
+    updates = profile_fields(update)
     updates["messages"] = state["messages"]
     return updates
 
-def profile_extractor_node(state: CarRecommendationState):
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
-    structured_llm = llm.with_structured_output(UpdateCarProfileSchema)
-
-    result = structured_llm.invoke([
-        SystemMessage(content="""Extract explicitly mentioned fields only:
+PROFILE_EXTRACTION_INSTRUCTIONS = """Extract explicitly mentioned fields only:
         - budget (USD)
         - preferred brands
         - fuel type
         - location [Country, State, City]
-        - zipcode"""),
+        - zipcode"""
+
+
+def _extraction_messages(state: CarRecommendationState):
+    return [
+        SystemMessage(content=PROFILE_EXTRACTION_INSTRUCTIONS),
         state["messages"][-1]
-    ])
+    ]
+
+
+def _structured_llm():
+    return get_compiled(
+        "profile_extractor",
+        lambda: get_chat_model(model="gpt-4o-mini", temperature=0.1).with_structured_output(UpdateCarProfileSchema)
+    )
+
+
+def _rule_update(state: CarRecommendationState):
+    """Rule-based fast path; returns None when the message needs the LLM."""
+    content = state["messages"][-1].content
+    rules = extract_profile_rules(content if isinstance(content, str) else str(content))
+    if rules.needs_llm:
+        print(f"[Profile Extractor] Falling back to LLM ({rules.reason}).")
+        return None
+    return merge_partial_update(state, UpdateCarProfileSchema(**rules.fields))
+
+
+def profile_extractor_node(state: CarRecommendationState):
+    updates = _rule_update(state)
+    if updates is not None:
+        return updates
+    result = _structured_llm().invoke(_extraction_messages(state))
+    return merge_partial_update(state, result)
+
+
+async def aprofile_extractor_node(state: CarRecommendationState):
+    updates = _rule_update(state)
+    if updates is not None:
+        return updates
+    result = await _structured_llm().ainvoke(_extraction_messages(state))
     return merge_partial_update(state, result)
+
+
+def profile_rules_node(state: CarRecommendationState):
+    """Rules-only extraction for the fused graph; the reasoning model fills in the rest."""
+    content = state["messages"][-1].content
+    rules = extract_profile_rules(content if isinstance(content, str) else str(content))
+    if rules.needs_llm:
+        # Partial rule output may be wrong ("budget 30000" read as a ZIP); leave it all to the model
+        print(f"[Profile Rules] Deferring to the reasoning model ({rules.reason}).")
+        return {}
+    return profile_fields(UpdateCarProfileSchema(**rules.fields))
@@ -0,0 +1,163 @@
+# basic_recommender/nodes/profile_rules.py
+"""Deterministic profile extraction that runs before the LLM extractor.
+
+Resolves ZIP codes ("zip 78701", "in 78701", "TX 78701"), budgets ("$30,000",
+"30k", "under 25 grand", "budget 30000", "35000 dollars"), known brands and
+fuel types with regexes and a small lexicon. A bare 5-digit number is only
+read as a ZIP or a budget next to a cue for one; otherwise, and whenever the
+message carries profile cues the rules cannot resolve (a location, a budget
+in words, a negated brand, a car the user already owns, ...), `needs_llm`
+is set and the caller falls back to the structured-output LLM.
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from recommender.basic_recommender.state import FuelType
+
+BRAND_ALIASES = {
+    "acura": "Acura", "alfa romeo": "Alfa Romeo", "aston martin": "Aston Martin", "audi": "Audi",
+    "bentley": "Bentley", "bmw": "BMW", "buick": "Buick", "cadillac": "Cadillac",
+    "chevrolet": "Chevrolet", "chevy": "Chevrolet", "chrysler": "Chrysler", "dodge": "Dodge",
+    "ferrari": "Ferrari", "fiat": "Fiat", "ford": "Ford", "genesis": "Genesis", "gmc": "GMC",
+    "honda": "Honda", "hyundai": "Hyundai", "infiniti": "Infiniti", "jaguar": "Jaguar", "jeep": "Jeep",
+    "kia": "Kia", "lamborghini": "Lamborghini", "land rover": "Land Rover", "lexus": "Lexus",
+    "lincoln": "Lincoln", "lucid": "Lucid", "maserati": "Maserati", "mazda": "Mazda",
+    "mercedes-benz": "Mercedes-Benz", "mercedes": "Mercedes-Benz",
+    "mitsubishi": "Mitsubishi", "nissan": "Nissan", "polestar": "Polestar", "porsche": "Porsche",
+    "ram": "Ram", "rivian": "Rivian", "subaru": "Subaru", "tesla": "Tesla", "toyota": "Toyota",
+    "volkswagen": "Volkswagen", "vw": "Volkswagen", "volvo": "Volvo",
+}
+
+FUEL_ALIASES = {
+    "petrol": FuelType.PETROL, "gasoline": FuelType.PETROL, "gas": FuelType.PETROL,
+    "diesel": FuelType.DIESEL,
+    "electric": FuelType.ELECTRIC, "ev": FuelType.ELECTRIC, "evs": FuelType.ELECTRIC, "bev": FuelType.ELECTRIC,
+    "hybrid": FuelType.HYBRID, "phev": FuelType.HYBRID, "plug-in": FuelType.HYBRID,
+}
+
+US_STATES = (
+    "alabama|alaska|arizona|arkansas|california|colorado|connecticut|delaware|florida|georgia|hawaii|"
+    "idaho|illinois|indiana|iowa|kansas|kentucky|louisiana|maine|maryland|massachusetts|michigan|"
+    "minnesota|mississippi|missouri|montana|nebraska|nevada|new hampshire|new jersey|new mexico|"
+    "new york|north carolina|north dakota|ohio|oklahoma|oregon|pennsylvania|rhode island|"
+    "south carolina|south dakota|tennessee|texas|utah|vermont|virginia|washington|west virginia|"
+    "wisconsin|wyoming"
+)
+
+_BRAND_RE = re.compile(r"\b(" + "|".join(sorted(map(re.escape, BRAND_ALIASES), key=len, reverse=True)) + r")\b", re.I)
+# "gas" only counts as a fuel type when it is not part of "gas mileage", "gas prices", ...
+_FUEL_RE = re.compile(r"\b(petrol|gasoline|gas(?!\s+(?:mileage|prices?|station|money|costs?|bill))|diesel|"
+                      r"electric|evs?|bev|hybrid|phev|plug-in)\b", re.I)
+# Amounts followed by a unit ("50k miles", "300 hp") are not money
+_NOT_MONEY = r"(?!\s*(?:miles|mi|km|hp|mpg)\b)"
+_MONEY_RE = re.compile(r"\$\s?(\d{1,3}(?:,\d{3})+|\d+(?:\.\d+)?)\s*(k|grand|thousand)?\b" + _NOT_MONEY +
+                       r"|\b(\d+(?:\.\d+)?)\s*(k|grand|thousand)\b" + _NOT_MONEY, re.I)
+# Plain numbers are money only next to a money cue: "budget 30000", "spend 28,000", "35000 dollars"
+_PLAIN_AMOUNT = r"(\d{1,3}(?:,\d{3})+|\d{4,6})(?:\.\d+)?\b(?!,\d)"
+_PLAIN_MONEY_RE = re.compile(r"\b(?:budget|max(?:imum)?|under|below|up to|spend|afford|around|about)\b"
+                             r"(?:\s+(?:is|of|at|around|about|to|me|maybe|roughly))*\s*:?\s*" + _PLAIN_AMOUNT
+                             + _NOT_MONEY + r"|\b" + _PLAIN_AMOUNT + r"\s*(?:dollars|usd|bucks)\b", re.I)
+# A 5-digit number is a ZIP code only after a ZIP or location cue; state abbreviations are matched case-sensitively
+_ZIP_RE = re.compile(r"(?:(?i:\b(?:zip\s*code|zipcode|zip|postal\s*code|in|near)\b)|\b[A-Z]{2}\b),?\s*:?\s*"
+                     r"(\d{5})(?:-\d{4})?\b(?!\d|,\d)")
+# Any 5-digit number; one that is neither a ZIP nor an amount is left to the LLM
+_FIVE_DIGITS_RE = re.compile(r"(?<![\d$,.])\b\d{5}\b(?!\d|,\d)(?!\s*(?:k|grand|thousand|miles|mi|km)\b)", re.I)
+
+# Profile cues the rules above cannot fully resolve on their own
+_LOCATION_CUES = re.compile(r"\b(live|living|located|based|moving|relocating|near|city|town|area|"
+                            + US_STATES + r")\b", re.I)
+_STATE_ABBR_CUE = re.compile(r",\s*[A-Z]{2}\b")  # "Austin, TX" (case-sensitive on purpose)
+_BUDGET_CUES = re.compile(r"\b(budget|afford|spend|price range|grand|thousand|payment)\b", re.I)
+_BRAND_CUES = re.compile(r"\b(brand|make|prefer|fan of|loyal|stick with|partial to)\b", re.I)
+_FUEL_CUES = re.compile(r"\b(fuel|powertrain|charging|plug)\b", re.I)
+# The user describing a car they already have: its make is not a preference
+_OWNERSHIP_CUES = re.compile(r"\b(have an?|own|owned|trade[- ]?in|trading in|currently drive|my current)\b", re.I)
+_NEGATION_CUES = re.compile(r"\b(not|no|don'?t|never|hate|avoid|except|other than|instead of|rather than)\b", re.I)
+
+MIN_BUDGET = 1000
+_MODEL_YEAR_RE = re.compile(r"19[89]\d|20[0-3]\d")
+
+
+@dataclass
+class RuleExtraction:
+    fields: Dict[str, Any] = field(default_factory=dict)
+    needs_llm: bool = False
+    reason: Optional[str] = None
+
+
+def _parse_budget(text: str, spans: List[tuple]) -> Optional[int]:
+    amounts: List[float] = []
+    for match in _MONEY_RE.finditer(text):
+        number = match.group(1) or match.group(3)
+        suffix = (match.group(2) or match.group(4) or "").lower()
+        value = float(number.replace(",", ""))
+        if suffix:
+            value *= 1000
+        if value >= MIN_BUDGET:
+            amounts.append(value)
+            spans.append(match.span())
+    for match in _PLAIN_MONEY_RE.finditer(text):
+        group = 1 if match.group(1) else 2
+        value = float(match.group(group).replace(",", ""))
+        # "around 2020" is a model year, not a budget
+        if value >= MIN_BUDGET and not _MODEL_YEAR_RE.fullmatch(match.group(group)):
+            amounts.append(value)
+            spans.append(match.span(group))
+    # For ranges ("$20k-$25k") the upper bound is the budget ceiling
+    return int(max(amounts)) if amounts else None
+
+
+def _explained(span: tuple, spans: List[tuple]) -> bool:
+    return any(start <= span[0] and span[1] <= end for start, end in spans)
+
+
+def _unique(values: List[Any]) -> List[Any]:
+    return list(dict.fromkeys(values))
+
+
+def extract_profile_rules(text: str) -> RuleExtraction:
+    """Extract profile fields from one user message without an LLM."""
+    fields: Dict[str, Any] = {}
+    spans: List[tuple] = []
+
+    budget = _parse_budget(text, spans)
+    if budget is not None:
+        fields["budget"] = budget
+
+    zip_matches = list(_ZIP_RE.finditer(text))
+    zips = _unique(m.group(1) for m in zip_matches)
+    spans.extend(m.span(1) for m in zip_matches)
+    if len(zips) == 1:
+        fields["zipcode"] = int(zips[0])
+    unexplained = [m for m in _FIVE_DIGITS_RE.finditer(text) if not _explained(m.span(), spans)]
+
+    owns_car = bool(_OWNERSHIP_CUES.search(text))
+    brands = _unique(BRAND_ALIASES[m.lower()] for m in _BRAND_RE.findall(text))
+    if brands and not owns_car:
+        fields["preferred_brands"] = brands
+
+    fuels = _unique(FUEL_ALIASES[m.lower()] for m in _FUEL_RE.findall(text))
+    if len(fuels) == 1:
+        fields["fuel_type"] = fuels[0]
+
+    reason = None
+    if owns_car:
+        reason = "current vehicle"
+    elif _LOCATION_CUES.search(text) or _STATE_ABBR_CUE.search(text):
+        reason = "location"
+    elif len(zips) > 1:
+        reason = "multiple zipcodes"
+    elif unexplained:
+        reason = "unexplained number"
+    elif len(fuels) > 1:
+        reason = "multiple fuel types"
+    elif (brands or fuels) and _NEGATION_CUES.search(text):
+        reason = "negated preference"
+    elif "budget" not in fields and _BUDGET_CUES.search(text):
+        reason = "budget"
+    elif not brands and _BRAND_CUES.search(text):
+        reason = "brand"
+    elif not fuels and _FUEL_CUES.search(text):
+        reason = "fuel type"
+
+    return RuleExtraction(fields=fields, needs_llm=reason is not None, reason=reason)
@@ -1,24 +1,86 @@
 # basic_recommender/nodes/reasoning_agent.py
+from typing import Annotated
+import operator
 from langgraph.prebuilt import create_react_agent
-from langchain_openai import ChatOpenAI
+from langgraph.prebuilt.chat_agent_executor import AgentState
+from llm_provider.provider import get_chat_model, get_compiled
 from langchain_core.messages import SystemMessage, AIMessage
+from langchain_core.tools import StructuredTool
+from pydantic import ValidationError
 from recommender.basic_recommender.state import CarRecommendationState
-from prompts.recommender_prompts import PROFILE_EXTRACTOR_PROMPT
-from recommender.basic_recommender.specialist_agents.fueleconomy_agent import FUELECONOMY_AGENT_TOOL
-from recommender.basic_recommender.specialist_agents.nhtsa_agent import NHTSA_AGENT_TOOL
+from prompts.recommender_prompts import PROFILE_EXTRACTOR_PROMPT, FUSED_PROFILE_UPDATE_PROMPT
+from recommender.basic_recommender.nodes.profile_extractor import UpdateCarProfileSchema, profile_fields
+from recommender.basic_recommender.specialist_agents.fueleconomy_agent import FUELECONOMY_AGENT_TOOL, FUELECONOMY_BATCH_AGENT_TOOL
+from recommender.basic_recommender.specialist_agents.nhtsa_agent import NHTSA_AGENT_TOOL, NHTSA_BATCH_AGENT_TOOL
 from recommender.basic_recommender.specialist_agents.car_detail_agent import CAR_DETAIL_AGENT_TOOL
-from tools.distance_checker import distance_check
+from tools.distance_checker import distance_batch_check, distance_check
 
-def reasoning_node(state: CarRecommendationState):
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
+UPDATE_PROFILE_TOOL = StructuredTool.from_function(
+    name="update_user_profile",
+    description=(
+        "Record budget, preferred brands, fuel type, location or zipcode that the user "
+        "explicitly stated. Only pass the fields that changed."
+    ),
+    func=lambda **fields: "Profile updated.",
+    args_schema=UpdateCarProfileSchema,
+)
+
+
+def _get_react_agent():
+    return get_compiled("reasoning_agent", _build_react_agent)
+
+
+class FusedAgentState(AgentState):
+    profile_calls: Annotated[list, operator.add]
+
+
+def _capture_profile_calls(state: FusedAgentState):
+    """Take update_user_profile calls off the model output so they never cost another model step."""
+    message = state["messages"][-1]
+    calls = [c for c in getattr(message, "tool_calls", None) or [] if c["name"] == UPDATE_PROFILE_TOOL.name]
+    if not calls:
+        return {}
+    rest = [c for c in message.tool_calls if c["name"] != UPDATE_PROFILE_TOOL.name]
+    if not rest and not message.content:
+        # The step holds nothing but the update; let it run so the model still writes an answer
+        return {}
+    additional_kwargs = {k: v for k, v in message.additional_kwargs.items() if k != "tool_calls"}
+    # Same id, so this replaces the model output; without pending calls the agent ends here
+    stripped = message.model_copy(update={"tool_calls": rest, "additional_kwargs": additional_kwargs})
+    return {"messages": [stripped], "profile_calls": calls}
+
+
+def _get_fused_react_agent():
+    return get_compiled("fused_reasoning_agent", lambda: _build_react_agent(
+        UPDATE_PROFILE_TOOL, state_schema=FusedAgentState, post_model_hook=_capture_profile_calls))
+
+
+def _build_react_agent(*extra_tools, **agent_options):
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0.1)
     tools = [
         FUELECONOMY_AGENT_TOOL,
         NHTSA_AGENT_TOOL,
+        FUELECONOMY_BATCH_AGENT_TOOL,
+        NHTSA_BATCH_AGENT_TOOL,
         distance_check,
+        distance_batch_check,
         CAR_DETAIL_AGENT_TOOL,
+        *extra_tools,
     ]
-    react_agent = create_react_agent(model=llm, tools=tools)
+    return create_react_agent(model=llm, tools=tools, **agent_options)
+
 
+def _render_enrichment(state: CarRecommendationState) -> str:
+    """Render the latest structured enrichment results as one prompt section."""
+    sections = []
+    for title, results in (("Safety ratings (NHTSA)", state.get("safety_info")),
+                           ("Fuel economy (FuelEconomy.gov)", state.get("fuel_economy_info"))):
+        if results:
+            sections.append(f"{title}:\n" + "\n".join(f"- {car}: {info}" for car, info in results.items()))
+    return "[Vehicle Data]\n" + "\n\n".join(sections) if sections else ""
+
+
+def _build_messages(state: CarRecommendationState):
     profile_summary = {
         "budget": state.get("budget"),
         "preferred_brands": state.get("preferred_brands", []),
@@ -26,9 +88,60 @@ def reasoning_node(state: CarRecommendationState):
         "location": state.get("location"),
         "zipcode": state.get("zipcode"),
     }
+    system = [SystemMessage(PROFILE_EXTRACTOR_PROMPT.format(profile=profile_summary))]
+    enrichment = _render_enrichment(state)
+    if enrichment:
+        system.append(SystemMessage(enrichment))
+    if state.get("conversation_summary"):
+        system.append(SystemMessage(f"Summary of the earlier conversation:\n{state['conversation_summary']}"))
+    return system + state["messages"]
+
 
-    messages = [SystemMessage(PROFILE_EXTRACTOR_PROMPT.format(profile=profile_summary))] + state["messages"]
-    result = react_agent.invoke({"messages": messages})
+def _final_reply(state: CarRecommendationState, result) -> dict:
+    return {"messages": state["messages"] + [AIMessage(result["messages"][-1].content)]}
 
-    updates = {"messages": state["messages"] + [AIMessage(result["messages"][-1].content)]}
+
+def reasoning_node(state: CarRecommendationState):
+    react_agent = _get_react_agent()
+    return _final_reply(state, react_agent.invoke({"messages": _build_messages(state)}))
+
+
+async def areasoning_node(state: CarRecommendationState):
+    react_agent = _get_react_agent()
+    return _final_reply(state, await react_agent.ainvoke({"messages": _build_messages(state)}))
+
+
+def _profile_updates(calls) -> dict:
+    """Validate update_user_profile tool calls (later calls win)."""
+    updates = {}
+    for call in calls:
+        try:
+            updates.update(profile_fields(UpdateCarProfileSchema(**call["args"])))
+        except ValidationError as e:
+            print(f"[Reasoning Node] Ignoring invalid profile update: {e}")
     return updates
+
+
+def _fused_messages(state: CarRecommendationState):
+    messages = _build_messages(state)
+    return messages[:1] + [SystemMessage(FUSED_PROFILE_UPDATE_PROMPT)] + messages[1:]
+
+
+def _fused_reply(state: CarRecommendationState, result) -> dict:
+    # Calls the hook could not strip (a step with nothing else in it) were executed as a tool
+    executed = [call for m in result["messages"] for call in getattr(m, "tool_calls", None) or []
+                if call["name"] == UPDATE_PROFILE_TOOL.name]
+    updates = _profile_updates(result.get("profile_calls", []) + executed)
+    updates.update(_final_reply(state, result))
+    return updates
+
+
+def fused_reasoning_node(state: CarRecommendationState):
+    """Reasoning that also emits the profile update as a side-channel tool call."""
+    react_agent = _get_fused_react_agent()
+    return _fused_reply(state, react_agent.invoke({"messages": _fused_messages(state)}))
+
+
+async def afused_reasoning_node(state: CarRecommendationState):
+    react_agent = _get_fused_react_agent()
+    return _fused_reply(state, await react_agent.ainvoke({"messages": _fused_messages(state)}))
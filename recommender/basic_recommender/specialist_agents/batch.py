@@ -0,0 +1,75 @@
+# basic_recommender/specialist_agents/batch.py
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List
+import asyncio
+import json
+import logging
+import os
+from pydantic import BaseModel
+from recommender.basic_recommender.state import car_key
+
+LOGGER = logging.getLogger("specialist_agents.batch")
+
+# Upper bound on concurrent lookups per batch call (each may hit the API several times)
+BATCH_WORKERS = int(os.getenv("SPECIALIST_BATCH_WORKERS", "8"))
+
+
+def _key(car: BaseModel) -> str:
+    return car_key(car.year, car.make, car.model) or (car.query or "").strip().lower()
+
+
+def _embed(result: str) -> Any:
+    # Resolver results are JSON; keep them as objects instead of double-encoding
+    try:
+        return json.loads(result)
+    except (TypeError, ValueError):
+        return result
+
+
+def run_batch(lookup: Callable[..., str], cars: List[BaseModel]) -> str:
+    """Run `lookup` for every car hint concurrently; returns a JSON map keyed by `car_key`."""
+    if not cars:
+        return json.dumps({})
+
+    def _one(car: BaseModel) -> str:
+        try:
+            return lookup(**car.model_dump())
+        except Exception as e:
+            LOGGER.exception(f"run_batch: lookup failed for {car!r}")
+            return f"Error: {e}"
+
+    with ThreadPoolExecutor(max_workers=min(len(cars), BATCH_WORKERS)) as pool:
+        results = list(pool.map(_one, cars))
+    return _collect(cars, results)
+
+
+async def arun_batch(alookup: Callable[..., Awaitable[str]], cars: List[BaseModel]) -> str:
+    """Async `run_batch`: the lookups run concurrently on the event loop, at most BATCH_WORKERS at a time."""
+    if not cars:
+        return json.dumps({})
+    limit = asyncio.Semaphore(BATCH_WORKERS)
+
+    async def _one(car: BaseModel) -> str:
+        async with limit:
+            try:
+                return await alookup(**car.model_dump())
+            except Exception as e:
+                LOGGER.exception(f"arun_batch: lookup failed for {car!r}")
+                return f"Error: {e}"
+
+    return _collect(cars, await asyncio.gather(*(_one(car) for car in cars)))
+
+
+def _collect(cars: List[BaseModel], results: List[str]) -> str:
+    out: Dict[str, Any] = {}
+    seen: Dict[str, int] = {}
+    for car, result in zip(cars, results):
+        key = _key(car)
+        # Two hints can normalize to the same key; keep both as "key", "key #2", ...
+        seen[key] = seen.get(key, 0) + 1
+        unique = key if seen[key] == 1 else f"{key} #{seen[key]}"
+        while unique in out:
+            seen[key] += 1
+            unique = f"{key} #{seen[key]}"
+        out[unique] = _embed(result)
+    return json.dumps(out)
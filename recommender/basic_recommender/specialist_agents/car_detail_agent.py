@@ -2,7 +2,7 @@ from langchain.tools import StructuredTool
 from pydantic import BaseModel, Field
 from typing import Dict, Any
 import datetime
-from tools.autodev import auto_dev_inventory_tool_raw
+from tools.autodev import auto_dev_inventory_tool_araw, auto_dev_inventory_tool_raw
 from tools.finance_tools import enrich_listings_with_finance_and_tco
 
 
@@ -36,7 +36,35 @@ def car_detail_agent_func(
         budget=budget,
         zipcode=zipcode
     )
+    return _car_details(inventory_result, make, model, location, zipcode, down_payment, loan_term_months,
+                        credit_score, desired_year)
 
+
+async def acar_detail_agent_func(
+    make: str,
+    model: str,
+    location: str,
+    zipcode: int,
+    budget: int,
+    down_payment: float,
+    loan_term_months: int,
+    credit_score: int,
+    desired_year: int = None
+) -> Dict[str, Any]:
+    inventory_result = await auto_dev_inventory_tool_araw(
+        make=make,
+        model=model,
+        location=location,
+        budget=budget,
+        zipcode=zipcode
+    )
+    return _car_details(inventory_result, make, model, location, zipcode, down_payment, loan_term_months,
+                        credit_score, desired_year)
+
+
+def _car_details(inventory_result: Dict[str, Any], make: str, model: str, location: str, zipcode: int,
+                 down_payment: float, loan_term_months: int, credit_score: int,
+                 desired_year: int = None) -> Dict[str, Any]:
     listings = inventory_result.get("listings")
 
     # --- Fallback: extract from raw_api.records ---
@@ -108,6 +136,7 @@ def car_detail_agent_func(
 
 CAR_DETAIL_AGENT_TOOL = StructuredTool.from_function(
     func=car_detail_agent_func,
+    coroutine=acar_detail_agent_func,
     name="car_detail_agent",
     description=(
         "Fetch inventory for a car by make/model/location/ZIP, "
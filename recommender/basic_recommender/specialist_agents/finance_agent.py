@@ -1,7 +1,7 @@
 from typing import Optional
 from pydantic import BaseModel, Field
 import os
-from langchain_openai import ChatOpenAI
+from llm_provider.provider import current_provider, get_chat_model, get_compiled
 from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.prebuilt import create_react_agent
 from langchain_core.tools import StructuredTool
@@ -33,6 +33,18 @@ class FinanceCarQueryInput(BaseModel):
     location: Optional[str] = Field(None, description="Location of purchase")
     ownership_period: Optional[int] = Field(None, description="Ownership period in years")
 
+def _build_agent():
+    # ChatOpenAI reads OPENAI_API_KEY itself, so no credentials end up in the shared agent
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0)
+    tools = [
+        calculate_financing,
+        calculate_lease,
+        get_maintenance_cost,
+        get_depreciation_info
+    ]
+
+    return create_react_agent(model=llm, tools=tools)
+
 def run_finance_agent(
     query: Optional[str] = None,
     make: Optional[str] = None,
@@ -43,19 +55,11 @@ def run_finance_agent(
     ownership_period: Optional[int] = None
 ) -> str:
     """Run the finance agent with given car details."""
-    api_key = os.environ.get("OPENAI_API_KEY")
-    if not api_key:
+    # Only the OpenAI provider needs a key; the fake provider runs offline
+    if current_provider() == "openai" and not os.environ.get("OPENAI_API_KEY"):
         raise ValueError("OPENAI_API_KEY not found in environment variables.")
 
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key=api_key)
-    tools = [
-        calculate_financing,
-        calculate_lease,
-        get_maintenance_cost,
-        get_depreciation_info
-    ]
-
-    agent = create_react_agent(model=llm, tools=tools)
+    agent = get_compiled("finance_agent", _build_agent)
 
     # Build user message from available parts
     user_parts = []
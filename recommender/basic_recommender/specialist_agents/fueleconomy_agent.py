@@ -1,12 +1,15 @@
 from typing import Optional, List
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
+from llm_provider.provider import get_chat_model, get_compiled
 from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.prebuilt import create_react_agent
 from langchain_core.tools import StructuredTool
-import logging
+from recommender.basic_recommender.specialist_agents.batch import arun_batch, run_batch
+import json
 
 from tools.fueleconomy import FE_TOOLS
+from tools.fueleconomy_resolver import aresolve_vehicle, resolve_vehicle
+from tools.structured_log import get_logger, lazy, preview
 
 
 AGENT_SYSTEM_PROMPT = """
@@ -26,14 +29,7 @@ If the user query is too ambiguous in any of the steps, you can pause and ask fo
 """
 
 
-LOGGER = logging.getLogger("fueleconomy.agent")
-_MAX_LOG_BODY = 1500
-
-
-def _truncate(text: Optional[str], limit: int = _MAX_LOG_BODY) -> str:
-    if not text:
-        return ""
-    return text if len(text) <= limit else text[:limit] + f"... [truncated {len(text) - limit} chars]"
+LOGGER = get_logger("fueleconomy.agent")
 
 
 class FECarQueryInput(BaseModel):
@@ -43,20 +39,14 @@ class FECarQueryInput(BaseModel):
     model: Optional[str] = Field(None, description="Model if known")
 
 
-def run_fueleconomy_agent(query: Optional[str] = None,
-                          year: Optional[int] = None,
-                          make: Optional[str] = None,
-                          model: Optional[str] = None) -> str:
-    print("###### running FE agent #######")
-    """Run the FuelEconomy sub-agent to fetch details for a suggested car."""
-    LOGGER.info(
-        f"run_fueleconomy_agent: start query={query!r} year={year} make={make!r} model={model!r}"
-    )
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
+def _build_agent():
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0.1)
     tools = FE_TOOLS
-    LOGGER.info(f"run_fueleconomy_agent: tools={[t.name for t in tools]}")
-    agent = create_react_agent(model=llm, tools=tools)
+    LOGGER.info("run_fueleconomy_agent.build", tools=lazy(lambda: [t.name for t in tools]))
+    return create_react_agent(model=llm, tools=tools)
 
+
+def _agent_input(query: Optional[str], year: Optional[int], make: Optional[str], model: Optional[str]) -> dict:
     user_text_parts: List[str] = []
     if query:
         user_text_parts.append(f"Suggestion: {query}")
@@ -69,24 +59,65 @@ def run_fueleconomy_agent(query: Optional[str] = None,
     if not user_text_parts:
         user_text_parts.append("No explicit hint provided; start from year menu.")
     user_msg = " | ".join(user_text_parts)
-    LOGGER.info(
-        f"run_fueleconomy_agent: sending system_prompt_len={len(AGENT_SYSTEM_PROMPT)} user_msg={_truncate(user_msg)}"
-    )
+    LOGGER.debug("run_fueleconomy_agent.send", system_prompt_len=len(AGENT_SYSTEM_PROMPT), user_msg=preview(user_msg))
+    return {
+        "messages": [
+            SystemMessage(content=AGENT_SYSTEM_PROMPT),
+            HumanMessage(content=user_msg),
+        ]
+    }
+
+
+def _agent_content(result) -> str:
+    content = result.get("messages", [])[-1].content if result else None
+    LOGGER.info("run_fueleconomy_agent.done", content_len=len(content) if content else 0)
+    LOGGER.debug("run_fueleconomy_agent.content", content=preview(content))
+    return content or "No result produced by FuelEconomy agent."
+
+
+def run_fueleconomy_agent(query: Optional[str] = None,
+                          year: Optional[int] = None,
+                          make: Optional[str] = None,
+                          model: Optional[str] = None) -> str:
+    print("###### running FE agent #######")
+    """Run the FuelEconomy sub-agent to fetch details for a suggested car."""
+    LOGGER.info("run_fueleconomy_agent.start", query=query, year=year, make=make, model=model)
+    # Fast path: resolve the menus in code; the LLM walk only handles ambiguous hints
+    try:
+        resolved = resolve_vehicle(query=query, year=year, make=make, model=model)
+    except Exception:
+        LOGGER.exception("run_fueleconomy_agent.resolver_failed")
+        resolved = None
+    if resolved is not None:
+        return json.dumps(resolved)
+
+    agent = get_compiled("fueleconomy_agent", _build_agent)
+    try:
+        return _agent_content(agent.invoke(_agent_input(query, year, make, model)))
+    except Exception:
+        LOGGER.exception("run_fueleconomy_agent.failed")
+        raise
 
+
+async def arun_fueleconomy_agent(query: Optional[str] = None,
+                                 year: Optional[int] = None,
+                                 make: Optional[str] = None,
+                                 model: Optional[str] = None) -> str:
+    """Async `run_fueleconomy_agent`: the resolver and the agent's tools use the async HTTP client."""
+    LOGGER.info("run_fueleconomy_agent.start", query=query, year=year, make=make, model=model)
     try:
-        result = agent.invoke({
-            "messages": [
-                SystemMessage(content=AGENT_SYSTEM_PROMPT),
-                HumanMessage(content=user_msg),
-            ]
-        })
-        content = result.get("messages", [])[-1].content if result else None
-        LOGGER.info(
-            f"run_fueleconomy_agent: success content_len={len(content) if content else 0} content_preview={_truncate(content)}"
-        )
-        return content or "No result produced by FuelEconomy agent."
+        resolved = await aresolve_vehicle(query=query, year=year, make=make, model=model)
     except Exception:
-        LOGGER.exception("run_fueleconomy_agent: failed")
+        LOGGER.exception("run_fueleconomy_agent.resolver_failed")
+        resolved = None
+    if resolved is not None:
+        return json.dumps(resolved)
+
+    agent = get_compiled("fueleconomy_agent", _build_agent)
+    try:
+        return _agent_content(await agent.ainvoke(_agent_input(query, year, make, model)))
+    except Exception:
+        LOGGER.exception("run_fueleconomy_agent.failed")
         raise
 
 
@@ -97,5 +128,31 @@ FUELECONOMY_AGENT_TOOL = StructuredTool.from_function(
         "reliable vehicle information for a provided car suggestion."
     ),
     func=run_fueleconomy_agent,
+    coroutine=arun_fueleconomy_agent,
     args_schema=FECarQueryInput,
 )
+
+
+class FECarBatchInput(BaseModel):
+    cars: List[FECarQueryInput] = Field(..., description="One entry per car to compare")
+
+
+def run_fueleconomy_batch(cars: List[FECarQueryInput]) -> str:
+    """Resolve several cars concurrently; one round trip of latency instead of one per car."""
+    return run_batch(run_fueleconomy_agent, [FECarQueryInput.model_validate(c) for c in cars])
+
+
+async def arun_fueleconomy_batch(cars: List[FECarQueryInput]) -> str:
+    return await arun_batch(arun_fueleconomy_agent, [FECarQueryInput.model_validate(c) for c in cars])
+
+
+FUELECONOMY_BATCH_AGENT_TOOL = StructuredTool.from_function(
+    name="fueleconomy_batch",
+    description=(
+        "Look up FuelEconomy.gov data for several cars in one call (resolved concurrently). "
+        "Returns a JSON object keyed by \"year make model\"."
+    ),
+    func=run_fueleconomy_batch,
+    coroutine=arun_fueleconomy_batch,
+    args_schema=FECarBatchInput,
+)
@@ -1,12 +1,15 @@
 from typing import Optional, List
 from pydantic import BaseModel, Field
-from langchain_openai import ChatOpenAI
+from llm_provider.provider import get_chat_model, get_compiled
 from langchain_core.messages import SystemMessage, HumanMessage
 from langgraph.prebuilt import create_react_agent
 from langchain_core.tools import StructuredTool
-import logging
+from recommender.basic_recommender.specialist_agents.batch import arun_batch, run_batch
+import json
 
 from tools.nhtsa import NHTSA_TOOLS
+from tools.nhtsa_resolver import aresolve_safety, resolve_safety
+from tools.structured_log import get_logger, lazy
 
 
 AGENT_SYSTEM_PROMPT = """
@@ -34,7 +37,7 @@ Rules:
 """
 
 
-LOGGER = logging.getLogger("nhtsa.agent")
+LOGGER = get_logger("nhtsa.agent")
 
 
 class NHTSACarQueryInput(BaseModel):
@@ -44,18 +47,14 @@ class NHTSACarQueryInput(BaseModel):
     model: Optional[str] = Field(None, description="Model if known")
 
 
-def run_nhtsa_agent(query: Optional[str] = None,
-                    year: Optional[int] = None,
-                    make: Optional[str] = None,
-                    model: Optional[str] = None) -> str:
-    LOGGER.info(
-        f"run_nhtsa_agent: start query={query!r} year={year} make={make!r} model={model!r}"
-    )
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
+def _build_agent():
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0.1)
     tools = NHTSA_TOOLS
-    LOGGER.info(f"run_nhtsa_agent: tools={[t.name for t in tools]}")
-    agent = create_react_agent(model=llm, tools=tools)
+    LOGGER.info("run_nhtsa_agent.build", tools=lazy(lambda: [t.name for t in tools]))
+    return create_react_agent(model=llm, tools=tools)
+
 
+def _agent_input(query: Optional[str], year: Optional[int], make: Optional[str], model: Optional[str]) -> dict:
     user_text_parts: List[str] = []
     if query:
         user_text_parts.append(f"Suggestion: {query}")
@@ -68,21 +67,61 @@ def run_nhtsa_agent(query: Optional[str] = None,
     if not user_text_parts:
         user_text_parts.append("No explicit hint provided; start from year menu.")
     user_msg = " | ".join(user_text_parts)
+    return {
+        "messages": [
+            SystemMessage(content=AGENT_SYSTEM_PROMPT),
+            HumanMessage(content=user_msg),
+        ]
+    }
 
+
+def _agent_content(result) -> str:
+    content = result.get("messages", [])[-1].content if result else None
+    LOGGER.info("run_nhtsa_agent.done", content_len=len(content) if content else 0)
+    return content or "No result produced by NHTSA agent."
+
+
+def run_nhtsa_agent(query: Optional[str] = None,
+                    year: Optional[int] = None,
+                    make: Optional[str] = None,
+                    model: Optional[str] = None) -> str:
+    LOGGER.info("run_nhtsa_agent.start", query=query, year=year, make=make, model=model)
+    # Fast path: match the hint against the cached menu tree; the agent only handles ambiguous hints
+    try:
+        resolved = resolve_safety(query=query, year=year, make=make, model=model)
+    except Exception:
+        LOGGER.exception("run_nhtsa_agent.resolver_failed")
+        resolved = None
+    if resolved is not None:
+        return json.dumps(resolved)
+
+    agent = get_compiled("nhtsa_agent", _build_agent)
     try:
-        result = agent.invoke({
-            "messages": [
-                SystemMessage(content=AGENT_SYSTEM_PROMPT),
-                HumanMessage(content=user_msg),
-            ]
-        })
-        content = result.get("messages", [])[-1].content if result else None
-        LOGGER.info(
-            f"run_nhtsa_agent: success content_len={len(content) if content else 0}"
-        )
-        return content or "No result produced by NHTSA agent."
+        return _agent_content(agent.invoke(_agent_input(query, year, make, model)))
     except Exception:
-        LOGGER.exception("run_nhtsa_agent: failed")
+        LOGGER.exception("run_nhtsa_agent.failed")
+        raise
+
+
+async def arun_nhtsa_agent(query: Optional[str] = None,
+                           year: Optional[int] = None,
+                           make: Optional[str] = None,
+                           model: Optional[str] = None) -> str:
+    """Async `run_nhtsa_agent`: the resolver and the agent's tools use the async HTTP client."""
+    LOGGER.info("run_nhtsa_agent.start", query=query, year=year, make=make, model=model)
+    try:
+        resolved = await aresolve_safety(query=query, year=year, make=make, model=model)
+    except Exception:
+        LOGGER.exception("run_nhtsa_agent.resolver_failed")
+        resolved = None
+    if resolved is not None:
+        return json.dumps(resolved)
+
+    agent = get_compiled("nhtsa_agent", _build_agent)
+    try:
+        return _agent_content(await agent.ainvoke(_agent_input(query, year, make, model)))
+    except Exception:
+        LOGGER.exception("run_nhtsa_agent.failed")
         raise
 
 
@@ -92,6 +131,31 @@ NHTSA_AGENT_TOOL = StructuredTool.from_function(
         "Specialist sub-agent that uses NHTSA SafetyRatings to find VehicleId and fetch ratings"
     ),
     func=run_nhtsa_agent,
+    coroutine=arun_nhtsa_agent,
     args_schema=NHTSACarQueryInput,
 )
 
+
+class NHTSACarBatchInput(BaseModel):
+    cars: List[NHTSACarQueryInput] = Field(..., description="One entry per car to compare")
+
+
+def run_nhtsa_batch(cars: List[NHTSACarQueryInput]) -> str:
+    """Resolve several cars concurrently; one round trip of latency instead of one per car."""
+    return run_batch(run_nhtsa_agent, [NHTSACarQueryInput.model_validate(c) for c in cars])
+
+
+async def arun_nhtsa_batch(cars: List[NHTSACarQueryInput]) -> str:
+    return await arun_batch(arun_nhtsa_agent, [NHTSACarQueryInput.model_validate(c) for c in cars])
+
+
+NHTSA_BATCH_AGENT_TOOL = StructuredTool.from_function(
+    name="nhtsa_batch",
+    description=(
+        "Fetch NHTSA safety ratings for several cars in one call (resolved concurrently). "
+        "Returns a JSON object keyed by \"year make model\"."
+    ),
+    func=run_nhtsa_batch,
+    coroutine=arun_nhtsa_batch,
+    args_schema=NHTSACarBatchInput,
+)
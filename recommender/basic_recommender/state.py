@@ -1,6 +1,6 @@
 # basic_recommender/state.py
 from langgraph.graph import MessagesState
-from typing import Optional, List
+from typing import Annotated, Dict, Optional, List
 from enum import Enum
 
 class FuelType(str, Enum):
@@ -9,9 +9,26 @@ class FuelType(str, Enum):
     ELECTRIC = "electric"
     HYBRID = "hybrid"
 
+def merge_dicts(left: Optional[dict], right: Optional[dict]) -> dict:
+    """Reducer: shallow-merge dict updates so parallel branches can each write their own keys."""
+    return {**(left or {}), **(right or {})}
+
+def car_key(year: Optional[int] = None, make: Optional[str] = None, model: Optional[str] = None) -> str:
+    """Key for per-car enrichment results, e.g. "2025 toyota tacoma" (missing parts are omitted)."""
+    return " ".join(str(p).strip() for p in (year, make, model) if p).lower()
+
 class CarRecommendationState(MessagesState):
     budget: Optional[int] = None
     preferred_brands: Optional[List[str]] = None
     fuel_type: Optional[FuelType] = None
     location: Optional[List[str]] = None  # [Country, State, City]
     zipcode: Optional[int] = None
+    # latest enrichment result per looked-up hint, keyed by the lowercased hint: the
+    # enrichment nodes use the preferred brand ("toyota") for safety and the brand
+    # plus fuel type ("toyota hybrid") for fuel economy; replaced, never appended
+    safety_info: Annotated[Optional[Dict[str, str]], merge_dicts] = None
+    fuel_economy_info: Annotated[Optional[Dict[str, str]], merge_dicts] = None
+    # running summary of turns compacted out of `messages`
+    conversation_summary: Optional[str] = None
+    # node name -> fingerprint of the profile inputs its last successful run used
+    enrichment_fingerprints: Annotated[Optional[Dict[str, str]], merge_dicts] = None
@@ -1,8 +1,14 @@
 # recommender/chat_interface.py
+from typing import Optional
 from recommender.basic_recommender.main_agent import car_recommender_app
 from recommender.basic_recommender.state import CarRecommendationState
+from recommender.session_manager import get_session_manager
+
+def chat(user_input: str, session_id: Optional[str] = None):
+    # With a session id the conversation continues from the stored session state
+    if session_id is not None:
+        return get_session_manager().chat(session_id, user_input)
 
-def chat(user_input: str):
     initial_state = CarRecommendationState(messages=[{"role": "user", "content": user_input}])
     result = car_recommender_app.invoke(initial_state)
     return result["messages"][-1].content
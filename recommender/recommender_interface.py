@@ -1,8 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import AsyncIterator, Iterator, Optional
+import asyncio
 
 
 class IRecommenderSystem(ABC):
     @abstractmethod
     def chat(self, text: Optional[str]) -> str:
         pass
+
+    async def achat(self, text: Optional[str]) -> str:
+        """Async chat; defaults to running `chat` in a worker thread."""
+        return await asyncio.to_thread(self.chat, text)
+
+    def stream(self, text: Optional[str]) -> Iterator[str]:
+        """Yield the reply in pieces as it is generated; defaults to one piece from `chat`."""
+        yield self.chat(text)
+
+    async def astream(self, text: Optional[str]) -> AsyncIterator[str]:
+        """Async counterpart of `stream`; defaults to one piece from `achat`."""
+        yield await self.achat(text)
@@ -0,0 +1,264 @@
+# recommender/session_manager.py
+"""
+Session store for the recommender
+
+Keeps one `RecommenderImplementation` per session id. Recently used sessions
+stay in an in-memory LRU ("hot"); every finished turn is also written through
+to a local SQLite table as a zlib-compressed LangGraph (msgpack) serialization
+of the session state, so evicted ("cold") sessions cost a few KB on disk and
+are restored transparently on their next message.
+
+Configuration (environment or constructor):
+- SESSION_DB_PATH   SQLite file (default "sessions.sqlite")
+- SESSION_MAX_HOT   sessions kept in memory (default 256)
+
+Turns of the same session are serialized by one per-session lock shared by
+the sync and async entry points; different sessions run concurrently. Async
+callers first queue (FIFO) on a per-session `asyncio.Lock`, so only one of
+them at a time waits for the shared lock, in a worker thread rather than by
+polling. A session is pinned while a request uses it and pinned sessions
+are never evicted, so there is only ever one live instance per session id.
+
+`stream`/`astream` run the turn in a producer (thread / task) that holds the
+lock and hand tokens to the caller through a queue: a caller that stops
+reading early does not keep the session locked, the turn still completes
+and is saved.
+"""
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Iterator, Optional, Set
+import asyncio
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+import zlib
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from recommender.basic_recommender.implementation import RecommenderImplementation
+
+
+LOGGER = logging.getLogger("session_manager")
+
+
+@dataclass
+class _Session:
+    recommender: RecommenderImplementation
+    # A plain threading.Lock (not owner-bound), so async turns can hold it across awaits
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    pins: int = 0
+    # asyncio locks are bound to one loop; async callers queue on their loop's lock
+    async_locks: Dict[asyncio.AbstractEventLoop, asyncio.Lock] = field(default_factory=dict)
+
+    def async_lock(self) -> asyncio.Lock:
+        return self.async_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+
+
+async def _acquire(lock: threading.Lock) -> None:
+    """Take `lock` without blocking the event loop."""
+    if lock.acquire(blocking=False):
+        return
+    acquiring = asyncio.ensure_future(asyncio.to_thread(lock.acquire))
+    try:
+        await asyncio.shield(acquiring)
+    except asyncio.CancelledError:
+        # The worker thread still gets the lock; hand it straight back
+        acquiring.add_done_callback(lambda f: f.cancelled() or f.exception() or lock.release())
+        raise
+
+
+class _Failed:
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+_END = object()
+
+
+class SessionManager:
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_hot: Optional[int] = None,
+        factory: Callable[[], RecommenderImplementation] = RecommenderImplementation,
+    ):
+        self.db_path = db_path or os.getenv("SESSION_DB_PATH", "sessions.sqlite")
+        self.max_hot = max(1, max_hot or int(os.getenv("SESSION_MAX_HOT", "256")))
+        self.factory = factory
+        self.serde = JsonPlusSerializer()
+
+        self._hot: "OrderedDict[str, _Session]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._turns: Set[asyncio.Task] = set()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY, type TEXT NOT NULL, state BLOB NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    # --- storage ---
+
+    def _dump(self, state) -> tuple:
+        type_, data = self.serde.dumps_typed(dict(state))
+        return type_, zlib.compress(data)
+
+    def _load(self, session_id: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT type, state FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return self.serde.loads_typed((row[0], zlib.decompress(row[1])))
+
+    def save(self, session_id: str, recommender: RecommenderImplementation) -> None:
+        type_, blob = self._dump(recommender.state)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, type, state, updated_at) VALUES (?, ?, ?, ?)",
+                (session_id, type_, blob, time.time()),
+            )
+            self._db.commit()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._hot.pop(session_id, None)
+            self._db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._db.commit()
+
+    # --- hot cache ---
+
+    @contextmanager
+    def _checkout(self, session_id: str) -> Iterator[_Session]:
+        """Pin the hot session for `session_id` (loading it if needed) for the duration of a request."""
+        with self._lock:
+            session = self._hot.get(session_id)
+            if session is not None:
+                self._hot.move_to_end(session_id)
+            else:
+                recommender = self.factory()
+                state = self._load(session_id)
+                if state is not None:
+                    recommender.state = state
+                session = self._hot[session_id] = _Session(recommender)
+            session.pins += 1
+            self._evict()
+        try:
+            yield session
+        finally:
+            with self._lock:
+                session.pins -= 1
+                self._evict()
+
+    def _evict(self) -> None:
+        # State is written through after every turn, so eviction only drops the
+        # in-memory copy. Pinned sessions are in use and are never evicted.
+        for session_id in list(self._hot):
+            if len(self._hot) <= self.max_hot:
+                break
+            if self._hot[session_id].pins:
+                continue
+            del self._hot[session_id]
+            LOGGER.debug(f"Evicted session {session_id}")
+
+    def hot_count(self) -> int:
+        return len(self._hot)
+
+    def cold_count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._hot.clear()
+            self._db.close()
+
+    # --- turns ---
+
+    def chat(self, session_id: str, text: Optional[str]) -> str:
+        with self._checkout(session_id) as session, session.lock:
+            reply = session.recommender.chat(text)
+            self.save(session_id, session.recommender)
+        return reply
+
+    @asynccontextmanager
+    async def _alocked(self, session: _Session):
+        async with session.async_lock():
+            await _acquire(session.lock)
+            try:
+                yield
+            finally:
+                session.lock.release()
+
+    async def achat(self, session_id: str, text: Optional[str]) -> str:
+        with self._checkout(session_id) as session:
+            async with self._alocked(session):
+                reply = await session.recommender.achat(text)
+                await asyncio.to_thread(self.save, session_id, session.recommender)
+        return reply
+
+    def _stream_turn(self, session_id: str, text: Optional[str], put: Callable) -> None:
+        try:
+            with self._checkout(session_id) as session, session.lock:
+                for token in session.recommender.stream(text):
+                    put(token)
+                self.save(session_id, session.recommender)
+        except BaseException as e:
+            put(_Failed(e))
+        finally:
+            put(_END)
+
+    def stream(self, session_id: str, text: Optional[str]) -> Iterator[str]:
+        tokens: "queue.SimpleQueue" = queue.SimpleQueue()
+        threading.Thread(target=self._stream_turn, args=(session_id, text, tokens.put), daemon=True).start()
+        while (token := tokens.get()) is not _END:
+            if isinstance(token, _Failed):
+                raise token.error
+            yield token
+
+    async def _astream_turn(self, session_id: str, text: Optional[str], put: Callable) -> None:
+        try:
+            with self._checkout(session_id) as session:
+                async with self._alocked(session):
+                    async for token in session.recommender.astream(text):
+                        put(token)
+                    await asyncio.to_thread(self.save, session_id, session.recommender)
+        except BaseException as e:
+            put(_Failed(e))
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            put(_END)
+
+    async def astream(self, session_id: str, text: Optional[str]) -> AsyncIterator[str]:
+        tokens: "asyncio.Queue" = asyncio.Queue()
+        turn = asyncio.create_task(self._astream_turn(session_id, text, tokens.put_nowait))
+        # Keep a reference: the turn outlives a caller that stops reading
+        self._turns.add(turn)
+        turn.add_done_callback(self._turns.discard)
+        while (token := await tokens.get()) is not _END:
+            if isinstance(token, _Failed):
+                raise token.error
+            yield token
+
+
+_default_manager: Optional[SessionManager] = None
+_default_lock = threading.Lock()
+
+
+def get_session_manager() -> SessionManager:
+    """Process-wide session manager configured from the environment."""
+    global _default_manager
+    if _default_manager is None:
+        with _default_lock:
+            if _default_manager is None:
+                _default_manager = SessionManager()
+    return _default_manager
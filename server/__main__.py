@@ -0,0 +1,48 @@
+"""Run the recommender HTTP server: python -m server --port 8000"""
+import argparse
+import logging
+
+from environment.cassette import configure_cassette
+from llm_provider.provider import configure_provider
+from server.app import create_app
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent turns (SERVER_WORKERS)")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="Queued turns before 503 (SERVER_QUEUE_SIZE)")
+    parser.add_argument("--session-db", default=None, help="SQLite session store (SESSION_DB_PATH)")
+    parser.add_argument("--max-hot-sessions", type=int, default=None, help="In-memory sessions (SESSION_MAX_HOT)")
+    parser.add_argument("--llm-provider", choices=["openai", "fake"], default=None,
+                        help="Model backend; 'fake' is a scripted local model for load tests")
+    parser.add_argument("--fake-latency", type=float, default=None, help="Seconds per fake model call")
+    parser.add_argument("--fake-script", default=None, help="JSON script for the fake model")
+    parser.add_argument("--cassette", choices=["off", "record", "replay"], default=None,
+                        help="Record LLM/HTTP calls to disk or replay them offline")
+    parser.add_argument("--cassette-dir", default="cassettes", help="Directory holding recorded cassettes")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.cassette:
+        configure_cassette(args.cassette, args.cassette_dir)
+    if args.llm_provider:
+        configure_provider(args.llm_provider, latency=args.fake_latency, script_path=args.fake_script)
+
+    from recommender.session_manager import SessionManager
+    import uvicorn
+
+    # A single server process: sessions are pinned to in-process workers, so
+    # scaling out means more processes behind a session-affine load balancer.
+    sessions = SessionManager(db_path=args.session_db, max_hot=args.max_hot_sessions)
+    app = create_app(sessions=sessions, workers=args.workers, queue_size=args.queue_size)
+    uvicorn.run(app, host=args.host, port=args.port, lifespan="on")
+
+
+if __name__ == "__main__":
+    main()
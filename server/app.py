@@ -0,0 +1,275 @@
+"""
+ASGI entrypoint for the recommender
+
+Routes:
+- POST /chat          {"session_id": "...", "message": "..."} -> {"session_id", "reply"}
+- POST /chat/stream   same body, reply streamed as chunked text/plain
+- GET  /health        liveness
+- GET  /metrics       queue depth, in-flight turns, rejections and latencies
+
+Turns are executed by a fixed pool of async workers, so at most
+SERVER_WORKERS turns (and their LLM calls) run at once. The workers share
+one bounded queue of SERVER_QUEUE_SIZE turns, so a slow session never
+holds up others; when it is full the request is rejected with 503 and
+Retry-After instead of piling up. Turns of the same session are serialized
+by the session manager's per-session lock.
+
+Written against the bare ASGI interface so it runs on any ASGI server; see
+`python -m server` for the uvicorn launcher.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+
+from recommender.session_manager import SessionManager
+from tools import http_client
+
+
+LOGGER = logging.getLogger("server")
+
+_DONE = object()
+
+
+class Overloaded(Exception):
+    """Raised when the turn queue is full."""
+
+
+@dataclass
+class Turn:
+    session_id: str
+    message: str
+    out: asyncio.Queue = field(default_factory=asyncio.Queue)
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class Metrics:
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self.counters: Dict[str, int] = {"accepted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self.in_flight = 0
+        self.ttft: List[float] = []
+        self.queue_wait: List[float] = []
+
+    def observe(self, samples: List[float], value: float) -> None:
+        samples.append(value)
+        if len(samples) > self.window:
+            del samples[: len(samples) - self.window]
+
+    @staticmethod
+    def _summary(samples: List[float]) -> Dict[str, Optional[float]]:
+        if not samples:
+            return {"p50": None, "p95": None}
+        ordered = sorted(samples)
+        return {
+            "p50": round(ordered[len(ordered) // 2], 4),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            "in_flight": self.in_flight,
+            "ttft_s": self._summary(self.ttft),
+            "queue_wait_s": self._summary(self.queue_wait),
+        }
+
+
+class WorkerPool:
+    def __init__(self, sessions: SessionManager, workers: int, queue_size: int, metrics: Metrics):
+        self.sessions = sessions
+        self.metrics = metrics
+        self.workers = max(1, workers)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, turn: Turn) -> None:
+        try:
+            self.queue.put_nowait(turn)
+        except asyncio.QueueFull:
+            self.metrics.counters["rejected"] += 1
+            raise Overloaded()
+        self.metrics.counters["accepted"] += 1
+
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    async def _work(self) -> None:
+        while True:
+            turn = await self.queue.get()
+            started = time.perf_counter()
+            self.metrics.observe(self.metrics.queue_wait, started - turn.enqueued)
+            self.metrics.in_flight += 1
+            first = True
+            try:
+                async for token in self.sessions.astream(turn.session_id, turn.message):
+                    if first:
+                        self.metrics.observe(self.metrics.ttft, time.perf_counter() - started)
+                        first = False
+                    await turn.out.put(token)
+                self.metrics.counters["completed"] += 1
+                await turn.out.put(_DONE)
+            except Exception as e:
+                LOGGER.exception(f"Turn failed for session {turn.session_id}")
+                self.metrics.counters["failed"] += 1
+                await turn.out.put(e)
+            finally:
+                self.metrics.in_flight -= 1
+                self.queue.task_done()
+
+
+class RecommenderApp:
+    def __init__(self, sessions: Optional[SessionManager] = None, workers: Optional[int] = None,
+                 queue_size: Optional[int] = None):
+        self.sessions = sessions
+        self.workers = workers or int(os.getenv("SERVER_WORKERS", "16"))
+        self.queue_size = queue_size or int(os.getenv("SERVER_QUEUE_SIZE", "256"))
+        self.retry_after = os.getenv("SERVER_RETRY_AFTER", "1")
+        self.metrics = Metrics()
+        self.pool: Optional[WorkerPool] = None
+
+    # --- lifecycle ---
+
+    async def startup(self) -> None:
+        if self.sessions is None:
+            self.sessions = SessionManager()
+        self.pool = WorkerPool(self.sessions, self.workers, self.queue_size, self.metrics)
+        self.pool.start()
+        LOGGER.info(f"Recommender server started with {self.workers} workers")
+
+    async def shutdown(self) -> None:
+        if self.pool is not None:
+            await self.pool.stop()
+        if self.sessions is not None:
+            self.sessions.close()
+        await http_client.aclose()
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        if self.pool is None:
+            await self.startup()
+
+        route = (scope["method"], scope["path"].rstrip("/") or "/")
+        if route == ("GET", "/health"):
+            await _send_json(send, 200, {"status": "ok"})
+        elif route == ("GET", "/metrics"):
+            await _send_json(send, 200, self._metrics())
+        elif route == ("POST", "/chat"):
+            await self._chat(receive, send, stream=False)
+        elif route == ("POST", "/chat/stream"):
+            await self._chat(receive, send, stream=True)
+        else:
+            await _send_json(send, 404, {"error": "not found"})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.startup()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    def _metrics(self) -> Dict[str, Any]:
+        return {
+            **self.metrics.snapshot(),
+            "queued": self.pool.depth(),
+            "workers": self.workers,
+            "sessions_hot": self.sessions.hot_count(),
+            "sessions_stored": self.sessions.cold_count(),
+        }
+
+    # --- chat ---
+
+    async def _chat(self, receive, send, stream: bool) -> None:
+        try:
+            body = json.loads(await _read_body(receive) or b"{}")
+            message = body["message"]
+            if not isinstance(message, str):
+                raise TypeError("'message' must be a string")
+        except (ValueError, KeyError, TypeError):
+            await _send_json(send, 400, {"error": "expected JSON body with a string 'message'"})
+            return
+        session_id = str(body.get("session_id") or uuid.uuid4())
+
+        turn = Turn(session_id, message)
+        try:
+            self.pool.submit(turn)
+        except Overloaded:
+            await _send_json(send, 503, {"error": "overloaded, retry later"},
+                             headers=[(b"retry-after", self.retry_after.encode())])
+            return
+
+        if stream:
+            await self._stream_reply(send, turn)
+            return
+
+        parts = []
+        while (item := await turn.out.get()) is not _DONE:
+            if isinstance(item, Exception):
+                await _send_json(send, 500, {"error": f"{type(item).__name__}: {item}"})
+                return
+            parts.append(item)
+        await _send_json(send, 200, {"session_id": session_id, "reply": "".join(parts)})
+
+    async def _stream_reply(self, send, turn: Turn) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"x-session-id", turn.session_id.encode("utf-8")),
+                (b"cache-control", b"no-cache"),
+            ],
+        })
+        while (item := await turn.out.get()) is not _DONE:
+            if isinstance(item, Exception):
+                # Headers are already sent; end the stream with an error marker
+                await send({"type": "http.response.body", "body": b"\n[error]", "more_body": True})
+                break
+            await send({"type": "http.response.body", "body": item.encode("utf-8"), "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _send_json(send, status: int, payload: Any, headers: Optional[list] = None) -> None:
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+                   + (headers or []),
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def create_app(**kwargs: Any) -> RecommenderApp:
+    return RecommenderApp(**kwargs)
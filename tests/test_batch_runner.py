@@ -0,0 +1,45 @@
+import asyncio
+import json
+
+import pytest
+
+from environment import batch_runner
+from environment.batch_runner import EpisodeSpec, arun_batch, build_matrix, load_persona
+
+
+def test_build_matrix_is_the_cartesian_product():
+    specs = build_matrix(["p1", "p2"], ["LOYAL"], [0, 1])
+    assert specs == [EpisodeSpec("p1", "LOYAL", 0), EpisodeSpec("p1", "LOYAL", 1),
+                     EpisodeSpec("p2", "LOYAL", 0), EpisodeSpec("p2", "LOYAL", 1)]
+
+
+def test_load_persona_falls_back_to_goal_based_goals():
+    persona, raw_review, goal = load_persona("JsonPersona.persona_1", "LOYAL")
+    assert persona and raw_review and "Jaguar" in goal
+    with pytest.raises(KeyError):
+        load_persona("JsonPersona.persona_1", "NO_SUCH_GOAL")
+
+
+def test_arun_batch_writes_one_record_per_episode(tmp_path, monkeypatch):
+    running = []
+    peak = []
+
+    async def fake_episode(spec, evaluate=False):
+        running.append(spec)
+        peak.append(len(running))
+        await asyncio.sleep(0.01)
+        running.remove(spec)
+        failed = spec.seed == 1
+        return {"persona": spec.persona, "goal": spec.goal, "seed": spec.seed,
+                "outcome": None if failed else {"decision": "accept"},
+                "error": "RuntimeError: boom" if failed else None, "duration_s": 0.01}
+
+    monkeypatch.setattr(batch_runner, "arun_episode", fake_episode)
+    output = tmp_path / "results.jsonl"
+    specs = build_matrix(["p"], ["g"], range(5))
+
+    assert asyncio.run(arun_batch(specs, str(output), concurrency=2)) == 4
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(r["seed"] for r in records) == list(range(5))
+    assert [r["seed"] for r in records if r["error"]] == [1]
+    assert max(peak) == 2
@@ -0,0 +1,49 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.outputs import Generation
+
+from environment.cassette import Cassette, CassetteLLMCache, CassetteMiss
+
+
+def test_record_then_replay_round_trip(tmp_path):
+    calls = []
+
+    def fetch():
+        calls.append("sync")
+        return {"rows": [1, 2]}
+
+    async def afetch():
+        calls.append("async")
+        return ["a", "b"]
+
+    recorder = Cassette("record", str(tmp_path))
+    assert recorder.call("http", {"url": "u", "params": {"b": 1, "a": 2}}, fetch) == {"rows": [1, 2]}
+    assert asyncio.run(recorder.acall("litellm", {"prompt": "p"}, afetch)) == ["a", "b"]
+
+    player = Cassette("replay", str(tmp_path))
+    # Keys do not depend on dict ordering
+    assert player.call("http", {"url": "u", "params": {"a": 2, "b": 1}}, fetch) == {"rows": [1, 2]}
+    assert asyncio.run(player.acall("litellm", {"prompt": "p"}, afetch)) == ["a", "b"]
+    assert calls == ["sync", "async"]
+
+    with pytest.raises(CassetteMiss):
+        player.call("http", {"url": "other"}, fetch)
+    with pytest.raises(ValueError):
+        Cassette("rewind", str(tmp_path))
+
+
+def _prompt(message_id):
+    return json.dumps([{"lc": 1, "type": "constructor", "id": ["HumanMessage"],
+                        "kwargs": {"content": "hi", "id": message_id}}])
+
+
+def test_llm_cache_replays_across_message_ids(tmp_path):
+    CassetteLLMCache(Cassette("record", str(tmp_path))).update(_prompt("run-1"), "model", [Generation(text="hello")])
+
+    replay = CassetteLLMCache(Cassette("replay", str(tmp_path)))
+    assert [g.text for g in replay.lookup(_prompt("run-2"), "model")] == ["hello"]
+    with pytest.raises(CassetteMiss):
+        replay.lookup(_prompt("run-2"), "other-model")
+    assert CassetteLLMCache(Cassette("off", str(tmp_path))).lookup(_prompt("run-1"), "model") is None
@@ -0,0 +1,40 @@
+import asyncio
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
+from langgraph.graph.message import add_messages
+
+from recommender.basic_recommender.nodes import compaction_node
+
+
+def _conversation(turns):
+    messages = []
+    for i in range(turns):
+        messages += [HumanMessage(f"question {i}", id=f"h{i}"), AIMessage(f"answer {i}", id=f"a{i}")]
+    return messages
+
+
+def test_turns_outside_the_window_are_compacted(monkeypatch):
+    monkeypatch.setattr(compaction_node, "KEEP_TURNS", 2)
+    monkeypatch.setattr(compaction_node, "TOKEN_BUDGET", 10_000)
+    messages = _conversation(4)
+    assert [m.id for m in compaction_node.messages_to_compact(messages)] == ["h0", "a0", "h1", "a1"]
+    assert compaction_node.messages_to_compact(messages[:4]) == []
+
+    # Over the token budget older turns go too, but the current turn always stays
+    monkeypatch.setattr(compaction_node, "TOKEN_BUDGET", 1)
+    assert [m.id for m in compaction_node.messages_to_compact(messages)][-2:] == ["h2", "a2"]
+
+
+def test_compaction_replaces_old_messages_with_a_summary(monkeypatch):
+    monkeypatch.setattr(compaction_node, "KEEP_TURNS", 1)
+    monkeypatch.setattr(compaction_node, "get_chat_model", lambda **kwargs: FakeListChatModel(responses=["wants a hybrid"]))
+    state = {"messages": _conversation(3), "conversation_summary": None}
+
+    for update in (compaction_node.compaction_node(state), asyncio.run(compaction_node.acompaction_node(state))):
+        assert update["conversation_summary"] == "wants a hybrid"
+        assert all(isinstance(m, RemoveMessage) for m in update["messages"])
+        remaining = add_messages(state["messages"], update["messages"])
+        assert [m.id for m in remaining] == ["h2", "a2"]
+
+    assert compaction_node.compaction_node({"messages": _conversation(1)}) == {}
@@ -0,0 +1,45 @@
+import math
+import random
+
+import numpy as np
+
+from tools.distance_checker import haversine, haversine_matrix, haversine_many, within_radius
+
+
+def _points(n, seed=7):
+    rng = random.Random(seed)
+    return [(rng.uniform(-89, 89), rng.uniform(-179, 179)) for _ in range(n)]
+
+
+def test_vectorized_matches_scalar():
+    origin = (30.2672, -97.7431)
+    points = _points(200)
+    expected = [haversine(*origin, lat, lon) for lat, lon in points]
+    got = haversine_many(*origin, [p[0] for p in points], [p[1] for p in points])
+    assert got.shape == (200,)
+    np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-6)
+
+
+def test_known_distance_and_degenerate_cases():
+    # Austin -> Dallas is about 182 miles
+    assert math.isclose(haversine(30.2672, -97.7431, 32.7767, -96.7970), 182.1, abs_tol=1.0)
+    assert haversine_many(10.0, 20.0, [10.0], [20.0])[0] == 0.0
+    # Antipodal points must not produce NaN
+    assert math.isclose(haversine_many(0.0, 0.0, [0.0], [180.0])[0], math.pi * 3959.87433, rel_tol=1e-9)
+
+
+def test_matrix_matches_rows():
+    origins, points = _points(3, seed=1), _points(5, seed=2)
+    matrix = haversine_matrix([o[0] for o in origins], [o[1] for o in origins],
+                              [p[0] for p in points], [p[1] for p in points])
+    assert matrix.shape == (3, 5)
+    for i, (lat, lon) in enumerate(origins):
+        np.testing.assert_allclose(matrix[i], [haversine(lat, lon, *p) for p in points], rtol=1e-9, atol=1e-6)
+
+
+def test_within_radius():
+    austin = (30.2672, -97.7431)
+    distances, mask = within_radius(austin, [(32.7767, -96.7970), (29.7604, -95.3698), (40.7128, -74.0060)], 200)
+    assert mask.tolist() == [True, True, False]
+    assert distances.shape == (3,)
+    assert within_radius(austin, [], 100)[0].shape == (0,)
@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from recommender.basic_recommender.graph_builder import ENRICHMENT_NODES, build_car_recommender_graph
+from recommender.basic_recommender.nodes import fueleconomy_node, nhtsa_node
+from recommender.basic_recommender.state import FuelType
+
+
+class FakeTool:
+    def __init__(self, reply="result", error=None):
+        self.reply, self.error, self.calls = reply, error, []
+
+    def invoke(self, request):
+        self.calls.append(request)
+        if self.error:
+            raise self.error
+        return self.reply
+
+    async def ainvoke(self, request):
+        return self.invoke(request)
+
+
+@pytest.fixture
+def tools(monkeypatch):
+    fake = {"nhtsa": FakeTool("5 stars"), "fueleconomy": FakeTool("40 mpg")}
+    monkeypatch.setattr(nhtsa_node, "NHTSA_AGENT_TOOL", fake["nhtsa"])
+    monkeypatch.setattr(fueleconomy_node, "FUELECONOMY_AGENT_TOOL", fake["fueleconomy"])
+    return fake
+
+
+def test_results_are_keyed_by_the_hint_that_was_looked_up(tools):
+    state = {"preferred_brands": ["Toyota", "Honda"], "fuel_type": FuelType.HYBRID}
+
+    update = fueleconomy_node.fueleconomy_node(state)
+    assert tools["fueleconomy"].calls == [{"make": "Toyota", "query": "Toyota hybrid"}]
+    assert update["fuel_economy_info"] == {"toyota hybrid": "(hybrid) 40 mpg"}
+
+    update = asyncio.run(nhtsa_node.anhtsa_node(state))
+    assert tools["nhtsa"].calls == [{"make": "Toyota", "query": "Toyota"}]
+    assert update["safety_info"] == {"toyota": "5 stars"}
+
+
+def test_graph_runs_only_the_profile_enrichment_nodes():
+    assert ENRICHMENT_NODES == ["nhtsa", "fueleconomy"]
+    nodes = set(build_car_recommender_graph().get_graph().nodes)
+    assert "distance_check" not in nodes and set(ENRICHMENT_NODES) <= nodes
+
+
+def test_unchanged_inputs_are_skipped_and_failures_retried(tools):
+    state = {"preferred_brands": ["Toyota"], "fuel_type": FuelType.HYBRID}
+    update = nhtsa_node.nhtsa_node(state)
+    state["enrichment_fingerprints"] = update["enrichment_fingerprints"]
+
+    assert nhtsa_node.nhtsa_node(state) == {}
+    assert len(tools["nhtsa"].calls) == 1
+
+    # A different brand is a new input
+    state["preferred_brands"] = ["Honda"]
+    assert nhtsa_node.nhtsa_node(state)["safety_info"] == {"honda": "5 stars"}
+
+    # A failed lookup records no fingerprint, so the next turn tries again
+    tools["fueleconomy"].error = RuntimeError("down")
+    assert fueleconomy_node.fueleconomy_node(state) == {}
+    tools["fueleconomy"].error = None
+    assert "fueleconomy" in fueleconomy_node.fueleconomy_node(state)["enrichment_fingerprints"]
+    assert len(tools["fueleconomy"].calls) == 2
@@ -0,0 +1,46 @@
+import asyncio
+from argparse import Namespace
+
+from environment.environment import Environment
+
+
+async def _tokens(reply, delay=0.005):
+    for token in reply.split(" "):
+        await asyncio.sleep(delay)
+        yield token + " "
+
+
+def _environment(**args):
+    return Environment(Namespace(**{"chat": False, "verbose": False, "evaluate": False, **args}), None, None)
+
+
+def test_batch_replies_are_printed_whole(capsys):
+    environments = [_environment(), _environment()]
+
+    async def two_episodes():
+        return await asyncio.gather(
+            environments[0]._aprint_reply(_tokens("alpha beta gamma")),
+            environments[1]._aprint_reply(_tokens("one two three")),
+        )
+
+    assert asyncio.run(two_episodes()) == ["alpha beta gamma ", "one two three "]
+    lines = capsys.readouterr().out.splitlines()
+    assert "Recommender: alpha beta gamma " in lines
+    assert "Recommender: one two three " in lines
+    for environment in environments:
+        [latency] = environment.turn_latencies
+        assert 0 < latency["ttft_s"] <= latency["total_s"]
+
+
+def test_chat_streams_tokens(capsys):
+    environment = _environment(chat=True)
+    printed = []
+
+    def tokens():
+        for token in ["a", "b"]:
+            yield token
+            printed.append(capsys.readouterr().out)
+
+    assert environment._print_reply(tokens()) == "ab"
+    assert printed[0].endswith("Recommender: a")
+    assert printed[1] == "b"
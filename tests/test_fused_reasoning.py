@@ -0,0 +1,38 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from recommender.basic_recommender.nodes.reasoning_node import (
+    UPDATE_PROFILE_TOOL, _capture_profile_calls, _fused_reply,
+)
+
+
+def _call(name, args, call_id):
+    return {"name": name, "args": args, "id": call_id, "type": "tool_call"}
+
+
+def test_hook_strips_profile_calls_from_a_step_with_an_answer():
+    update = _call(UPDATE_PROFILE_TOOL.name, {"budget": 30000}, "1")
+    lookup = _call("nhtsa_agent", {"query": "Camry"}, "2")
+    message = AIMessage("Looking that up.", id="m1", tool_calls=[update, lookup])
+
+    result = _capture_profile_calls({"messages": [HumanMessage("hi"), message]})
+    [stripped] = result["messages"]
+    assert stripped.id == "m1" and [c["name"] for c in stripped.tool_calls] == ["nhtsa_agent"]
+    assert result["profile_calls"] == [update]
+
+    # Nothing to strip, or nothing left after stripping: the step runs unchanged
+    assert _capture_profile_calls({"messages": [AIMessage("plain answer")]}) == {}
+    assert _capture_profile_calls({"messages": [AIMessage("", tool_calls=[update])]}) == {}
+
+
+def test_fused_reply_merges_captured_and_executed_updates():
+    state = {"messages": [HumanMessage("I have 30k for a Toyota")]}
+    executed = AIMessage("", tool_calls=[_call(UPDATE_PROFILE_TOOL.name, {"preferred_brands": ["Toyota"]}, "2")])
+    result = {
+        "messages": [executed, ToolMessage("Profile updated.", tool_call_id="2"), AIMessage("Try a Camry.")],
+        "profile_calls": [_call(UPDATE_PROFILE_TOOL.name, {"budget": 30000}, "1"),
+                          _call(UPDATE_PROFILE_TOOL.name, {"budget": "lots"}, "3")],
+    }
+
+    update = _fused_reply(state, result)
+    assert update["budget"] == 30000 and update["preferred_brands"] == ["Toyota"]
+    assert [m.content for m in update["messages"]] == ["I have 30k for a Toyota", "Try a Camry."]
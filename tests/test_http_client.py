@@ -0,0 +1,77 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tools import http_client
+
+
+@pytest.fixture
+def server():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            threading.Event().wait(0.05)  # keep concurrent duplicates in flight together
+            body = b'{"ok": true}' if self.path.startswith("/ok") else b"missing"
+            self.send_response(200 if self.path.startswith("/ok") else 404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_afetch_coalesces_concurrent_gets(server):
+    url, hits = server
+
+    async def main():
+        return await asyncio.gather(*(http_client.afetch(f"{url}/ok", params={"a": 1}) for _ in range(5)))
+
+    responses = asyncio.run(main())
+    assert [r.json() for r in responses] == [{"ok": True}] * 5
+    assert hits == ["/ok?a=1"]
+
+    missing = asyncio.run(http_client.afetch(f"{url}/nope"))
+    assert missing.status == 404
+    with pytest.raises(http_client.HttpError):
+        missing.raise_for_status()
+
+
+def test_async_client_is_closed_with_its_loop(server):
+    url, _ = server
+    clients = []
+
+    async def main():
+        await http_client.afetch(f"{url}/ok")
+        clients.append((await http_client._loop_client()).client)
+
+    asyncio.run(main())
+    asyncio.run(main())
+    # One client per loop, closed when asyncio.run shuts the loop down
+    assert clients[0] is not clients[1]
+    assert all(c.is_closed for c in clients)
+    assert not http_client._loop_clients
+
+
+def test_aclose_releases_the_running_loops_client(server):
+    url, _ = server
+
+    async def main():
+        await http_client.afetch(f"{url}/ok")
+        client = (await http_client._loop_client()).client
+        await http_client.aclose()
+        assert client.is_closed and not http_client._loop_clients
+        # The next request opens a fresh client
+        assert (await http_client.afetch(f"{url}/ok")).ok
+
+    asyncio.run(main())
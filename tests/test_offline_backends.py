@@ -0,0 +1,61 @@
+import asyncio
+import csv
+import json
+
+import pytest
+
+from tools import fueleconomy, fueleconomy_offline, nhtsa, nhtsa_offline
+
+FE_COLUMNS = ["id", "year", "make", "model", "trany", "cylinders", "displ", "tCharger", "comb08"]
+FE_ROWS = [
+    ["101", "2022", "Toyota", "Camry", "Automatic (S8)", "4", "2.5", "", "32"],
+    ["102", "2022", "Toyota", "Camry", "Automatic (S8)", "6", "3.5", "", "26"],
+    ["103", "2021", "Honda", "Civic", "Manual 6-spd", "4", "1.5", "T", "33"],
+    ["bad", "2021", "Honda", "Civic", "", "", "", "", ""],
+]
+
+
+def test_fueleconomy_store_round_trip(tmp_path, monkeypatch):
+    csv_path = tmp_path / "vehicles.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FE_COLUMNS)
+        writer.writerows(FE_ROWS)
+    store = tmp_path / "fe.sqlite"
+    assert fueleconomy_offline.import_csv(str(csv_path), str(store)) == 3
+
+    monkeypatch.setenv("FE_BACKEND", "offline")
+    monkeypatch.setenv("FE_OFFLINE_DB", str(store))
+    assert fueleconomy._get_json("vehicle/menu/year") == {
+        "menuItem": [{"text": "2022", "value": "2022"}, {"text": "2021", "value": "2021"}]}
+    models = asyncio.run(fueleconomy._aget_json("vehicle/menu/model", {"year": 2022, "make": "toyota"}))
+    assert models["menuItem"] == [{"text": "Camry", "value": "Camry"}]
+    options = fueleconomy._get_json("vehicle/menu/options", {"year": 2021, "make": "Honda", "model": "civic"})
+    assert options["menuItem"] == [{"text": "Manual 6-spd, 4 cyl, 1.5 L, Turbo", "value": "103"}]
+    assert fueleconomy._get_json("vehicle/102")["comb08"] == "26"
+    with pytest.raises(KeyError):
+        fueleconomy._get_json("vehicle/999")
+
+
+def test_nhtsa_snapshot_export_import_round_trip(tmp_path, monkeypatch):
+    source = nhtsa_offline.SnapshotStore(str(tmp_path / "source.sqlite"))
+    ratings = {"Count": 1, "Results": [{"VehicleId": 7, "OverallRating": "5"}]}
+    source.put_many([
+        ("SafetyRatings/modelyear/2022/make/LAND%20ROVER", json.dumps({"Count": 1, "Results": [{"Model": "DEFENDER"}]})),
+        ("SafetyRatings/VehicleId/7", json.dumps(ratings)),
+    ])
+    source.add_years([2022])
+    source.close()
+
+    exported = tmp_path / "snapshot.jsonl"
+    assert nhtsa_offline.export_snapshot(str(exported), str(tmp_path / "source.sqlite")) == 2
+    copy = tmp_path / "copy.sqlite"
+    assert nhtsa_offline.import_snapshot(str(exported), str(copy)) == 2
+
+    monkeypatch.setenv("NHTSA_BACKEND", "offline")
+    monkeypatch.setenv("NHTSA_OFFLINE_DB", str(copy))
+    assert nhtsa._get_json("SafetyRatings")["Results"] == [{"ModelYear": 2022}]
+    # Keys are unquoted and case-insensitive, like the API
+    assert nhtsa._get_json("SafetyRatings/modelyear/2022/make/Land Rover")["Results"] == [{"Model": "DEFENDER"}]
+    assert asyncio.run(nhtsa._aget_json("SafetyRatings/VehicleId/7")) == ratings
+    assert nhtsa._get_json("SafetyRatings/VehicleId/8")["Results"] == []
@@ -0,0 +1,75 @@
+from langchain_core.messages import HumanMessage
+
+from recommender.basic_recommender.nodes.profile_extractor import profile_rules_node
+from recommender.basic_recommender.nodes.profile_rules import extract_profile_rules
+from recommender.basic_recommender.state import FuelType
+
+
+def test_resolves_budget_zip_brand_and_fuel():
+    rules = extract_profile_rules("Budget is $30k, zip 78701, looking for a hybrid Honda")
+    assert rules.fields == {"budget": 30000, "zipcode": 78701, "preferred_brands": ["Honda"],
+                            "fuel_type": FuelType.HYBRID}
+    assert not rules.needs_llm
+
+
+def test_budget_forms():
+    assert extract_profile_rules("under 25 grand").fields["budget"] == 25000
+    assert extract_profile_rules("$20,000 to $24,500").fields["budget"] == 24500
+    assert extract_profile_rules("around 35k").fields["budget"] == 35000
+
+
+def test_mileage_is_not_a_budget():
+    rules = extract_profile_rules("I want a used Toyota with under 50k miles")
+    assert "budget" not in rules.fields
+    assert rules.fields["preferred_brands"] == ["Toyota"]
+
+
+def test_other_units_are_not_a_budget():
+    for text in ("at least 300 hp", "something that gets 40 mpg", "under 80k km", "$50,000 miles"):
+        assert "budget" not in extract_profile_rules(text).fields, text
+
+
+def test_trade_in_defers_to_llm_without_recording_the_owned_brand():
+    rules = extract_profile_rules("I have a 2019 Ford with 60k miles, want to trade in")
+    assert rules.needs_llm
+    assert "budget" not in rules.fields
+    assert "preferred_brands" not in rules.fields
+
+
+def test_ownership_phrasings_defer_to_llm():
+    for text in ("I own a Honda Civic", "I currently drive a Subaru", "Can I trade-in my Jeep?"):
+        rules = extract_profile_rules(text)
+        assert rules.needs_llm, text
+        assert "preferred_brands" not in rules.fields, text
+
+
+def test_unresolved_cues_defer_to_llm():
+    assert extract_profile_rules("I live in Austin, TX").needs_llm
+    assert extract_profile_rules("anything but Toyota, I don't like them").needs_llm
+    assert extract_profile_rules("my budget is flexible").needs_llm
+
+
+def test_bare_numbers_after_money_cues_are_budgets():
+    for text, budget in (("max 40000", 40000), ("budget 30000", 30000), ("I can spend 28000", 28000),
+                         ("looking for something under 35000 dollars", 35000), ("my budget is 30,000", 30000)):
+        rules = extract_profile_rules(text)
+        assert rules.fields == {"budget": budget}, text
+        assert not rules.needs_llm, text
+
+
+def test_zip_needs_a_location_cue():
+    for text in ("zip 78701", "I'm in 78701", "Austin TX 78701", "zip code: 78701"):
+        assert extract_profile_rules(text).fields == {"zipcode": 78701}, text
+
+
+def test_unexplained_five_digit_number_defers_to_llm():
+    rules = extract_profile_rules("78701")
+    assert rules.fields == {} and rules.needs_llm
+    assert extract_profile_rules("around 2020 model").fields == {}
+
+
+def test_rules_node_writes_nothing_when_the_llm_is_needed():
+    state = {"messages": [HumanMessage("I have a Honda with 40000 on it")]}
+    assert profile_rules_node(state) == {}
+    state = {"messages": [HumanMessage("budget 30000, zip 78701")]}
+    assert profile_rules_node(state) == {"budget": 30000, "zipcode": 78701}
@@ -0,0 +1,33 @@
+from langchain_core.messages import AIMessageChunk
+
+from recommender.basic_recommender.implementation import STREAM_NODE, _StepBuffer, _reply_chunk
+from recommender.basic_recommender.nodes.reasoning_node import UPDATE_PROFILE_TOOL
+
+
+def _chunk(message_id, content="", tool=None, finish=False):
+    tool_call_chunks = [{"name": tool, "args": "", "id": "c", "index": 0, "type": "tool_call_chunk"}] if tool else []
+    return AIMessageChunk(content=content, id=message_id, tool_call_chunks=tool_call_chunks,
+                          response_metadata={"finish_reason": "stop"} if finish else {})
+
+
+def test_only_the_reasoning_model_tokens_are_streamed():
+    chunk = _chunk("m", "hi")
+    assert _reply_chunk(chunk, {"langgraph_checkpoint_ns": f"{STREAM_NODE}:1|agent:2"}) is chunk
+    assert _reply_chunk(chunk, {"langgraph_checkpoint_ns": f"{STREAM_NODE}:1|tools:2|agent:3"}) is None
+    assert _reply_chunk(chunk, {"langgraph_checkpoint_ns": "extract_profile:1"}) is None
+    assert _reply_chunk("not a chunk", {"langgraph_checkpoint_ns": f"{STREAM_NODE}:1"}) is None
+
+
+def test_step_buffer_drops_tool_steps_and_releases_the_reply():
+    buffer = _StepBuffer()
+    released = []
+    # An intermediate step that calls a tool is dropped once the next step starts
+    released += buffer.feed(_chunk("step-1", "Let me check "))
+    released += buffer.feed(_chunk("step-1", tool="nhtsa_agent"))
+    released += buffer.feed(_chunk("step-2", "The Camry "))
+    assert released == []
+    # A profile update does not make the final answer a tool step
+    released += buffer.feed(_chunk("step-2", tool=UPDATE_PROFILE_TOOL.name))
+    released += buffer.feed(_chunk("step-2", "is safe.", finish=True))
+    assert released == ["The Camry ", "is safe."]
+    assert buffer.finish() == []
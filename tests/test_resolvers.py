@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from tools import fueleconomy_resolver, nhtsa_resolver
+from tools.matching import awalk_menus, walk_menus
+
+
+MENUS = {
+    2025: {"Toyota": ["Camry", "RAV4", "RAV4 Hybrid AWD"]},
+    2024: {"Toyota": ["Camry", "Camry Hybrid"], "Honda": ["Civic", "CR-V", "CR-V Hybrid AWD"],
+           "Ford": ["F150 Pickup 2WD", "F150 Pickup 4WD"]},
+}
+OPTIONS = {
+    (2024, "Honda", "CR-V Hybrid AWD"): [{"id": 47100, "text": "Auto (AV-S7), 4 cyl, 2.0 L"}],
+    (2024, "Ford", "F150 Pickup 4WD"): [{"id": 47200, "text": "Auto (S10), 6 cyl, 3.5 L, Turbo"},
+                                        {"id": 47201, "text": "Auto (S10), 8 cyl, 5.0 L"}],
+}
+
+
+def _years():
+    return sorted(MENUS, reverse=True)
+
+
+def _makes(year):
+    return list(MENUS.get(year, {}))
+
+
+def _models(year, make):
+    return MENUS.get(year, {}).get(make, [])
+
+
+def _async(fn, calls=None):
+    async def menu(*args):
+        if calls is not None:
+            calls.append(args)
+        await asyncio.sleep(0)
+        return fn(*args)
+    return menu
+
+
+async def _collect(walk):
+    return [candidate async for candidate in walk]
+
+
+def test_walk_menus_resolves_year_make_and_model():
+    walk = walk_menus("2024 honda crv hybrid", None, None, None, _years, _makes, _models)
+    assert next(walk)[:3] == (2024, "Honda", "CR-V Hybrid AWD")
+    walk = walk_menus(None, 2024, "Ford", "F150 4wd xlt", _years, _makes, _models)
+    assert next(walk) == (2024, "Ford", "F150 Pickup 4WD", "xlt")
+
+
+def test_walk_menus_falls_back_to_older_years():
+    walk = list(walk_menus("toyota camry hybrid", None, None, None, _years, _makes, _models))
+    # 2025 has no Camry Hybrid but does have a Camry; callers take the first usable leaf menu
+    assert [(y, m) for y, _, m, _ in walk] == [(2025, "Camry"), (2024, "Camry Hybrid")]
+
+
+def test_awalk_menus_matches_walk_menus_and_fetches_each_menu_once():
+    for hint in ("toyota camry hybrid", "2024 honda crv hybrid", "a fast car"):
+        calls = []
+        menus = (_async(_years, calls), _async(_makes, calls), _async(_models, calls))
+        walk = asyncio.run(_collect(awalk_menus(hint, None, None, None, *menus)))
+        assert walk == list(walk_menus(hint, None, None, None, _years, _makes, _models))
+        assert len(calls) == len(set(calls))
+
+
+def test_walk_menus_gives_up_on_ambiguous_hints():
+    assert list(walk_menus("hybrid suv", None, "Toyota", None, _years, _makes, _models)) == []
+    assert list(walk_menus("2019 toyota camry", None, None, None, _years, _makes, _models)) == []
+    assert list(walk_menus("a fast car", None, None, None, _years, _makes, _models)) == []
+
+
+@pytest.fixture
+def fe_menus(monkeypatch):
+    calls = []
+
+    def menu_years():
+        calls.append("years")
+        return _years()
+
+    monkeypatch.setattr(fueleconomy_resolver, "fe_menu_years", menu_years)
+    monkeypatch.setattr(fueleconomy_resolver, "fe_menu_makes", _makes)
+    monkeypatch.setattr(fueleconomy_resolver, "fe_menu_models", _models)
+    monkeypatch.setattr(fueleconomy_resolver, "fe_menu_options", lambda y, mk, md: OPTIONS.get((y, mk, md), []))
+    monkeypatch.setattr(fueleconomy_resolver, "fe_vehicle_details",
+                        lambda vid: {"id": vid, "comb08": "40", "city08": "", "make": "x"})
+    for name in ("fe_menu_years", "fe_menu_makes", "fe_menu_models", "fe_menu_options", "fe_vehicle_details"):
+        monkeypatch.setattr(fueleconomy_resolver, "a" + name, _async(getattr(fueleconomy_resolver, name)))
+    fueleconomy_resolver.clear_menu_cache()
+    yield calls
+    fueleconomy_resolver.clear_menu_cache()
+
+
+def test_resolve_vehicle_picks_trim_from_hint(fe_menus):
+    resolved = fueleconomy_resolver.resolve_vehicle("2024 ford f150 4wd 5.0")
+    assert resolved["id"] == 47201
+    assert resolved["trim"] == "Auto (S10), 8 cyl, 5.0 L"
+    assert resolved["other_trims"] == ["Auto (S10), 6 cyl, 3.5 L, Turbo"]
+    # Empty detail fields are dropped
+    assert "city08" not in resolved and resolved["comb08"] == "40"
+
+
+def test_resolve_vehicle_with_explicit_fields(fe_menus):
+    resolved = fueleconomy_resolver.resolve_vehicle(year=2024, make="honda", model="crv hybrid")
+    assert resolved["id"] == 47100
+    assert fueleconomy_resolver.resolve_vehicle("honda", make="Honda") is None
+
+
+def test_menus_are_cached_but_empty_results_are_not(fe_menus, monkeypatch):
+    fueleconomy_resolver.resolve_vehicle("2024 honda crv hybrid")
+    fueleconomy_resolver.resolve_vehicle("2024 honda crv hybrid")
+    assert fe_menus == ["years"]
+
+    fueleconomy_resolver.clear_menu_cache()
+    responses = [[], _years()]
+    monkeypatch.setattr(fueleconomy_resolver, "fe_menu_years", lambda: responses.pop(0))
+    assert fueleconomy_resolver.resolve_vehicle("2024 honda crv hybrid") is None
+    assert fueleconomy_resolver.resolve_vehicle("2024 honda crv hybrid")["id"] == 47100
+
+
+def test_aresolve_vehicle_matches_sync_and_shares_the_cache(fe_menus):
+    resolved = asyncio.run(fueleconomy_resolver.aresolve_vehicle("2024 ford f150 4wd 5.0"))
+    assert resolved == fueleconomy_resolver.resolve_vehicle("2024 ford f150 4wd 5.0")
+    assert fe_menus == ["years"]  # fetched once by the async lookup, then served from the cache
+    assert asyncio.run(fueleconomy_resolver.aresolve_vehicle("honda", make="Honda")) is None
+
+
+@pytest.fixture
+def nhtsa_menus(monkeypatch):
+    variants = {(2024, "Honda", "CR-V Hybrid AWD"): [{"id": 1, "text": "2024 Honda CR-V Hybrid AWD SUV"},
+                                                     {"id": 2, "text": "2024 Honda CR-V Hybrid AWD SUV Sport"}]}
+    monkeypatch.setattr(nhtsa_resolver, "nhtsa_years", _years)
+    monkeypatch.setattr(nhtsa_resolver, "nhtsa_makes", _makes)
+    monkeypatch.setattr(nhtsa_resolver, "nhtsa_models", _models)
+    monkeypatch.setattr(nhtsa_resolver, "nhtsa_variants", lambda y, mk, md: variants.get((y, mk, md), []))
+    monkeypatch.setattr(nhtsa_resolver, "nhtsa_ratings",
+                        lambda vid: {"Results": [{"OverallRating": str(4 + vid % 2), "RecallsCount": 0}]})
+    for name in ("nhtsa_years", "nhtsa_makes", "nhtsa_models", "nhtsa_variants", "nhtsa_ratings"):
+        monkeypatch.setattr(nhtsa_resolver, "a" + name, _async(getattr(nhtsa_resolver, name)))
+    nhtsa_resolver.TREE.clear()
+    nhtsa_resolver._ratings.cache_clear()
+    yield
+    nhtsa_resolver.TREE.clear()
+    nhtsa_resolver._ratings.cache_clear()
+
+
+def test_resolve_safety_ranks_variants(nhtsa_menus):
+    resolved = nhtsa_resolver.resolve_safety("2024 honda cr-v hybrid sport")
+    assert (resolved["year"], resolved["make"], resolved["model"]) == (2024, "Honda", "CR-V Hybrid AWD")
+    assert [v["VehicleId"] for v in resolved["variants"]] == [2, 1]
+    assert resolved["variants"][0]["ratings"] == {"OverallRating": "4", "RecallsCount": 0}
+
+
+def test_resolve_safety_ambiguous(nhtsa_menus):
+    assert nhtsa_resolver.resolve_safety("2024 honda civic") is None  # no variants
+    assert nhtsa_resolver.resolve_safety("something safe") is None
+
+
+def test_empty_ratings_are_not_cached(nhtsa_menus, monkeypatch):
+    responses = [{"Results": []}, {"Results": [{"OverallRating": "5"}]}]
+    monkeypatch.setattr(nhtsa_resolver, "nhtsa_ratings", lambda vid: responses.pop(0))
+    assert nhtsa_resolver._ratings(7) == {}
+    assert nhtsa_resolver._ratings(7) == {"OverallRating": "5"}
+    # Non-empty ratings are kept
+    assert nhtsa_resolver._ratings(7) == {"OverallRating": "5"} and not responses
+
+
+def test_aresolve_safety_matches_sync(nhtsa_menus):
+    resolved = asyncio.run(nhtsa_resolver.aresolve_safety("2024 honda cr-v hybrid sport"))
+    assert resolved == nhtsa_resolver.resolve_safety("2024 honda cr-v hybrid sport")
+    assert asyncio.run(nhtsa_resolver.aresolve_safety("2024 honda civic")) is None
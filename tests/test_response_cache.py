@@ -0,0 +1,69 @@
+import pytest
+
+from tools import response_cache
+from tools.response_cache import DAY, ResponseCache, ttl_for
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(response_cache, "time", clock)
+    return clock
+
+
+def test_ttl_rules():
+    assert ttl_for("fueleconomy", "vehicle/menu/year") == 1 * DAY
+    assert ttl_for("fueleconomy", "/vehicle/menu/make") == 7 * DAY
+    assert ttl_for("fueleconomy", "vehicle/41234") == 30 * DAY
+    assert ttl_for("nhtsa", "SafetyRatings/VehicleId/1") == 7 * DAY
+    assert ttl_for("other", "anything") == response_cache.DEFAULT_TTL
+
+
+def test_entries_expire_after_their_ttl(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "r.sqlite"), max_bytes=1 << 20)
+    cache.put("fueleconomy", "vehicle/menu/year", {"format": "json"}, '{"menuItem": []}')
+    assert cache.get("fueleconomy", "vehicle/menu/year", {"format": "json"}) == '{"menuItem": []}'
+    # Params are part of the key
+    assert cache.get("fueleconomy", "vehicle/menu/year", {"format": "xml"}) is None
+
+    clock.now += DAY + 1
+    assert cache.get("fueleconomy", "vehicle/menu/year", {"format": "json"}) is None
+    assert cache.stats["expired"] == 1
+    assert cache.info()["entries"] == 0 and cache.info()["bytes"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / "r.sqlite"), max_bytes=1000)
+    for i in range(4):
+        clock.now += 100
+        cache.put("nhtsa", f"SafetyRatings/VehicleId/{i}", None, "x" * 250)
+    clock.now += 100
+    # Touch the oldest entry so it is no longer the least recently used
+    assert cache.get("nhtsa", "SafetyRatings/VehicleId/0") is not None
+
+    clock.now += 100
+    cache.put("nhtsa", "SafetyRatings/VehicleId/4", None, "x" * 250)
+
+    assert cache.info()["bytes"] <= 900
+    assert cache.get("nhtsa", "SafetyRatings/VehicleId/0") is not None
+    assert cache.get("nhtsa", "SafetyRatings/VehicleId/1") is None
+    assert cache.get("nhtsa", "SafetyRatings/VehicleId/2") is None
+    assert cache.get("nhtsa", "SafetyRatings/VehicleId/4") is not None
+    assert cache.stats["evictions"] == 2
+
+
+def test_size_is_tracked_across_reopen(tmp_path, clock):
+    path = str(tmp_path / "r.sqlite")
+    cache = ResponseCache(path, max_bytes=1 << 20)
+    cache.put("nhtsa", "SafetyRatings", None, "abc")
+    cache.put("nhtsa", "SafetyRatings", None, "abcdef")
+    assert cache.info()["bytes"] == 6
+    assert ResponseCache(path, max_bytes=1 << 20).info()["bytes"] == 6
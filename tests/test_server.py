@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+from server.app import RecommenderApp
+
+
+class FakeSessions:
+    """Stands in for SessionManager: echoes the message, or blocks until released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.block = False
+        self.closed = False
+
+    async def astream(self, session_id, text):
+        if self.block:
+            await self.release.wait()
+        yield "echo "
+        yield text
+
+    def hot_count(self):
+        return 1
+
+    def cold_count(self):
+        return 2
+
+    def close(self):
+        self.closed = True
+
+
+async def _request(app, method, path, body=None):
+    messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path}, receive, send)
+    start = sent[0]
+    payload = b"".join(m.get("body", b"") for m in sent[1:])
+    return start["status"], dict(start["headers"]), payload
+
+
+def _serve(test, **kwargs):
+    sessions = FakeSessions()
+    app = RecommenderApp(sessions=sessions, **kwargs)
+
+    async def run():
+        try:
+            await test(app, sessions)
+        finally:
+            await app.shutdown()
+
+    asyncio.run(run())
+    assert sessions.closed
+
+
+def test_chat_and_stream():
+    async def test(app, sessions):
+        status, _, body = await _request(app, "POST", "/chat", {"session_id": "s", "message": "hi"})
+        assert status == 200 and json.loads(body) == {"session_id": "s", "reply": "echo hi"}
+
+        status, headers, body = await _request(app, "POST", "/chat/stream", {"session_id": "s", "message": "yo"})
+        assert status == 200 and headers[b"x-session-id"] == b"s" and body == b"echo yo"
+
+    _serve(test)
+
+
+def test_invalid_body_is_rejected():
+    async def test(app, sessions):
+        for body in [{"message": 42}, {"session_id": "s"}]:
+            status, _, payload = await _request(app, "POST", "/chat", body)
+            assert status == 400 and "error" in json.loads(payload)
+        status, _, _ = await _request(app, "POST", "/chat", None)
+        assert status == 400
+
+    _serve(test)
+
+
+def test_full_queue_returns_503_with_retry_after():
+    async def test(app, sessions):
+        sessions.block = True
+        held = asyncio.create_task(_request(app, "POST", "/chat", {"message": "one"}))
+        await asyncio.sleep(0.01)  # taken by the only worker
+        queued = asyncio.create_task(_request(app, "POST", "/chat", {"message": "two"}))
+        await asyncio.sleep(0.01)  # fills the queue
+
+        status, headers, _ = await _request(app, "POST", "/chat", {"message": "three"})
+        assert status == 503 and headers[b"retry-after"] == b"1"
+
+        sessions.release.set()
+        assert [(await t)[0] for t in (held, queued)] == [200, 200]
+        assert app.metrics.counters == {"accepted": 2, "rejected": 1, "completed": 2, "failed": 0}
+
+    _serve(test, workers=1, queue_size=1)
+
+
+def test_health_metrics_and_unknown_routes():
+    async def test(app, sessions):
+        status, _, body = await _request(app, "GET", "/health")
+        assert status == 200 and json.loads(body) == {"status": "ok"}
+
+        await _request(app, "POST", "/chat", {"message": "hi"})
+        status, _, body = await _request(app, "GET", "/metrics/")
+        metrics = json.loads(body)
+        assert status == 200
+        assert metrics["accepted"] == metrics["completed"] == 1 and metrics["in_flight"] == 0
+        assert metrics["queued"] == 0 and metrics["workers"] == 2
+        assert metrics["sessions_hot"] == 1 and metrics["sessions_stored"] == 2
+        assert metrics["ttft_s"]["p50"] is not None
+
+        status, _, _ = await _request(app, "GET", "/nope")
+        assert status == 404
+
+    _serve(test, workers=2)
@@ -0,0 +1,199 @@
+import asyncio
+import threading
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from recommender.session_manager import SessionManager
+
+
+class EchoRecommender:
+    """Stands in for RecommenderImplementation: keeps the transcript in `state`."""
+
+    def __init__(self):
+        self.state = {"messages": [], "budget": None}
+        self.busy = False
+
+    def _begin(self):
+        assert not self.busy, "two turns of one session overlapped"
+        self.busy = True
+
+    def _end(self, text):
+        self.state["messages"] = self.state["messages"] + [HumanMessage(text), AIMessage(f"echo {text}")]
+        self.busy = False
+        return f"echo {text}"
+
+    def chat(self, text):
+        self._begin()
+        time.sleep(0.01)
+        return self._end(text)
+
+    async def achat(self, text):
+        self._begin()
+        await asyncio.sleep(0.01)
+        return self._end(text)
+
+    def stream(self, text):
+        self._begin()
+        yield "echo "
+        time.sleep(0.01)
+        yield self._end(text)[len("echo "):]
+
+    async def astream(self, text):
+        self._begin()
+        yield "echo "
+        await asyncio.sleep(0.01)
+        yield self._end(text)[len("echo "):]
+
+
+def _manager(tmp_path, max_hot=1):
+    return SessionManager(db_path=str(tmp_path / "sessions.sqlite"), max_hot=max_hot, factory=EchoRecommender)
+
+
+def test_evicted_session_is_restored_from_disk(tmp_path):
+    manager = _manager(tmp_path)
+    assert manager.chat("a", "hello") == "echo hello"
+    manager.chat("b", "other")
+    assert manager.hot_count() == 1 and manager.cold_count() == 2
+
+    manager.chat("a", "again")
+    manager.close()
+
+    restored = _manager(tmp_path)._load("a")
+    assert [m.content for m in restored["messages"]] == ["hello", "echo hello", "again", "echo again"]
+
+
+def test_session_in_use_is_not_evicted(tmp_path):
+    manager = _manager(tmp_path)
+    started, release = threading.Event(), threading.Event()
+    instances = []
+
+    class SlowRecommender(EchoRecommender):
+        def chat(self, text):
+            instances.append(self)
+            started.set()
+            release.wait(5)
+            return super().chat(text)
+
+    manager.factory = SlowRecommender
+    turn = threading.Thread(target=manager.chat, args=("a", "slow"))
+    turn.start()
+    started.wait(5)
+    manager.factory = EchoRecommender
+    manager.chat("b", "meanwhile")
+    assert "a" in manager._hot, "a pinned session was evicted"
+    release.set()
+    turn.join(5)
+
+    # Once the turn is over the hot set shrinks back to max_hot
+    assert manager.hot_count() == 1
+    assert len(instances) == 1
+
+
+def test_sync_and_async_turns_of_one_session_exclude_each_other(tmp_path):
+    manager = _manager(tmp_path, max_hot=4)
+
+    def sync_turns():
+        for i in range(5):
+            manager.chat("a", f"sync {i}")
+
+    async def async_turns():
+        await asyncio.gather(*(manager.achat("a", f"async {i}") for i in range(5)))
+
+    thread = threading.Thread(target=sync_turns)
+    thread.start()
+    asyncio.run(async_turns())
+    thread.join(5)
+
+    assert len(manager._load("a")["messages"]) == 20
+
+
+def _transcript(manager, session_id):
+    return [m.content for m in manager._load(session_id)["messages"] if isinstance(m, HumanMessage)]
+
+
+def test_streams_yield_the_reply_and_save_the_turn(tmp_path):
+    manager = _manager(tmp_path)
+    assert "".join(manager.stream("a", "one")) == "echo one"
+
+    async def consume():
+        return "".join([token async for token in manager.astream("a", "two")])
+
+    assert asyncio.run(consume()) == "echo two"
+    assert _transcript(manager, "a") == ["one", "two"]
+
+
+def test_abandoned_stream_does_not_keep_the_session_locked(tmp_path):
+    manager = _manager(tmp_path)
+    abandoned = manager.stream("a", "first")
+    assert next(abandoned) == "echo "
+
+    # The generator is still referenced but never resumed; the next turn must not wait on it
+    done = threading.Event()
+    threading.Thread(target=lambda: (manager.chat("a", "second"), done.set()), daemon=True).start()
+    assert done.wait(5), "session stayed locked by an abandoned stream"
+    assert _transcript(manager, "a") == ["first", "second"]
+
+    async def abandon_async():
+        stream = manager.astream("a", "third")
+        assert await stream.__anext__() == "echo "
+        await asyncio.wait_for(manager.achat("a", "fourth"), 5)
+        return stream
+
+    asyncio.run(abandon_async())
+    assert _transcript(manager, "a") == ["first", "second", "third", "fourth"]
+
+
+def test_async_waiters_are_served_in_arrival_order(tmp_path):
+    manager = _manager(tmp_path, max_hot=4)
+    started, release = threading.Event(), threading.Event()
+
+    class Blocking(EchoRecommender):
+        def chat(self, text):
+            started.set()
+            release.wait(5)
+            return super().chat(text)
+
+    manager.factory = Blocking
+    holder = threading.Thread(target=manager.chat, args=("a", "sync"))
+    holder.start()
+    started.wait(5)
+
+    async def waiters():
+        turns = []
+        for i in range(5):
+            turns.append(asyncio.create_task(manager.achat("a", f"async {i}")))
+            await asyncio.sleep(0.01)
+        release.set()
+        await asyncio.gather(*turns)
+
+    asyncio.run(waiters())
+    holder.join(5)
+    assert _transcript(manager, "a") == ["sync"] + [f"async {i}" for i in range(5)]
+
+
+def test_cancelled_waiter_does_not_leak_the_lock(tmp_path):
+    manager = _manager(tmp_path)
+    started, release = threading.Event(), threading.Event()
+
+    class Blocking(EchoRecommender):
+        def chat(self, text):
+            started.set()
+            release.wait(5)
+            return super().chat(text)
+
+    manager.factory = Blocking
+    holder = threading.Thread(target=manager.chat, args=("a", "sync"))
+    holder.start()
+    started.wait(5)
+
+    async def cancel_then_chat():
+        waiter = asyncio.create_task(manager.achat("a", "cancelled"))
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        release.set()
+        await asyncio.wait_for(manager.achat("a", "after"), 5)
+
+    asyncio.run(cancel_then_chat())
+    holder.join(5)
+    assert _transcript(manager, "a") == ["sync", "after"]
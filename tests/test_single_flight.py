@@ -0,0 +1,112 @@
+import asyncio
+import threading
+
+import pytest
+
+from tools.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def _run_concurrently(flight, n, fn, key="k"):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for t in threads:
+        t.start()
+    return threads, results, errors
+
+
+def test_concurrent_callers_share_one_call():
+    flight, release, calls = SingleFlight(), threading.Event(), []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return "payload"
+
+    threads, results, errors = _run_concurrently(flight, 5, fetch)
+    # Wait until every follower has joined the leader's call
+    while flight.stats["calls"] < 5:
+        threading.Event().wait(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert results == ["payload"] * 5 and not errors
+    assert len(calls) == 1
+    assert flight.stats == {"calls": 5, "shared": 4}
+
+
+def test_errors_are_shared_and_not_remembered():
+    flight, release = SingleFlight(), threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    threads, results, errors = _run_concurrently(flight, 3, fail)
+    while flight.stats["calls"] < 3:
+        threading.Event().wait(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert not results and len(errors) == 3
+
+    # Nothing is cached once the call finishes
+    assert flight.do("k", lambda: "recovered") == "recovered"
+
+
+def test_different_keys_do_not_wait_for_each_other():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    with pytest.raises(KeyError):
+        flight.do("c", lambda: {}["missing"])
+    assert flight.stats["shared"] == 0
+
+
+def test_async_callers_share_one_call():
+    flight, calls = AsyncSingleFlight(), []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "payload"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", fetch) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["payload"] * 5
+    assert len(calls) == 1
+    assert flight.stats == {"calls": 5, "shared": 4}
+
+
+def test_async_errors_are_shared_and_a_cancelled_follower_keeps_the_leader():
+    flight = AsyncSingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "payload"
+
+    async def main():
+        results = await asyncio.gather(flight.do("k", fail), flight.do("k", fail), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+
+        leader = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0)
+        follower.cancel()
+        return await leader
+
+    assert asyncio.run(main()) == "payload"
+    assert not flight._calls
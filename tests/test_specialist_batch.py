@@ -0,0 +1,34 @@
+import asyncio
+import json
+
+from recommender.basic_recommender.specialist_agents.batch import arun_batch, run_batch
+from recommender.basic_recommender.specialist_agents.nhtsa_agent import NHTSACarQueryInput
+
+
+def _lookup(query=None, year=None, make=None, model=None):
+    if model == "Broken":
+        raise RuntimeError("no data")
+    return json.dumps({"query": query, "year": year})
+
+
+async def _alookup(**car):
+    return _lookup(**car)
+
+
+CARS = [
+    NHTSACarQueryInput(year=2022, make="Toyota", model="Camry", query="first"),
+    # A free-text hint that looks like a numbered key must not be overwritten
+    NHTSACarQueryInput(query="2022 Toyota Camry #2"),
+    NHTSACarQueryInput(year=2022, make="toyota", model="camry", query="second"),
+    NHTSACarQueryInput(make="Ford", model="Broken"),
+]
+
+
+def test_duplicate_keys_are_numbered_and_errors_kept():
+    for result in (run_batch(_lookup, CARS), asyncio.run(arun_batch(_alookup, CARS))):
+        out = json.loads(result)
+        assert list(out) == ["2022 toyota camry", "2022 toyota camry #2", "2022 toyota camry #3", "ford broken"]
+        assert [out[k]["query"] for k in list(out)[:3]] == ["first", "2022 Toyota Camry #2", "second"]
+        assert out["ford broken"] == "Error: no data"
+
+    assert run_batch(_lookup, []) == "{}"
@@ -0,0 +1,51 @@
+import json
+import logging
+
+from tools import structured_log
+from tools.structured_log import JsonLinesHandler, StructuredLogger, lazy, preview
+
+
+def test_sampling_keeps_one_in_n_but_every_warning(caplog):
+    caplog.set_level(logging.INFO, logger="test.sampled")
+    log = StructuredLogger("test.sampled", sample=0.25)
+    for i in range(8):
+        log.info("tick", i=i)
+    log.warning("slow", i=8)
+    assert [r.msg.fields["i"] for r in caplog.records] == [0, 4, 8]
+
+    caplog.clear()
+    StructuredLogger("test.sampled", sample=0).info("dropped")
+    assert caplog.records == []
+
+
+def test_sample_rate_falls_back_to_the_nearest_prefix(monkeypatch):
+    monkeypatch.setattr(structured_log, "_SAMPLING", structured_log._parse_sampling("fueleconomy=0.1, *=0.5, bad=x"))
+    assert structured_log.sample_rate("fueleconomy.agent") == 0.1
+    assert structured_log.sample_rate("nhtsa") == 0.5
+
+
+def test_lazy_fields_are_only_computed_when_emitted(caplog):
+    calls = []
+    log = StructuredLogger("test.lazy", sample=1)
+    caplog.set_level(logging.WARNING, logger="test.lazy")
+    log.info("skipped", keys=lazy(lambda: calls.append("skipped")))
+    assert calls == []
+
+    caplog.set_level(logging.INFO, logger="test.lazy")
+    log.info("http.response", keys=lazy(lambda: calls.append("emitted") or ["a"]), body=preview("x" * 5, limit=2))
+    [record] = caplog.records
+    assert record.getMessage() == "http.response keys=['a'] body='xx... [truncated 3 chars]'"
+    assert calls[0] == "emitted"
+
+
+def test_records_point_at_the_call_site(caplog, tmp_path):
+    caplog.set_level(logging.INFO, logger="test.site")
+    StructuredLogger("test.site", sample=1).info("here")
+    [record] = caplog.records
+    assert record.funcName == "test_records_point_at_the_call_site"
+
+    handler = JsonLinesHandler(str(tmp_path / "log.jsonl"))
+    handler.handle(record)
+    handler.close()
+    entry = json.loads((tmp_path / "log.jsonl").read_text())
+    assert entry["event"] == "here" and entry["logger"] == "test.site"
@@ -1,9 +1,19 @@
+from typing import Dict, List, Optional, Tuple
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
+import numpy as np
 import math
 import csv
 import os
-import requests
+import threading
+import time
+from tools.http_client import fetch
+
+NOMINATIM_URL = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org/search")
+# Nominatim's usage policy allows at most one request per second
+NOMINATIM_MIN_INTERVAL = float(os.getenv("NOMINATIM_MIN_INTERVAL", "1.0"))
+CITY_COORDS_CSV = "recommender/data/uscities.csv"
+EARTH_RADIUS_MILES = 3959.87433
 
 # -----------------------
 # Input schema
@@ -15,23 +25,58 @@ class DistanceCheckInput(BaseModel):
     dealer_state: str = Field(..., description="Dealer's state name")
     threshold_miles: float = Field(..., description="Max allowed distance in miles")
 
+
+class DealerLocation(BaseModel):
+    city: str = Field(..., description="Dealer's city name")
+    state: str = Field(..., description="Dealer's state name")
+
+
+class DistanceBatchInput(BaseModel):
+    user_city: str = Field(..., description="User's city name")
+    user_state: str = Field(..., description="User's state name")
+    dealers: List[DealerLocation] = Field(..., description="All dealer locations to check, e.g. a full inventory page")
+    threshold_miles: float = Field(..., description="Max allowed distance in miles")
+
 # -----------------------
 # Helpers
 # -----------------------
 def haversine(lat1, lon1, lat2, lon2):
     """Returns distance in miles between two lat/lon points."""
-    R = 3959.87433  # Earth radius in miles
     phi1, phi2 = math.radians(lat1), math.radians(lat2)
     dphi = math.radians(lat2 - lat1)
     dlambda = math.radians(lon2 - lon1)
     a = (math.sin(dphi / 2) ** 2 +
          math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2)
-    return R * (2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)))
+    return EARTH_RADIUS_MILES * (2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)))
+
+def _haversine_np(lat1, lon1, lat2, lon2) -> np.ndarray:
+    # Inputs broadcast against each other; degrees in, miles out
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return EARTH_RADIUS_MILES * 2 * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def haversine_many(lat, lon, lats, lons) -> np.ndarray:
+    """Distances in miles from one origin to N points, shape (N,)."""
+    return _haversine_np(lat, lon, np.asarray(lats, dtype=float), np.asarray(lons, dtype=float))
+
+def haversine_matrix(lats1, lons1, lats2, lons2) -> np.ndarray:
+    """Distances in miles between M origins and N points, shape (M, N)."""
+    lats1 = np.asarray(lats1, dtype=float)[:, None]
+    lons1 = np.asarray(lons1, dtype=float)[:, None]
+    return _haversine_np(lats1, lons1, np.asarray(lats2, dtype=float)[None, :], np.asarray(lons2, dtype=float)[None, :])
+
+def within_radius(origin: Tuple[float, float], points, threshold_miles: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Distances from origin to each (lat, lon) in points and the within-threshold mask."""
+    points = np.asarray(points, dtype=float).reshape(-1, 2)
+    distances = haversine_many(origin[0], origin[1], points[:, 0], points[:, 1])
+    return distances, distances <= threshold_miles
 
 def load_city_coords():
-    """Load city/state → coordinates from uscities.csv"""
+    """Load city/state → coordinates from uscities.csv (empty if the file is not there)"""
     coords_map = {}
-    csv_path = "recommender/data/uscities.csv"
+    csv_path = CITY_COORDS_CSV
+    if not os.path.exists(csv_path):
+        return coords_map
     with open(csv_path, newline="", encoding="utf-8") as f:
         reader = csv.DictReader(f)
         for row in reader:
@@ -46,9 +91,33 @@ def lookup_coords_local(city, state):
     """Check local dataset for coordinates."""
     return LOCAL_COORDS.get((city.strip().lower(), state.strip().lower()))
 
+_geocoded: Dict[Tuple[str, str], Tuple[float, float]] = {}
+_geocode_lock = threading.Lock()
+_last_geocode = 0.0
+
 def lookup_coords_api(city, state):
-    """Fallback to Nominatim OpenStreetMap API."""
-    url = "https://nominatim.openstreetmap.org/search"
+    """Fallback to Nominatim OpenStreetMap API (cached, and serialized to its rate limit)."""
+    global _last_geocode
+    key = (city.strip().lower(), state.strip().lower())
+    if key in _geocoded:
+        return _geocoded[key]
+    with _geocode_lock:
+        if key in _geocoded:
+            return _geocoded[key]
+        wait = _last_geocode + NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            coords = _query_nominatim(city, state)
+        finally:
+            _last_geocode = time.monotonic()
+        # Misses are not cached, so a transient failure is retried next time
+        if coords:
+            _geocoded[key] = coords
+        return coords
+
+def _query_nominatim(city, state):
+    url = NOMINATIM_URL
     params = {
         "city": city,
         "state": state,
@@ -57,11 +126,10 @@ def lookup_coords_api(city, state):
         "limit": 1
     }
     try:
-        resp = requests.get(url, params=params, headers={"User-Agent": "dealer-eval-agent"})
-        if resp.status_code == 200:
-            data = resp.json()
-            if data:
-                return float(data[0]["lat"]), float(data[0]["lon"])
+        resp = fetch(url, params=params, headers={"User-Agent": "dealer-eval-agent"})
+        data = resp.json() if resp.status == 200 else None
+        if data:
+            return float(data[0]["lat"]), float(data[0]["lon"])
     except Exception as e:
         print(f"[DEBUG] Geocoding API error for ({city}, {state}): {e}")
     return None
@@ -104,3 +172,31 @@ def distance_check(user_city, user_state, dealer_city, dealer_state, threshold_m
 
     # print(f"[DEBUG] Computed distance: {distance:.2f} miles -> Nearby? {nearby}")
     return nearby
+
+
+@tool(args_schema=DistanceBatchInput)
+def distance_batch_check(user_city, user_state, dealers, threshold_miles):
+    """
+    Check many dealers against the user's location in ONE call.
+    Returns each dealer with its distance in miles and whether it is within the threshold
+    (distance is null and nearby false when a location cannot be geocoded).
+    """
+    dealers = [d if isinstance(d, DealerLocation) else DealerLocation(**d) for d in dealers]
+    user_coords = get_coordinates(user_city, user_state)
+    if not user_coords:
+        print(f"[DEBUG] Coordinates not found for: ({user_city}, {user_state})")
+        return [{"city": d.city, "state": d.state, "distance_miles": None, "nearby": False} for d in dealers]
+
+    # Each distinct location is geocoded once; lookups are serialized by the geocoder's rate limit
+    unique = list(dict.fromkeys((d.city.strip().lower(), d.state.strip().lower()) for d in dealers))
+    coords: Dict[Tuple[str, str], Optional[Tuple[float, float]]] = {loc: get_coordinates(*loc) for loc in unique}
+
+    located = [k for k in unique if coords.get(k)]
+    distances, mask = within_radius(user_coords, [coords[k] for k in located], threshold_miles)
+    by_location = {k: (round(float(dist), 1), bool(near)) for k, dist, near in zip(located, distances, mask)}
+
+    results = []
+    for d in dealers:
+        distance, nearby = by_location.get((d.city.strip().lower(), d.state.strip().lower()), (None, False))
+        results.append({"city": d.city, "state": d.state, "distance_miles": distance, "nearby": nearby})
+    return results
@@ -0,0 +1,433 @@
+"""
+Local stand-in servers for the external tool APIs
+
+One stdlib HTTP server per API (FuelEconomy.gov, NHTSA SafetyRatings,
+Auto.dev, Nominatim), each answering the endpoints the tool modules call
+with data generated from a small vehicle catalogue (`VEHICLES`, or a JSON
+list of the same shape via --vehicles). Every server can inject latency,
+a random 5xx error rate and a throughput cap (token bucket, 429 with
+Retry-After when exceeded), so load tests and benchmarks of the tool layer
+run on an offline machine.
+
+The tool modules read their endpoints at import time, so export the
+printed environment before starting the process under test:
+
+    python -m tools.fake_servers --latency-ms 40 --jitter-ms 20 --error-rate 0.01 --max-rps 50
+
+RESPONSE_CACHE=off is part of that environment so every call reaches the
+stand-ins instead of responses cached from the real APIs.
+"""
+
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+import zlib
+
+
+LOGGER = logging.getLogger("fake_servers")
+
+VEHICLES: List[Dict[str, Any]] = [
+    {"id": 47001, "year": 2024, "make": "Toyota", "model": "Camry", "trany": "Automatic (S8)", "cylinders": 4,
+     "displ": 2.5, "drive": "Front-Wheel Drive", "fuelType": "Regular", "VClass": "Midsize Cars",
+     "city08": 28, "highway08": 39, "comb08": 32, "price": 28400, "rating": 5},
+    {"id": 47002, "year": 2024, "make": "Toyota", "model": "RAV4 Hybrid AWD", "trany": "Automatic (variable gear ratios)",
+     "cylinders": 4, "displ": 2.5, "drive": "All-Wheel Drive", "fuelType": "Regular", "VClass": "Small SUV 4WD",
+     "city08": 41, "highway08": 38, "comb08": 39, "price": 33600, "rating": 5},
+    {"id": 47003, "year": 2024, "make": "Honda", "model": "Civic 4Dr", "trany": "Automatic (AV-S7)", "cylinders": 4,
+     "displ": 2.0, "drive": "Front-Wheel Drive", "fuelType": "Regular", "VClass": "Midsize Cars",
+     "city08": 31, "highway08": 40, "comb08": 35, "price": 25000, "rating": 5},
+    {"id": 47004, "year": 2024, "make": "Honda", "model": "CR-V AWD", "trany": "Automatic (AV-S7)", "cylinders": 4,
+     "displ": 1.5, "drive": "All-Wheel Drive", "fuelType": "Regular", "VClass": "Small SUV 4WD",
+     "city08": 27, "highway08": 32, "comb08": 29, "price": 32400, "rating": 5},
+    {"id": 47005, "year": 2024, "make": "Ford", "model": "F150 Pickup 4WD", "trany": "Automatic (S10)", "cylinders": 6,
+     "displ": 3.5, "drive": "4-Wheel Drive", "fuelType": "Regular", "VClass": "Standard Pickup Trucks 4WD",
+     "city08": 18, "highway08": 23, "comb08": 20, "price": 46000, "rating": 4},
+    {"id": 47006, "year": 2024, "make": "Tesla", "model": "Model 3 Long Range AWD", "trany": "Automatic (A1)",
+     "cylinders": None, "displ": None, "drive": "All-Wheel Drive", "fuelType": "Electricity", "VClass": "Midsize Cars",
+     "city08": 138, "highway08": 126, "comb08": 131, "price": 47700, "rating": 5},
+    {"id": 46001, "year": 2023, "make": "Subaru", "model": "Outback AWD", "trany": "Automatic (variable gear ratios)",
+     "cylinders": 4, "displ": 2.5, "drive": "All-Wheel Drive", "fuelType": "Regular", "VClass": "Small Sport Utility Vehicle 4WD",
+     "city08": 26, "highway08": 32, "comb08": 28, "price": 29000, "rating": 5},
+    {"id": 46002, "year": 2023, "make": "Toyota", "model": "Camry", "trany": "Automatic (S8)", "cylinders": 4,
+     "displ": 2.5, "drive": "Front-Wheel Drive", "fuelType": "Regular", "VClass": "Midsize Cars",
+     "city08": 28, "highway08": 39, "comb08": 32, "price": 26400, "rating": 5},
+]
+
+Response = Tuple[int, Any]
+Route = Tuple["re.Pattern[str]", Callable[..., Response]]
+
+
+def _option_text(v: Dict[str, Any]) -> str:
+    parts = [v["trany"]]
+    if v.get("cylinders"):
+        parts.append(f"{v['cylinders']} cyl")
+    if v.get("displ"):
+        parts.append(f"{v['displ']} L")
+    return ", ".join(parts)
+
+
+def _menu(values) -> Dict[str, Any]:
+    return {"menuItem": [{"text": str(x), "value": str(x)} for x in values]}
+
+
+def _same(a: Any, b: Optional[str]) -> bool:
+    return b is not None and str(a).lower() == b.lower()
+
+
+# ---------- API emulations ----------
+
+
+class FuelEconomyApi:
+    prefix = "/ws/rest"
+
+    def __init__(self, vehicles: List[Dict[str, Any]]):
+        self.vehicles = vehicles
+        self.routes: List[Route] = [
+            (re.compile(r"^vehicle/menu/year$"), self.years),
+            (re.compile(r"^vehicle/menu/make$"), self.makes),
+            (re.compile(r"^vehicle/menu/model$"), self.models),
+            (re.compile(r"^vehicle/menu/options$"), self.options),
+            (re.compile(r"^vehicle/(\d+)$"), self.vehicle),
+        ]
+
+    def _select(self, q: Dict[str, str]) -> List[Dict[str, Any]]:
+        return [
+            v for v in self.vehicles
+            if ("year" not in q or _same(v["year"], q["year"]))
+            and ("make" not in q or _same(v["make"], q["make"]))
+            and ("model" not in q or _same(v["model"], q["model"]))
+        ]
+
+    def years(self, q) -> Response:
+        return 200, _menu(sorted({v["year"] for v in self.vehicles}, reverse=True))
+
+    def makes(self, q) -> Response:
+        return 200, _menu(sorted({v["make"] for v in self._select(q)}))
+
+    def models(self, q) -> Response:
+        return 200, _menu(sorted({v["model"] for v in self._select(q)}))
+
+    def options(self, q) -> Response:
+        return 200, {"menuItem": [{"text": _option_text(v), "value": str(v["id"])} for v in self._select(q)]}
+
+    def vehicle(self, q, vehicle_id) -> Response:
+        for v in self.vehicles:
+            if str(v["id"]) == vehicle_id:
+                return 200, {k: ("" if val is None else str(val)) for k, val in v.items()
+                             if k not in ("price", "rating")}
+        return 404, {"error": f"vehicle {vehicle_id} not found"}
+
+
+class NhtsaApi:
+    prefix = ""
+
+    def __init__(self, vehicles: List[Dict[str, Any]]):
+        self.vehicles = vehicles
+        self.routes: List[Route] = [
+            (re.compile(r"^SafetyRatings$"), self.years),
+            (re.compile(r"^SafetyRatings/modelyear/(\d+)$"), self.makes),
+            (re.compile(r"^SafetyRatings/modelyear/(\d+)/make/([^/]+)$"), self.models),
+            (re.compile(r"^SafetyRatings/modelyear/(\d+)/make/([^/]+)/model/([^/]+)$"), self.variants),
+            (re.compile(r"^SafetyRatings/VehicleId/(\d+)$"), self.ratings),
+        ]
+
+    @staticmethod
+    def _results(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {"Count": len(items), "Message": "Results returned successfully", "Results": items}
+
+    def years(self, q) -> Response:
+        return 200, self._results([{"ModelYear": y} for y in sorted({v["year"] for v in self.vehicles}, reverse=True)])
+
+    def makes(self, q, year) -> Response:
+        makes = sorted({v["make"].upper() for v in self.vehicles if _same(v["year"], year)})
+        return 200, self._results([{"ModelYear": int(year), "Make": m} for m in makes])
+
+    def models(self, q, year, make) -> Response:
+        models = sorted({v["model"].upper() for v in self.vehicles
+                         if _same(v["year"], year) and _same(v["make"], make)})
+        return 200, self._results([{"ModelYear": int(year), "Make": make.upper(), "Model": m} for m in models])
+
+    def variants(self, q, year, make, model) -> Response:
+        return 200, self._results([
+            {"VehicleDescription": f"{v['year']} {v['make']} {v['model']} {v['drive']}", "VehicleId": v["id"]}
+            for v in self.vehicles
+            if _same(v["year"], year) and _same(v["make"], make) and _same(v["model"], model)
+        ])
+
+    def ratings(self, q, vehicle_id) -> Response:
+        items = []
+        for v in self.vehicles:
+            if str(v["id"]) == vehicle_id:
+                rating = str(v.get("rating", 5))
+                items.append({
+                    "VehicleId": v["id"], "VehicleDescription": f"{v['year']} {v['make']} {v['model']}",
+                    "ModelYear": v["year"], "Make": v["make"].upper(), "Model": v["model"].upper(),
+                    "OverallRating": rating, "OverallFrontCrashRating": rating, "OverallSideCrashRating": rating,
+                    "RollOverRating": "4", "RolloverPossibility": 0.1, "ComplaintsCount": 12,
+                    "RecallsCount": 1, "InvestigationCount": 0,
+                })
+        return 200, self._results(items)
+
+
+class AutoDevApi:
+    prefix = ""
+
+    def __init__(self, vehicles: List[Dict[str, Any]]):
+        self.vehicles = vehicles
+        self.routes: List[Route] = [
+            (re.compile(r"^api/listings$"), self.listings),
+            (re.compile(r"^apr/([^/]+)$"), self.apr),
+            (re.compile(r"^tco/([^/]+)$"), self.tco),
+        ]
+
+    def listings(self, q) -> Response:
+        price_max = float(q["price_max"]) if q.get("price_max") else None
+        matches = [
+            v for v in self.vehicles
+            if (not q.get("make") or _same(v["make"], q["make"]))
+            and (not q.get("model") or q["model"].lower() in v["model"].lower())
+            and (price_max is None or v["price"] <= price_max)
+        ][: int(q.get("limit") or 5)]
+        city = q.get("location") or "Orlando"
+        return 200, {"data": [
+            {
+                "vehicle": {"year": v["year"], "make": v["make"], "model": v["model"], "trim": v["trany"]},
+                "retailListing": {
+                    "price": v["price"], "dealer": f"{v['make']} of {city}", "city": city, "state": "FL",
+                    "vdp": f"https://example.test/vdp/{v['id']}", "primaryImage": "",
+                },
+            }
+            for v in matches
+        ]}
+
+    def apr(self, q, vin) -> Response:
+        score = int(q.get("creditScore") or 700)
+        base = 4.5 + max(0, 760 - score) / 40
+        return 200, {"vin": vin, "apr": {str(t): round(base + (t - 36) / 48, 2) for t in (36, 48, 60, 72, 84)}}
+
+    def tco(self, q, vin) -> Response:
+        seed = zlib.crc32(vin.encode()) % 1000
+        maintenance, repairs, depreciation = 900 + seed, 400 + seed // 2, 2500 + seed * 3
+        return 200, {"vin": vin, "tco": {
+            "maintenance": maintenance, "repairs": repairs, "depreciation": depreciation,
+            "total": {"tcoPrice": 5 * (maintenance + repairs + depreciation)},
+        }}
+
+
+class NominatimApi:
+    prefix = ""
+
+    def __init__(self, vehicles: List[Dict[str, Any]]):
+        self.routes: List[Route] = [(re.compile(r"^search$"), self.search)]
+
+    def search(self, q) -> Response:
+        # Deterministic point inside the contiguous US for any city/state
+        seed = zlib.crc32(f"{q.get('city', '')},{q.get('state', '')}".lower().encode())
+        lat = 25.0 + (seed % 2400) / 100
+        lon = -124.0 + (seed // 2400 % 5700) / 100
+        return 200, [{"lat": f"{lat:.4f}", "lon": f"{lon:.4f}",
+                      "display_name": f"{q.get('city', '')}, {q.get('state', '')}, United States"}]
+
+
+# name -> (emulation, environment variable, path appended to the server root)
+APIS: Dict[str, Tuple[type, str, str]] = {
+    "fueleconomy": (FuelEconomyApi, "FUELECONOMY_BASE_URL", "/ws/rest/"),
+    "nhtsa": (NhtsaApi, "NHTSA_BASE_URL", "/"),
+    "autodev": (AutoDevApi, "AUTODEV_API_BASE_URL", ""),
+    "nominatim": (NominatimApi, "NOMINATIM_URL", "/search"),
+}
+
+
+# ---------- Server ----------
+
+
+class TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+@dataclass
+class Faults:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    max_rps: Optional[float] = None
+
+
+@dataclass
+class FakeServer:
+    name: str
+    api: Any
+    faults: Faults
+    host: str = "127.0.0.1"
+    port: int = 0
+    stats: Dict[str, int] = field(default_factory=lambda: {"requests": 0, "throttled": 0, "errors": 0})
+
+    def __post_init__(self):
+        self._bucket = TokenBucket(self.faults.max_rps) if self.faults.max_rps else None
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((self.host, self.port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def handle(self, raw_path: str) -> Tuple[int, Any, Dict[str, str]]:
+        self._count("requests")
+        if self._bucket is not None and not self._bucket.take():
+            self._count("throttled")
+            return 429, {"error": "rate limit exceeded"}, {"Retry-After": "1"}
+        delay = self.faults.latency_ms + random.uniform(-1, 1) * self.faults.jitter_ms
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if self.faults.error_rate and random.random() < self.faults.error_rate:
+            self._count("errors")
+            return 503, {"error": "injected failure"}, {}
+
+        parts = urlsplit(raw_path)
+        path = unquote(parts.path)
+        if not path.startswith(self.api.prefix):
+            return 404, {"error": f"unknown path {path}"}, {}
+        path = path[len(self.api.prefix):].strip("/")
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        for pattern, handler in self.api.routes:
+            match = pattern.match(path)
+            if match:
+                status, body = handler(query, *match.groups())
+                return status, body, {}
+        return 404, {"error": f"unknown path {path}"}, {}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, so pooled clients reuse connections
+
+            def do_GET(self):
+                status, body, headers = server.handle(self.path)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                LOGGER.debug(f"{server.name}: {format % args}")
+
+        return Handler
+
+    def start(self) -> "FakeServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name=f"fake-{self.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class FakeServers:
+    """All stand-ins, started together; use as a context manager or call stop()."""
+
+    def __init__(self, apis: Optional[List[str]] = None, faults: Optional[Faults] = None,
+                 vehicles: Optional[List[Dict[str, Any]]] = None, host: str = "127.0.0.1", base_port: int = 0):
+        vehicles = vehicles or VEHICLES
+        self.servers: Dict[str, FakeServer] = {}
+        for i, name in enumerate(apis or list(APIS)):
+            api_cls = APIS[name][0]
+            port = base_port + i if base_port else 0
+            self.servers[name] = FakeServer(name, api_cls(vehicles), faults or Faults(), host, port).start()
+
+    @property
+    def env(self) -> Dict[str, str]:
+        """Environment that points the tool modules at these servers."""
+        env = {"RESPONSE_CACHE": "off"}
+        for name, server in self.servers.items():
+            _, var, suffix = APIS[name]
+            env[var] = server.url + suffix
+            if name == "autodev":
+                env["AUTODEV_LISTINGS_URL"] = f"{server.url}/api/listings"
+            if name == "nominatim":
+                # The public rate limit does not apply to the local stand-in
+                env["NOMINATIM_MIN_INTERVAL"] = "0"
+        return env
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {name: dict(server.stats) for name, server in self.servers.items()}
+
+    def stop(self) -> None:
+        for server in self.servers.values():
+            server.stop()
+
+    def __enter__(self) -> "FakeServers":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local stand-ins for FuelEconomy, NHTSA, Auto.dev and Nominatim")
+    parser.add_argument("--apis", nargs="*", choices=list(APIS), default=list(APIS))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8801, help="Port of the first server; the others follow")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--max-rps", type=float, default=None, help="Per-server throughput cap (429 above it)")
+    parser.add_argument("--vehicles", default=None, help="JSON file with a vehicle catalogue like VEHICLES")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    vehicles = None
+    if args.vehicles:
+        with open(args.vehicles, encoding="utf-8") as f:
+            vehicles = json.load(f)
+    faults = Faults(args.latency_ms, args.jitter_ms, args.error_rate, args.max_rps)
+    servers = FakeServers(args.apis, faults, vehicles, args.host, args.port)
+    for key, value in servers.env.items():
+        print(f"export {key}={value}")
+    try:
+        while True:
+            time.sleep(30)
+            LOGGER.info(f"stats {servers.stats()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servers.stop()
+
+
+if __name__ == "__main__":
+    main()
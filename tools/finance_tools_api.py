@@ -1,9 +1,10 @@
-import requests
 import os
 from pydantic import BaseModel, Field
 from langchain_core.tools import StructuredTool
+from tools.http_client import fetch
 
 AUTO_DEV_API_KEY = os.getenv("AUTO_DEV_API_KEY")
+AUTO_DEV_API_BASE = os.getenv("AUTODEV_API_BASE_URL", "https://api.auto.dev").rstrip("/")
 
 # ---------- Financing ----------
 class CalculateFinancingInput(BaseModel):
@@ -25,7 +26,7 @@ def calculate_financing_func(
     year, make, model, zip, credit_score, vehicle_age, vehicle_mileage
 ):
     loan_amount = car_price - down_payment
-    url = f"https://api.auto.dev/apr/{vin}"
+    url = f"{AUTO_DEV_API_BASE}/apr/{vin}"
     headers = {
         "Authorization": f"Bearer {AUTO_DEV_API_KEY}",
         "Content-Type": "application/json"
@@ -40,7 +41,7 @@ def calculate_financing_func(
         "vehicleMileage": str(vehicle_mileage)
     }
 
-    resp = requests.get(url, headers=headers, params=params)
+    resp = fetch(url, headers=headers, params=params)
     data = resp.json()
 
     apr_data = data.get("apr", {})
@@ -99,13 +100,13 @@ class GetMaintenanceInput(BaseModel):
     from_zip: str = Field(..., description="ZIP code from where the vehicle is transported to the owner")
 
 def get_maintenance_cost_func(vin, zip, from_zip):
-    url = f"https://api.auto.dev/tco/{vin}"
+    url = f"{AUTO_DEV_API_BASE}/tco/{vin}"
     params = {"zip": zip, "fromZip": from_zip}
     headers = {
         "Authorization": f"Bearer {AUTO_DEV_API_KEY}",
         "Content-Type": "application/json"
     }
-    resp = requests.get(url, params=params, headers=headers)
+    resp = fetch(url, params=params, headers=headers)
     data = resp.json()
 
     tco_data = data.get("tco", {})
@@ -131,13 +132,13 @@ class GetDepreciationInfoInput(BaseModel):
     ownership_years: int
 
 def get_depreciation_info_func(vin, zip, from_zip, ownership_years):
-    url = f"https://api.auto.dev/tco/{vin}"
+    url = f"{AUTO_DEV_API_BASE}/tco/{vin}"
     params = {"zip": zip, "fromZip": from_zip}
     headers = {
         "Authorization": f"Bearer {AUTO_DEV_API_KEY}",
         "Content-Type": "application/json"
     }
-    resp = requests.get(url, params=params, headers=headers)
+    resp = fetch(url, params=params, headers=headers)
     data = resp.json()
 
     tco_data = data.get("tco", {})
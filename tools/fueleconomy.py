@@ -9,71 +9,129 @@ year → make → model → options, as well as endpoints to retrieve vehicle
 details. Responses are normalized to JSON using the API's `format=json`
 parameter where supported to avoid XML parsing and additional deps.
 
-No external HTTP libraries are required; uses urllib from the stdlib.
+Requests go through the shared pooled client in tools.http_client
+(FUELECONOMY_BASE_URL overrides the endpoint, e.g. to point at
+tools.fake_servers). With FE_BACKEND=offline they are answered from the
+local bulk-dataset store in tools.fueleconomy_offline instead, with no
+network access.
+
+Every tool has an async twin (`afe_menu_years`, ...) on `http_client.afetch`,
+wired in as the StructuredTool coroutine, so `ainvoke` does not tie up an
+executor thread per request.
 """
 
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlencode, urljoin
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
-import logging
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
 import json
+import os
 from pydantic import BaseModel, Field
 from langchain_core.tools import StructuredTool
+from tools import fueleconomy_offline
+from tools.http_client import HttpError, HttpResponse, afetch, fetch
+from tools.response_cache import get_response_cache
+from tools.structured_log import get_logger, lazy, preview
 
 
-BASE = "https://www.fueleconomy.gov/ws/rest/"
-LOGGER = logging.getLogger("fueleconomy")
-_MAX_LOG_BODY = 1500
+BASE = os.getenv("FUELECONOMY_BASE_URL", "https://www.fueleconomy.gov/ws/rest/").rstrip("/") + "/"
+LOGGER = get_logger("fueleconomy")
 
-LOGGER.info("STARTING")
+_HEADERS = {"Accept": "application/json"}
 
 
-def _truncate(text: str, limit: int = _MAX_LOG_BODY) -> str:
-    if text is None:
-        return ""
-    if len(text) <= limit:
-        return text
-    return text[:limit] + f"... [truncated {len(text) - limit} chars]"
+def _offline() -> bool:
+    return os.getenv("FE_BACKEND", "api") == "offline"
 
 
-def _get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+def _prepare(path: str, params: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
     params = params.copy() if params else {}
     # Ask the API for JSON instead of XML
     if "format" not in params:
         params["format"] = "json"
-    query = f"?{urlencode(params)}" if params else ""
-    url = urljoin(BASE, path) + query
-    req = Request(url, headers={"Accept": "application/json"})
+    return urljoin(BASE, path), params
+
+
+def _cached(path: str, params: Dict[str, Any], url: str) -> Optional[str]:
+    text = get_response_cache().get("fueleconomy", path, params)
+    if text is not None:
+        LOGGER.debug("http.cache_hit", url=url, params=params)
+    return text
 
-    LOGGER.info(f"HTTP GET {url} params={params}")
+
+def _decode(path: str, params: Dict[str, Any], url: str, resp: HttpResponse) -> Any:
+    LOGGER.info("http.response", url=resp.url, status=resp.status, bytes=len(resp.text))
+    LOGGER.debug("http.body", url=resp.url, body=preview(resp.text))
     try:
-        with urlopen(req, timeout=20) as resp:
-            status = getattr(resp, "status", None) or resp.getcode()
-            raw = resp.read()
-            text = raw.decode("utf-8", errors="replace")
-            LOGGER.info(
-                f"HTTP {status} {url} len={len(raw)} body={_truncate(text)}"
-            )
-    except HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace") if hasattr(e, "read") else ""
-        LOGGER.error(
-            f"HTTPError during GET {url}: code={getattr(e, 'code', None)} reason={getattr(e, 'reason', None)} body={_truncate(body)}"
-        )
-        raise
-    except URLError as e:
-        LOGGER.error(f"URLError during GET {url}: reason={getattr(e, 'reason', e)}")
-        raise
-    except Exception:
-        LOGGER.exception(f"Unexpected error during GET {url}")
+        resp.raise_for_status()
+    except HttpError as e:
+        LOGGER.error("http.error", url=url, status=e.status, body=preview(e.body))
         raise
+    text = resp.text
 
     try:
-        return json.loads(text)
+        data = json.loads(text)
     except json.JSONDecodeError:
-        LOGGER.warning("JSON decoding failed; returning raw text payload")
+        LOGGER.warning("http.bad_json", url=url, bytes=len(text))
         # Fallback to raw text if API didn't return JSON as expected
         return {"raw": text}
+    # Only well-formed JSON is cached
+    get_response_cache().put("fueleconomy", path, params, text)
+    return data
+
+
+def _get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    if _offline():
+        return fueleconomy_offline.get_json(path, params)
+    url, params = _prepare(path, params)
+    text = _cached(path, params, url)
+    if text is not None:
+        return json.loads(text)
+
+    LOGGER.info("http.request", url=url, params=params)
+    try:
+        resp = fetch(url, params=params, headers=_HEADERS)
+    except Exception:
+        LOGGER.exception("http.failed", url=url)
+        raise
+    return _decode(path, params, url, resp)
+
+
+async def _aget_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    if _offline():
+        # Local SQLite lookups; nothing to wait on
+        return fueleconomy_offline.get_json(path, params)
+    url, params = _prepare(path, params)
+    text = _cached(path, params, url)
+    if text is not None:
+        return json.loads(text)
+
+    LOGGER.info("http.request", url=url, params=params)
+    try:
+        resp = await afetch(url, params=params, headers=_HEADERS)
+    except Exception:
+        LOGGER.exception("http.failed", url=url)
+        raise
+    return _decode(path, params, url, resp)
+
+
+@contextmanager
+def _logged(event: str):
+    try:
+        yield
+    except Exception:
+        LOGGER.exception(f"{event}.failed")
+        raise
+
+
+def _menu_items(data: Any) -> List[Dict[str, Any]]:
+    # Normalized response: list of {text: "2024", value: "2024"}; a single item comes back as a dict
+    items = data.get("menuItem", []) if isinstance(data, dict) else []
+    return [items] if isinstance(items, dict) else items
+
+
+def _menu_texts(data: Any) -> List[str]:
+    texts = [str(i.get("text") or i.get("value") or "").strip() for i in _menu_items(data)]
+    return [t for t in texts if t]
 
 
 # ---------- Menu Tools ----------
@@ -83,48 +141,52 @@ class YearMenuInput(BaseModel):
     """No fields required; returns available model years."""
 
 
+def _years_result(data: Any) -> List[int]:
+    years: List[int] = []
+    for item in _menu_items(data):
+        try:
+            years.append(int(item.get("value") or item.get("text")))
+        except Exception:
+            continue
+    result = sorted(list(set(years)), reverse=True)
+    LOGGER.info("fe_menu_years", years=len(result), sample=lazy(lambda: result[:5]))
+    return result
+
+
 def fe_menu_years() -> List[int]:
     """Return a list of available model years (descending)."""
-    LOGGER.info("fe_menu_years: start")
-    try:
-        data = _get_json("vehicle/menu/year")
-        # Normalized response: list of {text: "2024", value: "2024"}
-        items = data.get("menuItem", []) if isinstance(data, dict) else []
-        if isinstance(items, dict):
-            items = [items]
-        years: List[int] = []
-        for item in items:
-            try:
-                years.append(int(item.get("value") or item.get("text")))
-            except Exception:
-                continue
-        result = sorted(list(set(years)), reverse=True)
-        LOGGER.info(f"fe_menu_years: {len(result)} years; sample={result[:5]}")
-        return result
-    except Exception:
-        LOGGER.exception("fe_menu_years: failed")
-        raise
+    LOGGER.debug("fe_menu_years.start")
+    with _logged("fe_menu_years"):
+        return _years_result(_get_json("vehicle/menu/year"))
+
+
+async def afe_menu_years() -> List[int]:
+    LOGGER.debug("fe_menu_years.start")
+    with _logged("fe_menu_years"):
+        return _years_result(await _aget_json("vehicle/menu/year"))
 
 
 class MakeMenuInput(BaseModel):
     year: int = Field(..., description="Model year, e.g., 2022")
 
 
+def _makes_result(data: Any) -> List[str]:
+    result = _menu_texts(data)
+    LOGGER.info("fe_menu_makes", makes=len(result), sample=lazy(lambda: result[:5]))
+    return result
+
+
 def fe_menu_makes(year: int) -> List[str]:
     """Return makes for a given model year."""
-    LOGGER.info(f"fe_menu_makes: start year={year}")
-    try:
-        data = _get_json("vehicle/menu/make", {"year": year})
-        items = data.get("menuItem", []) if isinstance(data, dict) else []
-        if isinstance(items, dict):
-            items = [items]
-        makes = [str(i.get("text") or i.get("value") or "").strip() for i in items]
-        result = [m for m in makes if m]
-        LOGGER.info(f"fe_menu_makes: {len(result)} makes; sample={result[:5]}")
-        return result
-    except Exception:
-        LOGGER.exception("fe_menu_makes: failed")
-        raise
+    LOGGER.debug("fe_menu_makes.start", year=year)
+    with _logged("fe_menu_makes"):
+        return _makes_result(_get_json("vehicle/menu/make", {"year": year}))
+
+
+async def afe_menu_makes(year: int) -> List[str]:
+    LOGGER.debug("fe_menu_makes.start", year=year)
+    with _logged("fe_menu_makes"):
+        return _makes_result(await _aget_json("vehicle/menu/make", {"year": year}))
 
 
 class ModelMenuInput(BaseModel):
@@ -132,21 +194,23 @@ class ModelMenuInput(BaseModel):
     make: str = Field(..., description="Vehicle make, e.g., Toyota")
 
 
+def _models_result(data: Any) -> List[str]:
+    result = _menu_texts(data)
+    LOGGER.info("fe_menu_models", models=len(result), sample=lazy(lambda: result[:5]))
+    return result
+
+
 def fe_menu_models(year: int, make: str) -> List[str]:
     """Return models for a given year and make."""
-    LOGGER.info(f"fe_menu_models: start year={year} make={make}")
-    try:
-        data = _get_json("vehicle/menu/model", {"year": year, "make": make})
-        items = data.get("menuItem", []) if isinstance(data, dict) else []
-        if isinstance(items, dict):
-            items = [items]
-        models = [str(i.get("text") or i.get("value") or "").strip() for i in items]
-        result = [m for m in models if m]
-        LOGGER.info(f"fe_menu_models: {len(result)} models; sample={result[:5]}")
-        return result
-    except Exception:
-        LOGGER.exception("fe_menu_models: failed")
-        raise
+    LOGGER.debug("fe_menu_models.start", year=year, make=make)
+    with _logged("fe_menu_models"):
+        return _models_result(_get_json("vehicle/menu/model", {"year": year, "make": make}))
+
+
+async def afe_menu_models(year: int, make: str) -> List[str]:
+    LOGGER.debug("fe_menu_models.start", year=year, make=make)
+    with _logged("fe_menu_models"):
+        return _models_result(await _aget_json("vehicle/menu/model", {"year": year, "make": make}))
 
 
 class OptionsMenuInput(BaseModel):
@@ -155,33 +219,34 @@ class OptionsMenuInput(BaseModel):
     model: str = Field(..., description="Vehicle model, e.g., Camry")
 
 
+def _options_result(data: Any) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for i in _menu_items(data):
+        text = str(i.get("text") or "").strip()
+        try:
+            vid = int(i.get("value"))
+        except Exception:
+            vid = None
+        if text and vid:
+            out.append({"id": vid, "text": text})
+    LOGGER.info("fe_menu_options", options=len(out), sample=lazy(lambda: [o["id"] for o in out[:5]]))
+    return out
+
+
 def fe_menu_options(year: int, make: str, model: str) -> List[Dict[str, Any]]:
     """Return available options (trims) for a year/make/model with ids.
 
     Each item contains at least: {id: int, text: str}
     """
-    LOGGER.info(f"fe_menu_options: start year={year} make={make} model={model}")
-    try:
-        data = _get_json("vehicle/menu/options", {"year": year, "make": make, "model": model})
-        items = data.get("menuItem", []) if isinstance(data, dict) else []
-        if isinstance(items, dict):
-            items = [items]
-        out: List[Dict[str, Any]] = []
-        for i in items:
-            text = str(i.get("text") or "").strip()
-            try:
-                vid = int(i.get("value"))
-            except Exception:
-                vid = None
-            if text and vid:
-                out.append({"id": vid, "text": text})
-        LOGGER.info(
-            f"fe_menu_options: {len(out)} options; sample={[o['id'] for o in out[:5]]}"
-        )
-        return out
-    except Exception:
-        LOGGER.exception("fe_menu_options: failed")
-        raise
+    LOGGER.debug("fe_menu_options.start", year=year, make=make, model=model)
+    with _logged("fe_menu_options"):
+        return _options_result(_get_json("vehicle/menu/options", {"year": year, "make": make, "model": model}))
+
+
+async def afe_menu_options(year: int, make: str, model: str) -> List[Dict[str, Any]]:
+    LOGGER.debug("fe_menu_options.start", year=year, make=make, model=model)
+    with _logged("fe_menu_options"):
+        return _options_result(await _aget_json("vehicle/menu/options", {"year": year, "make": make, "model": model}))
 
 
 # ---------- Data Endpoints ----------
@@ -191,21 +256,25 @@ class VehicleInput(BaseModel):
     vehicle_id: int = Field(..., description="FuelEconomy.gov vehicle id (from options)")
 
 
+def _details_result(data: Any) -> Dict[str, Any]:
+    if isinstance(data, dict):
+        LOGGER.info("fe_vehicle_details", keys=lazy(lambda: list(data.keys())[:10]))
+        return data
+    LOGGER.info("fe_vehicle_details.non_dict", type=type(data).__name__)
+    return {"data": data}
+
+
 def fe_vehicle_details(vehicle_id: int) -> Dict[str, Any]:
     """Return detailed vehicle data for a given vehicle id."""
-    LOGGER.info(f"fe_vehicle_details: start vehicle_id={vehicle_id}")
-    try:
-        data = _get_json(f"vehicle/{vehicle_id}")
-        if isinstance(data, dict):
-            LOGGER.info(
-                f"fe_vehicle_details: keys={list(data.keys())[:10]}"
-            )
-            return data
-        LOGGER.info("fe_vehicle_details: non-dict response, wrapping in {data}")
-        return {"data": data}
-    except Exception:
-        LOGGER.exception("fe_vehicle_details: failed")
-        raise
+    LOGGER.debug("fe_vehicle_details.start", vehicle_id=vehicle_id)
+    with _logged("fe_vehicle_details"):
+        return _details_result(_get_json(f"vehicle/{vehicle_id}"))
+
+
+async def afe_vehicle_details(vehicle_id: int) -> Dict[str, Any]:
+    LOGGER.debug("fe_vehicle_details.start", vehicle_id=vehicle_id)
+    with _logged("fe_vehicle_details"):
+        return _details_result(await _aget_json(f"vehicle/{vehicle_id}"))
 
 
 # Optional helper: search and return options in one call
@@ -221,30 +290,35 @@ FE_TOOLS = [
         name="fe_menu_years",
         description="List available model years from FuelEconomy.gov",
         func=fe_menu_years,
+        coroutine=afe_menu_years,
         args_schema=YearMenuInput,
     ),
     StructuredTool.from_function(
         name="fe_menu_makes",
         description="List makes for a given year from FuelEconomy.gov",
         func=fe_menu_makes,
+        coroutine=afe_menu_makes,
         args_schema=MakeMenuInput,
     ),
     StructuredTool.from_function(
         name="fe_menu_models",
         description="List models for a given year and make from FuelEconomy.gov",
         func=fe_menu_models,
+        coroutine=afe_menu_models,
         args_schema=ModelMenuInput,
     ),
     StructuredTool.from_function(
         name="fe_menu_options",
         description="List trims/options with ids for a year/make/model from FuelEconomy.gov",
         func=fe_menu_options,
+        coroutine=afe_menu_options,
         args_schema=OptionsMenuInput,
     ),
     StructuredTool.from_function(
         name="fe_vehicle_details",
         description="Get detailed vehicle information by FuelEconomy.gov vehicle id",
         func=fe_vehicle_details,
+        coroutine=afe_vehicle_details,
         args_schema=VehicleInput,
     )
 ]
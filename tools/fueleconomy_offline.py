@@ -0,0 +1,203 @@
+"""
+Offline FuelEconomy.gov backend built from the bulk vehicles dataset
+
+FuelEconomy.gov publishes its full vehicle table as one CSV
+(https://www.fueleconomy.gov/feg/epadata/vehicles.csv.zip). `import_csv`
+streams that file into a compact SQLite store indexed by
+year/make/model/trim; the store is opened read-only and memory-mapped, so
+the menu and vehicle lookups of `tools.fueleconomy` are answered in well
+under a millisecond with no network at all.
+
+Enable it with FE_BACKEND=offline (FE_OFFLINE_DB points at the store,
+default ".cache/fueleconomy.sqlite"); `get_json` then synthesizes the same
+JSON shapes the REST endpoints return.
+
+Build the store:
+    python -m tools.fueleconomy_offline vehicles.csv [--db PATH]
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+import argparse
+import csv
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+
+
+LOGGER = logging.getLogger("fueleconomy.offline")
+
+DEFAULT_DB = os.path.join(".cache", "fueleconomy.sqlite")
+MMAP_SIZE = 256 * 1024 * 1024
+_BATCH = 5000
+
+
+def db_path() -> str:
+    return os.getenv("FE_OFFLINE_DB", DEFAULT_DB)
+
+
+def trim_text(row: Dict[str, str]) -> str:
+    """Option label in the style of vehicle/menu/options, e.g. "Auto (S8), 6 cyl, 3.5 L, Turbo"."""
+    parts = [row.get("trany", "").strip()]
+    if row.get("cylinders"):
+        parts.append(f"{row['cylinders']} cyl")
+    if row.get("displ"):
+        parts.append(f"{row['displ']} L")
+    if row.get("tCharger") in ("T", "True", "1"):
+        parts.append("Turbo")
+    if row.get("sCharger") == "S":
+        parts.append("SCharger")
+    if row.get("atvType") and row["atvType"] not in ("", "NA"):
+        parts.append(row["atvType"])
+    return ", ".join(p for p in parts if p)
+
+
+# ---------- Import ----------
+
+
+def import_csv(csv_path: str, path: Optional[str] = None) -> int:
+    """(Re)build the offline store from the bulk vehicles CSV; returns the row count."""
+    path = path or db_path()
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    db = sqlite3.connect(tmp_path)
+    db.execute("PRAGMA journal_mode=OFF")
+    db.execute("PRAGMA synchronous=OFF")
+    db.execute(
+        "CREATE TABLE vehicles ("
+        " id INTEGER PRIMARY KEY, year INTEGER NOT NULL, make TEXT NOT NULL, model TEXT NOT NULL,"
+        " trim TEXT NOT NULL, data TEXT NOT NULL)"
+    )
+    count = 0
+    with open(csv_path, newline="", encoding="utf-8-sig") as f:
+        batch = []
+        for row in csv.DictReader(f):
+            try:
+                record = (int(row["id"]), int(row["year"]), row["make"].strip(), row["model"].strip())
+            except (KeyError, ValueError):
+                continue
+            # Empty columns are dropped to keep the store compact
+            data = json.dumps({k: v for k, v in row.items() if v not in ("", None)}, separators=(",", ":"))
+            batch.append(record + (trim_text(row), data))
+            if len(batch) >= _BATCH:
+                count += _insert(db, batch)
+                batch = []
+        count += _insert(db, batch)
+
+    db.execute("CREATE INDEX vehicles_ymm ON vehicles (year, make COLLATE NOCASE, model COLLATE NOCASE, trim)")
+    db.commit()
+    db.execute("VACUUM")
+    db.close()
+    os.replace(tmp_path, path)
+    _reset_connections()
+    LOGGER.info(f"Imported {count} vehicles from {csv_path} into {path}")
+    return count
+
+
+def _insert(db: sqlite3.Connection, rows: List[tuple]) -> int:
+    db.executemany("INSERT OR REPLACE INTO vehicles VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return len(rows)
+
+
+# ---------- Lookups ----------
+
+_local = threading.local()
+_generation = 0
+
+
+def _reset_connections() -> None:
+    global _generation
+    _generation += 1
+
+
+def _db() -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "generation", None) != _generation:
+        path = db_path()
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"Offline FuelEconomy store {path!r} not found; build it with "
+                f"`python -m tools.fueleconomy_offline vehicles.csv`"
+            )
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        _local.conn, _local.generation = conn, _generation
+    return conn
+
+
+def _menu(values: Iterable[Any]) -> Dict[str, Any]:
+    return {"menuItem": [{"text": str(v), "value": str(v)} for v in values]}
+
+
+def menu_years() -> Dict[str, Any]:
+    rows = _db().execute("SELECT DISTINCT year FROM vehicles ORDER BY year DESC")
+    return _menu(r[0] for r in rows)
+
+
+def menu_makes(year: int) -> Dict[str, Any]:
+    rows = _db().execute("SELECT DISTINCT make FROM vehicles WHERE year = ? ORDER BY make", (int(year),))
+    return _menu(r[0] for r in rows)
+
+
+def menu_models(year: int, make: str) -> Dict[str, Any]:
+    rows = _db().execute(
+        "SELECT DISTINCT model FROM vehicles WHERE year = ? AND make = ? COLLATE NOCASE ORDER BY model",
+        (int(year), make),
+    )
+    return _menu(r[0] for r in rows)
+
+
+def menu_options(year: int, make: str, model: str) -> Dict[str, Any]:
+    rows = _db().execute(
+        "SELECT id, trim FROM vehicles WHERE year = ? AND make = ? COLLATE NOCASE AND model = ? COLLATE NOCASE"
+        " ORDER BY trim, id",
+        (int(year), make, model),
+    )
+    return {"menuItem": [{"text": trim, "value": str(vid)} for vid, trim in rows]}
+
+
+def vehicle(vehicle_id: int) -> Dict[str, Any]:
+    row = _db().execute("SELECT data FROM vehicles WHERE id = ?", (int(vehicle_id),)).fetchone()
+    if row is None:
+        raise KeyError(f"Vehicle {vehicle_id} not in the offline FuelEconomy store")
+    return json.loads(row[0])
+
+
+_VEHICLE_PATH = re.compile(r"^vehicle/(\d+)$")
+
+
+def get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """Answer a `tools.fueleconomy._get_json` request from the offline store."""
+    params = params or {}
+    path = path.strip("/")
+    if path == "vehicle/menu/year":
+        return menu_years()
+    if path == "vehicle/menu/make":
+        return menu_makes(params["year"])
+    if path == "vehicle/menu/model":
+        return menu_models(params["year"], params["make"])
+    if path == "vehicle/menu/options":
+        return menu_options(params["year"], params["make"], params["model"])
+    match = _VEHICLE_PATH.match(path)
+    if match:
+        return vehicle(int(match.group(1)))
+    raise ValueError(f"Path {path!r} is not served by the offline FuelEconomy backend")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline FuelEconomy.gov store from vehicles.csv")
+    parser.add_argument("csv_path", help="Bulk vehicles.csv (unzipped)")
+    parser.add_argument("--db", default=None, help=f"Output store (default FE_OFFLINE_DB or {DEFAULT_DB})")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    print(f"Imported {import_csv(args.csv_path, args.db)} vehicles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Deterministic FuelEconomy.gov vehicle resolver
+
+Walks the year → make → model → options menus in code instead of letting an
+LLM do it one tool call at a time. Hints are fuzzy-matched against the menus
+(see tools.matching), which are cached per process, so a repeat lookup for
+the same car costs a single `vehicle/{id}` request or nothing at all. Empty
+menus are not cached, so a failed or empty response is fetched again.
+
+`resolve_vehicle` returns None whenever the hint is genuinely ambiguous (no
+model named, no menu value clears the match cutoff, ...); callers then fall
+back to the LLM menu-walking agent. `aresolve_vehicle` is the same lookup on
+the async tools, sharing the menu cache.
+"""
+
+from contextlib import aclosing
+from typing import Any, Dict, Optional, Tuple
+
+from tools.fueleconomy import (
+    afe_menu_makes, afe_menu_models, afe_menu_options, afe_menu_years, afe_vehicle_details,
+    fe_menu_makes, fe_menu_models, fe_menu_options, fe_menu_years, fe_vehicle_details,
+)
+from tools.matching import awalk_menus, best_match, dealias, walk_menus
+from tools.menu_cache import cache_nonempty
+from tools.structured_log import get_logger
+
+
+LOGGER = get_logger("fueleconomy.resolver")
+
+# Minimum score for a make given explicitly (models are anchored on a token instead)
+MATCH_CUTOFF = 0.7
+# Without an explicit year, also try the previous menus (the newest year is often sparse)
+YEAR_FALLBACKS = 2
+
+DETAIL_FIELDS = (
+    "year", "make", "model", "VClass", "atvType", "fuelType", "drive", "trany", "cylinders", "displ",
+    "city08", "highway08", "comb08", "cityE", "highwayE", "combE", "range", "evMotor",
+    "co2TailpipeGpm", "fuelCost08", "youSaveSpend", "feScore", "ghgScore",
+)
+
+
+# ---------- Cached menus ----------
+
+
+@cache_nonempty(maxsize=1)
+def _years() -> Tuple[int, ...]:
+    return tuple(fe_menu_years())
+
+
+@_years.coroutine
+async def _ayears() -> Tuple[int, ...]:
+    return tuple(await afe_menu_years())
+
+
+@cache_nonempty(maxsize=256)
+def _makes(year: int) -> Tuple[str, ...]:
+    return tuple(fe_menu_makes(year))
+
+
+@_makes.coroutine
+async def _amakes(year: int) -> Tuple[str, ...]:
+    return tuple(await afe_menu_makes(year))
+
+
+@cache_nonempty(maxsize=4096)
+def _models(year: int, make: str) -> Tuple[str, ...]:
+    return tuple(fe_menu_models(year, make))
+
+
+@_models.coroutine
+async def _amodels(year: int, make: str) -> Tuple[str, ...]:
+    return tuple(await afe_menu_models(year, make))
+
+
+@cache_nonempty(maxsize=4096)
+def _options(year: int, make: str, model: str) -> Tuple[Tuple[int, str], ...]:
+    return tuple((o["id"], o["text"]) for o in fe_menu_options(year, make, model))
+
+
+@_options.coroutine
+async def _aoptions(year: int, make: str, model: str) -> Tuple[Tuple[int, str], ...]:
+    return tuple((o["id"], o["text"]) for o in await afe_menu_options(year, make, model))
+
+
+@cache_nonempty(maxsize=4096)
+def _details(vehicle_id: int) -> Dict[str, Any]:
+    return fe_vehicle_details(vehicle_id)
+
+
+@_details.coroutine
+async def _adetails(vehicle_id: int) -> Dict[str, Any]:
+    return await afe_vehicle_details(vehicle_id)
+
+
+def clear_menu_cache() -> None:
+    for cached in (_years, _makes, _models, _options, _details):
+        cached.cache_clear()
+
+
+# ---------- Resolution steps ----------
+
+
+def _pick_option(options: Tuple[Tuple[int, str], ...], trim_hint: str) -> Tuple[int, str]:
+    # Options are trims/transmissions of one model; without a hint the first (base) one is used
+    if trim_hint:
+        texts = [text for _, text in options]
+        text = best_match(trim_hint, texts, cutoff=0.5)
+        if text is not None:
+            return options[texts.index(text)]
+    return options[0]
+
+
+def _summary(details: Dict[str, Any], vehicle_id: int, trim: str, options) -> Dict[str, Any]:
+    summary = {k: details[k] for k in DETAIL_FIELDS if details.get(k) not in (None, "", "0", 0)}
+    summary.update({
+        "id": vehicle_id,
+        "trim": trim,
+        "other_trims": [text for vid, text in options if vid != vehicle_id][:5],
+        "source": "fueleconomy.gov",
+    })
+    return summary
+
+
+def resolve_vehicle(query: Optional[str] = None,
+                    year: Optional[int] = None,
+                    make: Optional[str] = None,
+                    model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Resolve a car hint to FuelEconomy.gov vehicle details, or None if ambiguous."""
+    query = dealias(query)
+    walk = walk_menus(query, year, make, model, _years, _makes, _models, MATCH_CUTOFF, YEAR_FALLBACKS)
+    for menu_year, menu_make, menu_model, trim_hint in walk:
+        options = _options(menu_year, menu_make, menu_model)
+        if not options:
+            continue
+        vehicle_id, trim = _pick_option(options, trim_hint)
+        LOGGER.info("resolve_vehicle", query=query, year=menu_year, make=menu_make, model=menu_model, trim=trim,
+                    vehicle_id=vehicle_id)
+        return _summary(_details(vehicle_id), vehicle_id, trim, options)
+
+    LOGGER.info("resolve_vehicle.ambiguous", query=query, year=year, make=make, model=model)
+    return None
+
+
+async def aresolve_vehicle(query: Optional[str] = None,
+                           year: Optional[int] = None,
+                           make: Optional[str] = None,
+                           model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Async `resolve_vehicle`."""
+    query = dealias(query)
+    walk = awalk_menus(query, year, make, model, _ayears, _amakes, _amodels, MATCH_CUTOFF, YEAR_FALLBACKS)
+    async with aclosing(walk):
+        async for menu_year, menu_make, menu_model, trim_hint in walk:
+            options = await _aoptions(menu_year, menu_make, menu_model)
+            if not options:
+                continue
+            vehicle_id, trim = _pick_option(options, trim_hint)
+            LOGGER.info("resolve_vehicle", query=query, year=menu_year, make=menu_make, model=menu_model,
+                        trim=trim, vehicle_id=vehicle_id)
+            return _summary(await _adetails(vehicle_id), vehicle_id, trim, options)
+
+    LOGGER.info("resolve_vehicle.ambiguous", query=query, year=year, make=make, model=model)
+    return None
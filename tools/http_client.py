@@ -0,0 +1,210 @@
+"""
+Shared HTTP client for the external tool modules
+
+One process-wide layer used by the FuelEconomy.gov, NHTSA, Auto.dev and
+Nominatim tools instead of a fresh `urlopen`/`requests.get` per call:
+- sync calls share a `requests.Session` whose adapter keeps up to
+  HTTP_MAX_PER_HOST keep-alive connections per host, so repeat calls skip
+  the TCP+TLS handshake
+- async calls share an `httpx.AsyncClient` per event loop; it is closed with
+  `aclose()` or, at the latest, when the loop shuts down its async generators
+  (as `asyncio.run` does before closing the loop)
+- at most HTTP_MAX_PER_HOST requests are in flight per host (per interface)
+- every request has a timeout (HTTP_TIMEOUT seconds, overridable per call)
+
+Concurrent identical GETs (same URL and headers) are coalesced into one
+upstream request (tools.single_flight). Requests go through the
+record/replay cassette (environment.cassette), keyed by method and full URL;
+headers (API keys) are not part of the key.
+Responses are returned as `HttpResponse` for every status code; call
+`raise_for_status()` to turn 4xx/5xx into `HttpError`.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode, urlsplit
+import asyncio
+import json
+import logging
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from environment.cassette import get_cassette
+from tools.single_flight import AsyncSingleFlight, SingleFlight
+
+
+LOGGER = logging.getLogger("http_client")
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "20"))
+HTTP_MAX_PER_HOST = max(1, int(os.getenv("HTTP_MAX_PER_HOST", "8")))
+
+
+class HttpError(Exception):
+    """Raised by `HttpResponse.raise_for_status` for 4xx/5xx responses."""
+
+    def __init__(self, response: "HttpResponse"):
+        super().__init__(f"HTTP {response.status} for {response.url}")
+        self.status = response.status
+        self.body = response.text
+
+
+@dataclass
+class HttpResponse:
+    url: str
+    status: int
+    text: str
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 400
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self) -> "HttpResponse":
+        if not self.ok:
+            raise HttpError(self)
+        return self
+
+
+def _flight_key(method: str, url: str, headers: Optional[Dict[str, str]]) -> Optional[tuple]:
+    # Only idempotent reads are coalesced; headers are included since they may carry credentials
+    if method != "GET":
+        return None
+    return url, tuple(sorted((headers or {}).items()))
+
+
+def build_url(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    # Like requests, parameters set to None are left out
+    params = {k: v for k, v in (params or {}).items() if v is not None}
+    return f"{url}?{urlencode(params)}" if params else url
+
+
+# ---------- Sync (requests) ----------
+
+_session: Optional[requests.Session] = None
+_flights = SingleFlight()
+_host_limits: Dict[str, threading.BoundedSemaphore] = {}
+_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=32, pool_maxsize=HTTP_MAX_PER_HOST)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _host_limit(host: str) -> threading.BoundedSemaphore:
+    limit = _host_limits.get(host)
+    if limit is None:
+        with _lock:
+            limit = _host_limits.setdefault(host, threading.BoundedSemaphore(HTTP_MAX_PER_HOST))
+    return limit
+
+
+def fetch(url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+          timeout: Optional[float] = None, method: str = "GET") -> HttpResponse:
+    """Send a request on the pooled session (through the cassette)."""
+    full_url = build_url(url, params)
+
+    def _send() -> Dict[str, Any]:
+        with _host_limit(urlsplit(full_url).netloc):
+            resp = _get_session().request(method, full_url, headers=headers, timeout=timeout or HTTP_TIMEOUT)
+        return {"url": full_url, "status": resp.status_code, "text": resp.text, "headers": dict(resp.headers)}
+
+    def _call() -> HttpResponse:
+        return HttpResponse(**get_cassette().call("http", {"method": method, "url": full_url}, _send))
+
+    key = _flight_key(method, full_url, headers)
+    return _flights.do(key, _call) if key else _call()
+
+
+# ---------- Async (httpx) ----------
+
+
+class _LoopClient:
+    """The httpx client and per-host limits of one event loop."""
+
+    def __init__(self):
+        import httpx
+
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=HTTP_MAX_PER_HOST * 4),
+            timeout=HTTP_TIMEOUT,
+        )
+        self.host_limits: Dict[str, asyncio.Semaphore] = {}
+        self.closer = None
+
+    def host_limit(self, host: str) -> asyncio.Semaphore:
+        limit = self.host_limits.get(host)
+        if limit is None:
+            limit = self.host_limits[host] = asyncio.Semaphore(HTTP_MAX_PER_HOST)
+        return limit
+
+
+# Entries are removed when their loop shuts down (or by `aclose`)
+_loop_clients: Dict[asyncio.AbstractEventLoop, _LoopClient] = {}
+_async_flights = AsyncSingleFlight()
+
+
+async def _close_at_shutdown(loop: asyncio.AbstractEventLoop, state: _LoopClient):
+    # The loop closes open async generators in shutdown_asyncgens(), which
+    # asyncio.run (and uvicorn) call before closing the loop
+    try:
+        yield
+    finally:
+        if _loop_clients.get(loop) is state:
+            del _loop_clients[loop]
+        await state.client.aclose()
+
+
+async def _loop_client() -> _LoopClient:
+    loop = asyncio.get_running_loop()
+    state = _loop_clients.get(loop)
+    if state is None:
+        state = _loop_clients[loop] = _LoopClient()
+        # Kept on the state: the loop only holds its async generators weakly
+        state.closer = _close_at_shutdown(loop, state)
+        await state.closer.__anext__()
+    return state
+
+
+async def afetch(url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None,
+                 timeout: Optional[float] = None, method: str = "GET") -> HttpResponse:
+    """Async counterpart of `fetch` on a pooled httpx client bound to the running loop."""
+    full_url = build_url(url, params)
+
+    async def _send() -> Dict[str, Any]:
+        state = await _loop_client()
+        async with state.host_limit(urlsplit(full_url).netloc):
+            resp = await state.client.request(method, full_url, headers=headers, timeout=timeout or HTTP_TIMEOUT)
+        return {"url": full_url, "status": resp.status_code, "text": resp.text, "headers": dict(resp.headers)}
+
+    async def _call() -> HttpResponse:
+        return HttpResponse(**await get_cassette().acall("http", {"method": method, "url": full_url}, _send))
+
+    key = _flight_key(method, full_url, headers)
+    return await (_async_flights.do(key, _call) if key else _call())
+
+
+async def aclose() -> None:
+    """Close the async client of the running loop, e.g. from an app's shutdown hook."""
+    state = _loop_clients.get(asyncio.get_running_loop())
+    if state is not None:
+        await state.closer.aclose()
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    """Request coalescing counters for the sync and async interfaces."""
+    return {"sync": dict(_flights.stats), "async": dict(_async_flights.stats)}
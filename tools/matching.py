@@ -0,0 +1,202 @@
+"""
+Fuzzy matching helpers for vehicle menus
+
+Small stdlib-only utilities (difflib) used by the deterministic resolvers to
+map free-text car hints onto the exact menu values the public APIs expect,
+e.g. "2022 honda crv hybrid" -> year 2022, make "Honda", model "CR-V Hybrid AWD".
+
+`walk_menus` is the year → make → model walk shared by those resolvers; each
+API plugs in its own menu fetchers and only handles its leaf menu (options,
+variants) itself; `awalk_menus` is the same walk over async fetchers.
+"""
+
+from difflib import SequenceMatcher
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import re
+
+
+_YEAR_RE = re.compile(r"\b(19[89]\d|20\d{2})\b")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Weight of token coverage vs. whole-string similarity in `score`
+_COVERAGE_WEIGHT = 0.6
+_TOKEN_CUTOFF = 0.8
+
+MAKE_ALIASES = {"chevy": "Chevrolet", "vw": "Volkswagen", "mercedes": "Mercedes-Benz", "benz": "Mercedes-Benz"}
+# Descriptors that narrow a model down but cannot identify one on their own
+GENERIC_TERMS = {
+    "hybrid", "plug", "in", "phev", "ev", "electric", "gas", "diesel", "awd", "fwd", "rwd", "4wd", "2wd",
+    "4x4", "car", "suv", "truck", "sedan", "new", "used", "the", "a",
+}
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse punctuation: "CR-V AWD" -> "cr v awd"."""
+    return " ".join(tokens(text))
+
+
+def tokens(text: str) -> List[str]:
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+def parse_year(text: Optional[str]) -> Optional[int]:
+    """First plausible model year mentioned in `text`."""
+    match = _YEAR_RE.search(text or "")
+    return int(match.group(1)) if match else None
+
+
+def contains_token(candidate: str, token: str) -> bool:
+    """True if `candidate` contains `token`, allowing joined spellings and small typos."""
+    return _token_found(token, tokens(candidate))
+
+
+def _token_found(token: str, candidate_tokens: Sequence[str]) -> bool:
+    if token in candidate_tokens:
+        return True
+    # Joined spellings ("crv" vs "cr v") and small typos ("camery")
+    if len(token) >= 3 and token in "".join(candidate_tokens):
+        return True
+    return any(
+        SequenceMatcher(None, token, c).ratio() >= _TOKEN_CUTOFF for c in candidate_tokens
+    )
+
+
+def score(query: str, candidate: str) -> float:
+    """Similarity in [0, 1] between a free-text hint and a menu value."""
+    q_tokens, c_tokens = tokens(query), tokens(candidate)
+    if not q_tokens or not c_tokens:
+        return 0.0
+    coverage = sum(_token_found(t, c_tokens) for t in q_tokens) / len(q_tokens)
+    ratio = SequenceMatcher(None, " ".join(q_tokens), " ".join(c_tokens)).ratio()
+    return _COVERAGE_WEIGHT * coverage + (1 - _COVERAGE_WEIGHT) * ratio
+
+
+def rank(query: str, candidates: Iterable[str]) -> List[Tuple[float, str]]:
+    """Candidates ordered by score; ties prefer the shorter (base) variant."""
+    scored = [(score(query, c), c) for c in candidates]
+    return sorted(scored, key=lambda sc: (-sc[0], len(sc[1])))
+
+
+def best_match(query: Optional[str], candidates: Iterable[str], cutoff: float = 0.6) -> Optional[str]:
+    """Best scoring candidate, or None if nothing clears `cutoff`."""
+    if not query:
+        return None
+    ranked = rank(query, candidates)
+    if not ranked or ranked[0][0] < cutoff:
+        return None
+    return ranked[0][1]
+
+
+def find_in_text(text: Optional[str], candidates: Iterable[str]) -> Optional[str]:
+    """Longest candidate whose tokens all appear, in order, in `text`."""
+    haystack = f" {normalize(text or '')} "
+    found = [c for c in candidates if normalize(c) and f" {normalize(c)} " in haystack]
+    return max(found, key=len) if found else None
+
+
+def strip_terms(text: Optional[str], *terms: Optional[str]) -> str:
+    """Remove the tokens of `terms` (e.g. already resolved year/make) from `text`."""
+    drop = {t for term in terms if term for t in tokens(str(term))}
+    return " ".join(t for t in tokens(text or "") if t not in drop)
+
+
+def dealias(text: Optional[str]) -> str:
+    """Normalize `text` and expand make nicknames ("chevy" -> "chevrolet")."""
+    return " ".join(MAKE_ALIASES.get(t, t) for t in tokens(text or "")).lower()
+
+
+def anchored_match(hint: Optional[str], candidates: Iterable[str]) -> Optional[str]:
+    """Best candidate containing the hint's first specific token ("f150" in "f150 4wd xlt").
+
+    Returns None if the hint only holds generic descriptors ("hybrid suv") or
+    no candidate contains the anchor, i.e. when the hint is ambiguous.
+    """
+    anchor = next((t for t in tokens(hint or "") if t not in GENERIC_TERMS), None)
+    if anchor is None:
+        return None
+    matching = [c for c in candidates if contains_token(c, anchor)]
+    return rank(hint, matching)[0][1] if matching else None
+
+
+def walk_menus(query: Optional[str],
+               year: Optional[int],
+               make: Optional[str],
+               model: Optional[str],
+               years: Callable[[], Sequence[int]],
+               makes: Callable[[int], Sequence[str]],
+               models: Callable[[int, str], Sequence[str]],
+               make_cutoff: float = 0.7,
+               year_fallbacks: int = 2) -> Iterator[Tuple[int, str, str, str]]:
+    """Yield (year, make, model, trim hint) for every menu year where the hint names a make and model.
+
+    Without an explicit year the newest `year_fallbacks` menus are tried in
+    order. Callers take the first candidate whose leaf menu is non-empty.
+    """
+    query = dealias(query)
+    explicit = year or parse_year(query)
+    menu_years = years()
+    if explicit is not None:
+        candidate_years = [explicit] if explicit in menu_years else []
+    else:
+        candidate_years = list(menu_years[:year_fallbacks])
+
+    for menu_year in candidate_years:
+        year_makes = makes(menu_year)
+        menu_make = best_match(dealias(make), year_makes, make_cutoff) if make else find_in_text(query, year_makes)
+        if menu_make is None:
+            continue
+
+        # Whatever is left of the hint after removing year and make names the model (and maybe trim)
+        model_hint = " ".join(filter(None, [model, strip_terms(query, str(menu_year), dealias(make), menu_make)]))
+        make_models = models(menu_year, menu_make)
+        menu_model = anchored_match(model or model_hint, make_models)
+        if menu_model is None and model:
+            menu_model = anchored_match(model_hint, make_models)
+        if menu_model is None:
+            continue
+        yield menu_year, menu_make, menu_model, strip_terms(model_hint, menu_model)
+
+
+class _MenuMiss(Exception):
+    def __init__(self, key):
+        self.key = key
+
+
+async def awalk_menus(query: Optional[str],
+                      year: Optional[int],
+                      make: Optional[str],
+                      model: Optional[str],
+                      years: Callable[[], Awaitable[Sequence[int]]],
+                      makes: Callable[[int], Awaitable[Sequence[str]]],
+                      models: Callable[[int, str], Awaitable[Sequence[str]]],
+                      make_cutoff: float = 0.7,
+                      year_fallbacks: int = 2) -> AsyncIterator[Tuple[int, str, str, str]]:
+    """`walk_menus` over async menu lookups.
+
+    The walk stays synchronous: it is replayed against the menus fetched so
+    far, and whichever menu it is missing is awaited before the next replay.
+    Candidates come out in the same order, each once.
+    """
+    menus: Dict[tuple, Sequence] = {}
+
+    def fetched(lookup):
+        def get(*args):
+            key = (lookup, args)
+            if key not in menus:
+                raise _MenuMiss(key)
+            return menus[key]
+        return get
+
+    yielded = 0
+    while True:
+        walk = walk_menus(query, year, make, model, fetched(years), fetched(makes), fetched(models),
+                          make_cutoff, year_fallbacks)
+        try:
+            for i, candidate in enumerate(walk):
+                if i == yielded:
+                    yielded += 1
+                    yield candidate
+            return
+        except _MenuMiss as miss:
+            lookup, args = miss.key
+            menus[miss.key] = await lookup(*args)
@@ -0,0 +1,71 @@
+"""
+Process-wide caches for the resolver menus
+
+`cache_nonempty` memoizes a menu/detail lookup like `functools.lru_cache`
+but keeps only non-empty results, so an outage or a bad response (an empty
+list, `{}`) is fetched again on the next call instead of being remembered
+for the life of the process.
+
+A lookup can also be given an async source with `.coroutine`; both fill
+and read the same cache:
+
+    @cache_nonempty(maxsize=256)
+    def _makes(year): ...
+
+    @_makes.coroutine
+    async def _amakes(year): ...   # `_amakes` is now the cached async lookup
+"""
+
+from collections import OrderedDict
+from functools import update_wrapper
+from typing import Any, Awaitable, Callable, Optional
+import threading
+
+
+class _NonEmptyCache:
+    def __init__(self, fetch: Callable[..., Any], maxsize: int):
+        update_wrapper(self, fetch)
+        self._fetch = fetch
+        self._afetch: Optional[Callable[..., Awaitable[Any]]] = None
+        self._maxsize = maxsize
+        self._values: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, args: tuple):
+        with self._lock:
+            if args in self._values:
+                self._values.move_to_end(args)
+                return True, self._values[args]
+        return False, None
+
+    def _put(self, args: tuple, value: Any) -> Any:
+        if value:
+            with self._lock:
+                self._values[args] = value
+                if len(self._values) > self._maxsize:
+                    self._values.popitem(last=False)
+        return value
+
+    def __call__(self, *args):
+        found, value = self._get(args)
+        return value if found else self._put(args, self._fetch(*args))
+
+    async def acall(self, *args):
+        found, value = self._get(args)
+        return value if found else self._put(args, await self._afetch(*args))
+
+    def coroutine(self, afetch: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """Register the async source; returns the cached async lookup."""
+        self._afetch = afetch
+        return self.acall
+
+    def cache_clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+def cache_nonempty(maxsize: int):
+    """lru_cache that keeps only non-empty results, so an outage or a bad response is retried next time."""
+    def decorate(fetch):
+        return _NonEmptyCache(fetch, maxsize)
+    return decorate
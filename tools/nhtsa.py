@@ -11,64 +11,130 @@ Approach endpoints used:
 - /SafetyRatings/modelyear/{year}/make/{make}/model/{model} -> list variants with VehicleId
 - /SafetyRatings/VehicleId/{id}          -> safety ratings for a vehicle id
 
-Responses are normalized to JSON. Uses urllib (stdlib) and includes structured logging.
+Responses are normalized to JSON. Requests go through the shared pooled client
+in tools.http_client and include structured logging; NHTSA_BASE_URL overrides
+the endpoint. With NHTSA_BACKEND=offline they are answered from the local
+snapshot in tools.nhtsa_offline instead.
+
+Every tool has an async twin (`anhtsa_years`, ...) on `http_client.afetch`,
+wired in as the StructuredTool coroutine.
 """
 
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlencode, urljoin, quote
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, quote
 import json
-import logging
+import os
 from pydantic import BaseModel, Field
 from langchain_core.tools import StructuredTool
+from tools import nhtsa_offline
+from tools.http_client import HttpError, HttpResponse, afetch, fetch
+from tools.response_cache import get_response_cache
+from tools.structured_log import get_logger, lazy, preview
+
+
+BASE = os.getenv("NHTSA_BASE_URL", "https://api.nhtsa.gov/").rstrip("/") + "/"
+LOGGER = get_logger("nhtsa")
 
 
-BASE = "https://api.nhtsa.gov/"
-LOGGER = logging.getLogger("nhtsa")
-_MAX_LOG_BODY = 1500
+_HEADERS = {"Accept": "application/json"}
 
 
-def _truncate(text: Optional[str], limit: int = _MAX_LOG_BODY) -> str:
-    if not text:
-        return ""
-    return text if len(text) <= limit else text[:limit] + f"... [truncated {len(text) - limit} chars]"
+def _offline() -> bool:
+    return os.getenv("NHTSA_BACKEND", "api") == "offline"
 
 
 def _get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    if _offline():
+        return nhtsa_offline.get_json(path, params)
+    return fetch_json(path, params)
+
+
+async def _aget_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    if _offline():
+        # Local SQLite lookups; nothing to wait on
+        return nhtsa_offline.get_json(path, params)
+    return await afetch_json(path, params)
+
+
+def _prepare(path: str, params: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
     params = params.copy() if params else {}
     # Ask the API for JSON.
     if "format" not in params:
         params["format"] = "json"
-    query = f"?{urlencode(params)}" if params else ""
-    url = urljoin(BASE, path.lstrip("/")) + query
+    return urljoin(BASE, path.lstrip("/")), params
+
+
+def _cached(path: str, params: Dict[str, Any], url: str) -> Optional[str]:
+    text = get_response_cache().get("nhtsa", path, params)
+    if text is not None:
+        LOGGER.debug("http.cache_hit", url=url, params=params)
+    return text
 
-    req = Request(url, headers={"Accept": "application/json"})
-    LOGGER.info(f"HTTP GET {url} params={params}")
+
+def _decode(path: str, params: Dict[str, Any], url: str, resp: HttpResponse) -> Any:
+    LOGGER.info("http.response", url=resp.url, status=resp.status, bytes=len(resp.text))
+    LOGGER.debug("http.body", url=resp.url, body=preview(resp.text))
     try:
-        with urlopen(req, timeout=20) as resp:
-            status = getattr(resp, "status", None) or resp.getcode()
-            raw = resp.read()
-            text = raw.decode("utf-8", errors="replace")
-            LOGGER.info(f"HTTP {status} {url} len={len(raw)} body={_truncate(text)}")
-    except HTTPError as e:
-        body = e.read().decode("utf-8", errors="replace") if hasattr(e, "read") else ""
-        LOGGER.error(
-            f"HTTPError during GET {url}: code={getattr(e, 'code', None)} reason={getattr(e, 'reason', None)} body={_truncate(body)}"
-        )
+        resp.raise_for_status()
+    except HttpError as e:
+        LOGGER.error("http.error", url=url, status=e.status, body=preview(e.body))
         raise
-    except URLError as e:
-        LOGGER.error(f"URLError during GET {url}: reason={getattr(e, 'reason', e)}")
+    text = resp.text
+
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        LOGGER.warning("http.bad_json", url=url, bytes=len(text))
+        return {"raw": text}
+    # Only well-formed JSON is cached
+    get_response_cache().put("nhtsa", path, params, text)
+    return data
+
+
+def fetch_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """GET an api.nhtsa.gov path as JSON (through the response cache), ignoring NHTSA_BACKEND."""
+    url, params = _prepare(path, params)
+    text = _cached(path, params, url)
+    if text is not None:
+        return json.loads(text)
+
+    LOGGER.info("http.request", url=url, params=params)
+    try:
+        resp = fetch(url, params=params, headers=_HEADERS)
+    except Exception:
+        LOGGER.exception("http.failed", url=url)
         raise
+    return _decode(path, params, url, resp)
+
+
+async def afetch_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """Async `fetch_json`."""
+    url, params = _prepare(path, params)
+    text = _cached(path, params, url)
+    if text is not None:
+        return json.loads(text)
+
+    LOGGER.info("http.request", url=url, params=params)
+    try:
+        resp = await afetch(url, params=params, headers=_HEADERS)
     except Exception:
-        LOGGER.exception(f"Unexpected error during GET {url}")
+        LOGGER.exception("http.failed", url=url)
         raise
+    return _decode(path, params, url, resp)
 
+
+@contextmanager
+def _logged(event: str):
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        LOGGER.warning("JSON decoding failed; returning raw text payload")
-        return {"raw": text}
+        yield
+    except Exception:
+        LOGGER.exception(f"{event}.failed")
+        raise
+
+
+def _results(data: Any) -> List[Dict[str, Any]]:
+    return data.get("Results", []) if isinstance(data, dict) else []
 
 
 # ---------- Tools: list model years, makes, models, variants, and ratings ----------
@@ -78,43 +144,53 @@ class YearsInput(BaseModel):
     """No args; list available model years."""
 
 
+def _years_result(data: Any) -> List[int]:
+    # The API typically returns Results: [{ModelYear: 2023}, ...]
+    years = []
+    for i in _results(data):
+        try:
+            y = int(i.get("ModelYear"))
+            years.append(y)
+        except Exception:
+            continue
+    result = sorted(list(set(years)), reverse=True)
+    LOGGER.info("nhtsa_years", years=len(result), sample=lazy(lambda: result[:5]))
+    return result
+
+
 def nhtsa_years() -> List[int]:
-    LOGGER.info("nhtsa_years: start")
-    try:
-        data = _get_json("SafetyRatings")
-        # The API typically returns Results: [{ModelYear: 2023}, ...]
-        items = data.get("Results", []) if isinstance(data, dict) else []
-        years = []
-        for i in items:
-            try:
-                y = int(i.get("ModelYear"))
-                years.append(y)
-            except Exception:
-                continue
-        result = sorted(list(set(years)), reverse=True)
-        LOGGER.info(f"nhtsa_years: {len(result)} years; sample={result[:5]}")
-        return result
-    except Exception:
-        LOGGER.exception("nhtsa_years: failed")
-        raise
+    LOGGER.debug("nhtsa_years.start")
+    with _logged("nhtsa_years"):
+        return _years_result(_get_json("SafetyRatings"))
+
+
+async def anhtsa_years() -> List[int]:
+    LOGGER.debug("nhtsa_years.start")
+    with _logged("nhtsa_years"):
+        return _years_result(await _aget_json("SafetyRatings"))
 
 
 class MakesInput(BaseModel):
     year: int = Field(..., description="Model year, e.g., 2019")
 
 
+def _makes_result(data: Any) -> List[str]:
+    makes = [str(i.get("Make", "")).strip() for i in _results(data)]
+    result = sorted(list(set([m for m in makes if m])))
+    LOGGER.info("nhtsa_makes", makes=len(result), sample=lazy(lambda: result[:5]))
+    return result
+
+
 def nhtsa_makes(year: int) -> List[str]:
-    LOGGER.info(f"nhtsa_makes: start year={year}")
-    try:
-        data = _get_json(f"SafetyRatings/modelyear/{year}")
-        items = data.get("Results", []) if isinstance(data, dict) else []
-        makes = [str(i.get("Make", "")).strip() for i in items]
-        result = sorted(list(set([m for m in makes if m])))
-        LOGGER.info(f"nhtsa_makes: {len(result)} makes; sample={result[:5]}")
-        return result
-    except Exception:
-        LOGGER.exception("nhtsa_makes: failed")
-        raise
+    LOGGER.debug("nhtsa_makes.start", year=year)
+    with _logged("nhtsa_makes"):
+        return _makes_result(_get_json(f"SafetyRatings/modelyear/{year}"))
+
+
+async def anhtsa_makes(year: int) -> List[str]:
+    LOGGER.debug("nhtsa_makes.start", year=year)
+    with _logged("nhtsa_makes"):
+        return _makes_result(await _aget_json(f"SafetyRatings/modelyear/{year}"))
 
 
 class ModelsInput(BaseModel):
@@ -122,18 +198,23 @@ class ModelsInput(BaseModel):
     make: str = Field(..., description="Vehicle make")
 
 
+def _models_result(data: Any) -> List[str]:
+    models = [str(i.get("Model", "")).strip() for i in _results(data)]
+    result = sorted(list(set([m for m in models if m])))
+    LOGGER.info("nhtsa_models", models=len(result), sample=lazy(lambda: result[:5]))
+    return result
+
+
 def nhtsa_models(year: int, make: str) -> List[str]:
-    LOGGER.info(f"nhtsa_models: start year={year} make={make}")
-    try:
-        data = _get_json(f"SafetyRatings/modelyear/{year}/make/{quote(make)}")
-        items = data.get("Results", []) if isinstance(data, dict) else []
-        models = [str(i.get("Model", "")).strip() for i in items]
-        result = sorted(list(set([m for m in models if m])))
-        LOGGER.info(f"nhtsa_models: {len(result)} models; sample={result[:5]}")
-        return result
-    except Exception:
-        LOGGER.exception("nhtsa_models: failed")
-        raise
+    LOGGER.debug("nhtsa_models.start", year=year, make=make)
+    with _logged("nhtsa_models"):
+        return _models_result(_get_json(f"SafetyRatings/modelyear/{year}/make/{quote(make)}"))
+
+
+async def anhtsa_models(year: int, make: str) -> List[str]:
+    LOGGER.debug("nhtsa_models.start", year=year, make=make)
+    with _logged("nhtsa_models"):
+        return _models_result(await _aget_json(f"SafetyRatings/modelyear/{year}/make/{quote(make)}"))
 
 
 class VariantsInput(BaseModel):
@@ -142,46 +223,59 @@ class VariantsInput(BaseModel):
     model: str = Field(..., description="Vehicle model")
 
 
+def _variants_path(year: int, make: str, model: str) -> str:
+    return f"SafetyRatings/modelyear/{year}/make/{quote(make)}/model/{quote(model)}"
+
+
+def _variants_result(data: Any) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    for i in _results(data):
+        try:
+            vid = int(i.get("VehicleId"))
+        except Exception:
+            vid = None
+        desc = str(i.get("VehicleDescription", "")).strip()
+        if vid and desc:
+            out.append({"id": vid, "text": desc})
+    LOGGER.info("nhtsa_variants", variants=len(out), sample=lazy(lambda: [o["id"] for o in out[:5]]))
+    return out
+
+
 def nhtsa_variants(year: int, make: str, model: str) -> List[Dict[str, Any]]:
     """Return vehicle variants with their VehicleId and description."""
-    LOGGER.info(f"nhtsa_variants: start year={year} make={make} model={model}")
-    try:
-        data = _get_json(
-            f"SafetyRatings/modelyear/{year}/make/{quote(make)}/model/{quote(model)}"
-        )
-        items = data.get("Results", []) if isinstance(data, dict) else []
-        out: List[Dict[str, Any]] = []
-        for i in items:
-            try:
-                vid = int(i.get("VehicleId"))
-            except Exception:
-                vid = None
-            desc = str(i.get("VehicleDescription", "")).strip()
-            if vid and desc:
-                out.append({"id": vid, "text": desc})
-        LOGGER.info(f"nhtsa_variants: {len(out)} variants; sample={[o['id'] for o in out[:5]]}")
-        return out
-    except Exception:
-        LOGGER.exception("nhtsa_variants: failed")
-        raise
+    LOGGER.debug("nhtsa_variants.start", year=year, make=make, model=model)
+    with _logged("nhtsa_variants"):
+        return _variants_result(_get_json(_variants_path(year, make, model)))
+
+
+async def anhtsa_variants(year: int, make: str, model: str) -> List[Dict[str, Any]]:
+    LOGGER.debug("nhtsa_variants.start", year=year, make=make, model=model)
+    with _logged("nhtsa_variants"):
+        return _variants_result(await _aget_json(_variants_path(year, make, model)))
 
 
 class RatingsInput(BaseModel):
     vehicle_id: int = Field(..., description="NHTSA VehicleId")
 
 
+def _ratings_result(data: Any) -> Dict[str, Any]:
+    if isinstance(data, dict):
+        LOGGER.info("nhtsa_ratings", keys=lazy(lambda: list(data.keys())[:10]))
+        return data
+    LOGGER.info("nhtsa_ratings.non_dict", type=type(data).__name__)
+    return {"data": data}
+
+
 def nhtsa_ratings(vehicle_id: int) -> Dict[str, Any]:
-    LOGGER.info(f"nhtsa_ratings: start vehicle_id={vehicle_id}")
-    try:
-        data = _get_json(f"SafetyRatings/VehicleId/{int(vehicle_id)}")
-        if isinstance(data, dict):
-            LOGGER.info(f"nhtsa_ratings: keys={list(data.keys())[:10]}")
-            return data
-        LOGGER.info("nhtsa_ratings: non-dict response, wrapping")
-        return {"data": data}
-    except Exception:
-        LOGGER.exception("nhtsa_ratings: failed")
-        raise
+    LOGGER.debug("nhtsa_ratings.start", vehicle_id=vehicle_id)
+    with _logged("nhtsa_ratings"):
+        return _ratings_result(_get_json(f"SafetyRatings/VehicleId/{int(vehicle_id)}"))
+
+
+async def anhtsa_ratings(vehicle_id: int) -> Dict[str, Any]:
+    LOGGER.debug("nhtsa_ratings.start", vehicle_id=vehicle_id)
+    with _logged("nhtsa_ratings"):
+        return _ratings_result(await _aget_json(f"SafetyRatings/VehicleId/{int(vehicle_id)}"))
 
 
 # Export StructuredTools for NHTSA
@@ -190,31 +284,35 @@ NHTSA_TOOLS = [
         name="nhtsa_years",
         description="List available model years from NHTSA SafetyRatings",
         func=nhtsa_years,
+        coroutine=anhtsa_years,
         args_schema=YearsInput,
     ),
     StructuredTool.from_function(
         name="nhtsa_makes",
         description="List vehicle makes for a given year from NHTSA",
         func=nhtsa_makes,
+        coroutine=anhtsa_makes,
         args_schema=MakesInput,
     ),
     StructuredTool.from_function(
         name="nhtsa_models",
         description="List vehicle models for a given year and make from NHTSA",
         func=nhtsa_models,
+        coroutine=anhtsa_models,
         args_schema=ModelsInput,
     ),
     StructuredTool.from_function(
         name="nhtsa_variants",
         description="List vehicle variants (with VehicleId) for year/make/model from NHTSA",
         func=nhtsa_variants,
+        coroutine=anhtsa_variants,
         args_schema=VariantsInput,
     ),
     StructuredTool.from_function(
         name="nhtsa_ratings",
         description="Get safety ratings for a variant by VehicleId from NHTSA",
         func=nhtsa_ratings,
+        coroutine=anhtsa_ratings,
         args_schema=RatingsInput,
     ),
 ]
-
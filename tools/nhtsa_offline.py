@@ -0,0 +1,249 @@
+"""
+Offline NHTSA SafetyRatings snapshot
+
+`build_snapshot` crawls the SafetyRatings menus (years → makes → models →
+variants) and every `SafetyRatings/VehicleId/{id}` payload for a set of
+model years into a local SQLite file, one row per endpoint path.
+Snapshots can also be moved between machines with `export_snapshot` /
+`import_snapshot` (JSON lines of {"path", "body"}).
+
+Enable it with NHTSA_BACKEND=offline (NHTSA_OFFLINE_DB points at the file,
+default ".cache/nhtsa.sqlite"); `tools.nhtsa._get_json` then answers from
+the snapshot. Paths that are not in the snapshot come back as an empty
+result set, just as the API does for an unknown vehicle, so runs are
+deterministic and independent of api.nhtsa.gov.
+
+    python -m tools.nhtsa_offline build 2024 2025 [--makes TOYOTA HONDA] [--db PATH]
+    python -m tools.nhtsa_offline export snapshot.jsonl
+    python -m tools.nhtsa_offline import snapshot.jsonl
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import quote, unquote
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+
+LOGGER = logging.getLogger("nhtsa.offline")
+
+DEFAULT_DB = os.path.join(".cache", "nhtsa.sqlite")
+ROOT_PATH = "SafetyRatings"
+CRAWL_WORKERS = 8
+
+
+def db_path() -> str:
+    return os.getenv("NHTSA_OFFLINE_DB", DEFAULT_DB)
+
+
+def path_key(path: str) -> str:
+    # The API is case-insensitive and tools quote make/model, so keys are unquoted and lower-cased
+    return unquote(path.strip("/")).lower()
+
+
+def _empty(message: str = "No results in offline NHTSA snapshot") -> Dict[str, Any]:
+    return {"Count": 0, "Message": message, "Results": []}
+
+
+class SnapshotStore:
+    def __init__(self, path: str, readonly: bool = False):
+        self.path = path
+        if readonly:
+            if not os.path.exists(path):
+                raise FileNotFoundError(
+                    f"Offline NHTSA snapshot {path!r} not found; build it with "
+                    f"`python -m tools.nhtsa_offline build <years>`"
+                )
+            self._db = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS payloads ("
+                " path TEXT PRIMARY KEY, body TEXT NOT NULL, fetched_at REAL NOT NULL) WITHOUT ROWID"
+            )
+            self._db.execute("CREATE TABLE IF NOT EXISTS years (year INTEGER PRIMARY KEY)")
+            self._db.commit()
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT body FROM payloads WHERE path = ?", (path_key(path),)).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, rows: Iterable[tuple]) -> int:
+        now = time.time()
+        rows = [(path_key(path), body, now) for path, body in rows]
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO payloads VALUES (?, ?, ?)", rows)
+            self._db.commit()
+        return len(rows)
+
+    def add_years(self, years: Iterable[int]) -> None:
+        with self._lock:
+            self._db.executemany("INSERT OR IGNORE INTO years VALUES (?)", [(int(y),) for y in years])
+            self._db.commit()
+
+    def years(self) -> List[int]:
+        with self._lock:
+            return [r[0] for r in self._db.execute("SELECT year FROM years ORDER BY year DESC")]
+
+    def rows(self) -> Iterable[tuple]:
+        with self._lock:
+            return self._db.execute("SELECT path, body FROM payloads ORDER BY path").fetchall()
+
+    def close(self) -> None:
+        self._db.close()
+
+
+# ---------- Lookups ----------
+
+_store: Optional[SnapshotStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> SnapshotStore:
+    global _store
+    if _store is None or _store.path != db_path():
+        with _store_lock:
+            if _store is None or _store.path != db_path():
+                _store = SnapshotStore(db_path(), readonly=True)
+    return _store
+
+
+def get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    """Answer a `tools.nhtsa._get_json` request from the snapshot."""
+    store = get_store()
+    if path_key(path) == path_key(ROOT_PATH):
+        # Only the snapshotted years are advertised, so resolvers never walk into a missing year
+        return {"Count": len(store.years()), "Message": "Results returned successfully",
+                "Results": [{"ModelYear": y} for y in store.years()]}
+    body = store.get(path)
+    return json.loads(body) if body is not None else _empty()
+
+
+# ---------- Build / import / export ----------
+
+
+def _results(data: Any) -> List[Dict[str, Any]]:
+    return data.get("Results", []) if isinstance(data, dict) else []
+
+
+def build_snapshot(years: List[int], makes: Optional[List[str]] = None, path: Optional[str] = None,
+                   workers: int = CRAWL_WORKERS) -> int:
+    """Crawl the SafetyRatings menus and ratings for `years` into the snapshot; returns payloads stored."""
+    # Imported here: tools.nhtsa imports this module for its offline backend
+    from tools.nhtsa import fetch_json
+
+    store = SnapshotStore(path or db_path())
+    wanted = {m.lower() for m in makes} if makes else None
+    stored = 0
+
+    def save(payloads: Dict[str, Any]) -> None:
+        nonlocal stored
+        stored += store.put_many((p, json.dumps(d, separators=(",", ":"))) for p, d in payloads.items())
+
+    def crawl(paths: List[str]) -> Dict[str, Any]:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            payloads = dict(zip(paths, pool.map(fetch_json, paths)))
+        save(payloads)
+        return payloads
+
+    try:
+        for year in years:
+            year_path = f"SafetyRatings/modelyear/{year}"
+            year_data = fetch_json(year_path)
+            if wanted is not None and isinstance(year_data, dict):
+                # Keep the makes menu consistent with what was actually crawled
+                results = [i for i in _results(year_data) if str(i.get("Make", "")).strip().lower() in wanted]
+                year_data = {**year_data, "Count": len(results), "Results": results}
+            save({year_path: year_data})
+            make_names = [str(i.get("Make", "")).strip() for i in _results(year_data)]
+            make_names = [m for m in make_names if m]
+            make_paths = [f"SafetyRatings/modelyear/{year}/make/{quote(m)}" for m in make_names]
+            model_paths = [
+                f"{p}/model/{quote(str(i.get('Model', '')).strip())}"
+                for p, data in crawl(make_paths).items() for i in _results(data) if i.get("Model")
+            ]
+            vehicle_paths = sorted({
+                f"SafetyRatings/VehicleId/{int(i['VehicleId'])}"
+                for data in crawl(model_paths).values() for i in _results(data) if i.get("VehicleId")
+            })
+            crawl(vehicle_paths)
+            store.add_years([year])
+            LOGGER.info(f"Snapshot {year}: {len(make_paths)} makes, {len(model_paths)} models, "
+                        f"{len(vehicle_paths)} vehicles")
+    finally:
+        store.close()
+    return stored
+
+
+def export_snapshot(out_path: str, path: Optional[str] = None) -> int:
+    store = SnapshotStore(path or db_path(), readonly=True)
+    try:
+        count = 0
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"years": store.years()}) + "\n")
+            for key, body in store.rows():
+                f.write(json.dumps({"path": key, "body": body}) + "\n")
+                count += 1
+        return count
+    finally:
+        store.close()
+
+
+def import_snapshot(in_path: str, path: Optional[str] = None) -> int:
+    store = SnapshotStore(path or db_path())
+    try:
+        count = 0
+        with open(in_path, encoding="utf-8") as f:
+            batch = []
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if "years" in record:
+                    store.add_years(record["years"])
+                    continue
+                batch.append((record["path"], record["body"]))
+                if len(batch) >= 1000:
+                    count += store.put_many(batch)
+                    batch = []
+            count += store.put_many(batch)
+        return count
+    finally:
+        store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or move the offline NHTSA SafetyRatings snapshot")
+    parser.add_argument("--db", default=None, help=f"Snapshot file (default NHTSA_OFFLINE_DB or {DEFAULT_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Crawl api.nhtsa.gov for the given model years")
+    build.add_argument("years", nargs="+", type=int)
+    build.add_argument("--makes", nargs="*", default=None, help="Only crawl these makes")
+    build.add_argument("--workers", type=int, default=CRAWL_WORKERS)
+    export = sub.add_parser("export", help="Write the snapshot as JSON lines")
+    export.add_argument("out_path")
+    imp = sub.add_parser("import", help="Load a JSON-lines snapshot")
+    imp.add_argument("in_path")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    if args.command == "build":
+        print(f"Stored {build_snapshot(args.years, args.makes, args.db, args.workers)} payloads")
+    elif args.command == "export":
+        print(f"Exported {export_snapshot(args.out_path, args.db)} payloads")
+    else:
+        print(f"Imported {import_snapshot(args.in_path, args.db)} payloads")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Deterministic NHTSA SafetyRatings resolver
+
+Builds the year → make → model → variant tree from the `tools.nhtsa` menu
+endpoints lazily and keeps it for the life of the process, then maps a
+free-text car hint onto VehicleIds with the fuzzy matchers in
+tools.matching. Ratings for the best matching variants are fetched in
+parallel (empty ratings are not cached), so the common case is a handful of cached lookups instead of an
+LLM walking the menus.
+
+`resolve_safety` returns None whenever the hint is ambiguous; callers then
+fall back to the LLM agent. `aresolve_safety` is the same lookup on the
+async tools, sharing the tree and the ratings cache.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import threading
+
+from tools.matching import awalk_menus, dealias, rank, walk_menus
+from tools.menu_cache import cache_nonempty
+from tools.nhtsa import (
+    anhtsa_makes, anhtsa_models, anhtsa_ratings, anhtsa_variants, anhtsa_years,
+    nhtsa_makes, nhtsa_models, nhtsa_ratings, nhtsa_variants, nhtsa_years,
+)
+from tools.structured_log import get_logger, lazy
+
+
+LOGGER = get_logger("nhtsa.resolver")
+
+MATCH_CUTOFF = 0.7
+YEAR_FALLBACKS = 2
+TOP_VARIANTS = 3
+RATING_FIELDS = (
+    "OverallRating", "OverallFrontCrashRating", "OverallSideCrashRating", "RollOverRating",
+    "RolloverPossibility", "NHTSAElectronicStabilityControl", "NHTSAForwardCollisionWarning",
+    "NHTSALaneDepartureWarning", "ComplaintsCount", "RecallsCount", "InvestigationCount",
+)
+
+
+class MenuTree:
+    """Lazily populated, process-wide cache of the SafetyRatings menus."""
+
+    def __init__(self):
+        self._years: Optional[List[int]] = None
+        self._makes: Dict[int, List[str]] = {}
+        self._models: Dict[tuple, List[str]] = {}
+        self._variants: Dict[tuple, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _cached(self, table: Dict, key, fetch):
+        value = table.get(key)
+        if value is None:
+            value = fetch()
+            # Empty menus are not kept, so a failed or empty response is fetched again
+            if value:
+                with self._lock:
+                    table[key] = value
+        return value
+
+    async def _acached(self, table: Dict, key, afetch: Callable[[], Awaitable[List]]):
+        value = table.get(key)
+        if value is None:
+            value = await afetch()
+            if value:
+                with self._lock:
+                    table[key] = value
+        return value
+
+    def years(self) -> List[int]:
+        if not self._years:
+            self._years = nhtsa_years()
+        return self._years
+
+    def makes(self, year: int) -> List[str]:
+        return self._cached(self._makes, year, lambda: nhtsa_makes(year))
+
+    def models(self, year: int, make: str) -> List[str]:
+        return self._cached(self._models, (year, make), lambda: nhtsa_models(year, make))
+
+    def variants(self, year: int, make: str, model: str) -> List[Dict[str, Any]]:
+        return self._cached(self._variants, (year, make, model), lambda: nhtsa_variants(year, make, model))
+
+    async def ayears(self) -> List[int]:
+        if not self._years:
+            self._years = await anhtsa_years()
+        return self._years
+
+    async def amakes(self, year: int) -> List[str]:
+        return await self._acached(self._makes, year, lambda: anhtsa_makes(year))
+
+    async def amodels(self, year: int, make: str) -> List[str]:
+        return await self._acached(self._models, (year, make), lambda: anhtsa_models(year, make))
+
+    async def avariants(self, year: int, make: str, model: str) -> List[Dict[str, Any]]:
+        return await self._acached(self._variants, (year, make, model), lambda: anhtsa_variants(year, make, model))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._years = None
+            self._makes.clear()
+            self._models.clear()
+            self._variants.clear()
+
+
+TREE = MenuTree()
+
+
+@cache_nonempty(maxsize=4096)
+def _ratings(vehicle_id: int) -> Dict[str, Any]:
+    return _rating_fields(nhtsa_ratings(vehicle_id))
+
+
+@_ratings.coroutine
+async def _aratings(vehicle_id: int) -> Dict[str, Any]:
+    return _rating_fields(await anhtsa_ratings(vehicle_id))
+
+
+def _rating_fields(data: Any) -> Dict[str, Any]:
+    results = data.get("Results") if isinstance(data, dict) else None
+    first = results[0] if results else {}
+    return {k: first[k] for k in RATING_FIELDS if first.get(k) not in (None, "")}
+
+
+def _top_variants(variants: List[Dict[str, Any]], trim_hint: str) -> List[Dict[str, Any]]:
+    if not trim_hint:
+        return variants[:TOP_VARIANTS]
+    by_text = {v["text"]: v for v in variants}
+    return [by_text[text] for _, text in rank(trim_hint, by_text)[:TOP_VARIANTS]]
+
+
+def _resolved(query: Optional[str], year: int, make: str, model: str, top: List[Dict[str, Any]],
+              ratings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    LOGGER.info("resolve_safety", query=query, year=year, make=make, model=model,
+                ids=lazy(lambda: [v["id"] for v in top]))
+    return {
+        "year": year,
+        "make": make,
+        "model": model,
+        "variants": [
+            {"VehicleId": v["id"], "description": v["text"], "ratings": r}
+            for v, r in zip(top, ratings)
+        ],
+        "source": "nhtsa.gov",
+    }
+
+
+def resolve_safety(query: Optional[str] = None,
+                   year: Optional[int] = None,
+                   make: Optional[str] = None,
+                   model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Resolve a car hint to the top NHTSA variants with their ratings, or None if ambiguous."""
+    query = dealias(query)
+    walk = walk_menus(query, year, make, model, TREE.years, TREE.makes, TREE.models, MATCH_CUTOFF, YEAR_FALLBACKS)
+    for menu_year, menu_make, menu_model, trim_hint in walk:
+        variants = TREE.variants(menu_year, menu_make, menu_model)
+        if not variants:
+            continue
+        top = _top_variants(variants, trim_hint)
+        with ThreadPoolExecutor(max_workers=len(top)) as pool:
+            ratings = list(pool.map(_ratings, [v["id"] for v in top]))
+
+        return _resolved(query, menu_year, menu_make, menu_model, top, ratings)
+
+    LOGGER.info("resolve_safety.ambiguous", query=query, year=year, make=make, model=model)
+    return None
+
+
+async def aresolve_safety(query: Optional[str] = None,
+                          year: Optional[int] = None,
+                          make: Optional[str] = None,
+                          model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Async `resolve_safety`; the ratings are fetched concurrently on the event loop."""
+    query = dealias(query)
+    walk = awalk_menus(query, year, make, model, TREE.ayears, TREE.amakes, TREE.amodels, MATCH_CUTOFF, YEAR_FALLBACKS)
+    async with aclosing(walk):
+        async for menu_year, menu_make, menu_model, trim_hint in walk:
+            variants = await TREE.avariants(menu_year, menu_make, menu_model)
+            if not variants:
+                continue
+            top = _top_variants(variants, trim_hint)
+            ratings = await asyncio.gather(*(_aratings(v["id"]) for v in top))
+            return _resolved(query, menu_year, menu_make, menu_model, top, list(ratings))
+
+    LOGGER.info("resolve_safety.ambiguous", query=query, year=year, make=make, model=model)
+    return None
@@ -0,0 +1,192 @@
+"""
+Persistent response cache for the FuelEconomy.gov and NHTSA tools
+
+Menu and vehicle responses are effectively static for a model year, so
+`_get_json` keeps them in a local SQLite file and serves repeats from disk
+(tens of microseconds) instead of the network. Each entry expires after a
+per-endpoint TTL (`TTL_RULES`, first matching path pattern wins) and the file
+is bounded by size: when it grows past RESPONSE_CACHE_MAX_MB the least
+recently used entries are evicted.
+
+Configuration (environment):
+- RESPONSE_CACHE          "on" (default) or "off"
+- RESPONSE_CACHE_PATH     SQLite file (default ".cache/responses.sqlite")
+- RESPONSE_CACHE_MAX_MB   size bound (default 256)
+
+The cache steps aside while a cassette is recording or replaying, so
+cassettes always see every request.
+"""
+
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from environment.cassette import get_cassette
+
+
+LOGGER = logging.getLogger("response_cache")
+
+DAY = 24 * 3600
+
+# namespace -> [(path pattern, ttl seconds)]; a TTL of 0 disables caching for that path
+TTL_RULES: Dict[str, List[Tuple[Pattern, int]]] = {
+    "fueleconomy": [
+        (re.compile(r"^vehicle/menu/year$"), 1 * DAY),       # new model years get added
+        (re.compile(r"^vehicle/menu/"), 7 * DAY),
+        (re.compile(r"^vehicle/\d+$"), 30 * DAY),
+    ],
+    "nhtsa": [
+        (re.compile(r"^SafetyRatings$"), 1 * DAY),
+        (re.compile(r"^SafetyRatings/modelyear/"), 7 * DAY),
+        (re.compile(r"^SafetyRatings/VehicleId/"), 7 * DAY),  # complaint/recall counts move
+    ],
+}
+DEFAULT_TTL = 1 * DAY
+
+# Last-access times are only refreshed this often, so hits rarely write
+_TOUCH_INTERVAL = 60.0
+
+
+def ttl_for(namespace: str, path: str) -> int:
+    for pattern, ttl in TTL_RULES.get(namespace, []):
+        if pattern.search(path.lstrip("/")):
+            return ttl
+    return DEFAULT_TTL
+
+
+def cache_key(namespace: str, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    return f"{namespace}:{path.lstrip('/')}?{json.dumps(params or {}, sort_keys=True, default=str)}"
+
+
+class ResponseCache:
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stores": 0, "evictions": 0}
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses (last_access)")
+        self._db.commit()
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, namespace: str, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        key = cache_key(namespace, path, params)
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, expires_at, last_access FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.stats["misses"] += 1
+                return None
+            value, expires_at, last_access = row
+            if expires_at <= now:
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                self._delete(key)
+                return None
+            if now - last_access > _TOUCH_INTERVAL:
+                self._db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                self._db.commit()
+            self.stats["hits"] += 1
+            return value
+
+    def put(self, namespace: str, path: str, params: Optional[Dict[str, Any]], value: str) -> None:
+        ttl = ttl_for(namespace, path)
+        if ttl <= 0:
+            return
+        key = cache_key(namespace, path, params)
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            self._delete(key)
+            self._db.execute(
+                "INSERT INTO responses (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now + ttl, now),
+            )
+            self._size += size
+            self.stats["stores"] += 1
+            if self._size > self.max_bytes:
+                self._evict()
+            self._db.commit()
+
+    def _delete(self, key: str) -> None:
+        row = self._db.execute("DELETE FROM responses WHERE key = ? RETURNING size", (key,)).fetchone()
+        if row is not None:
+            self._size -= row[0]
+
+    def _evict(self) -> None:
+        # Drop expired entries first, then least recently used ones down to 90% of the bound
+        target = int(self.max_bytes * 0.9)
+        removed = self._db.execute(
+            "DELETE FROM responses WHERE expires_at <= ? RETURNING size", (time.time(),)
+        ).fetchall()
+        rows = self._db.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall()
+        self._size -= sum(r[0] for r in removed)
+        evicted = len(removed)
+        for key, size in rows:
+            if self._size <= target:
+                break
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._size -= size
+            evicted += 1
+        self.stats["evictions"] += evicted
+        LOGGER.info(f"Evicted {evicted} cached responses; size={self._size} bytes")
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {**self.stats, "entries": entries, "bytes": self._size, "max_bytes": self.max_bytes}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+            self._size = 0
+
+
+class _NullCache:
+    """Stand-in used when caching is off or a cassette is active."""
+
+    def get(self, namespace: str, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        return None
+
+    def put(self, namespace: str, path: str, params: Optional[Dict[str, Any]], value: str) -> None:
+        pass
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+_NULL_CACHE = _NullCache()
+
+
+def get_response_cache():
+    """Process-wide response cache, or a no-op cache if disabled."""
+    global _cache
+    if os.getenv("RESPONSE_CACHE", "on") == "off" or get_cassette().mode != "off":
+        return _NULL_CACHE
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    os.getenv("RESPONSE_CACHE_PATH", os.path.join(".cache", "responses.sqlite")),
+                    int(float(os.getenv("RESPONSE_CACHE_MAX_MB", "256")) * 1024 * 1024),
+                )
+    return _cache
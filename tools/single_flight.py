@@ -0,0 +1,96 @@
+"""
+Request coalescing ("single-flight")
+
+When several callers ask for the same key at the same moment, only the
+first (the leader) runs the function; the others wait for and share its
+result or exception. Nothing is cached once the call finishes — that is the
+response cache's job — this only collapses concurrent duplicates, e.g. many
+episodes fanning out to the same `fe_menu_makes(2025)`.
+
+`SingleFlight` is for threads, `AsyncSingleFlight` for coroutines on one
+event loop.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+import asyncio
+import threading
+
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "shared": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.stats["shared"] += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+
+class AsyncSingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.stats = {"calls": 0, "shared": 0}
+
+    async def do(self, key: Hashable, afn: Callable[[], Awaitable[T]]) -> T:
+        # Futures belong to one loop, so the loop is part of the key
+        loop = asyncio.get_running_loop()
+        key = (id(loop), key)
+        self.stats["calls"] += 1
+
+        future = self._calls.get(key)
+        if future is not None:
+            self.stats["shared"] += 1
+            # Shield so a cancelled follower does not cancel the leader's request
+            return await asyncio.shield(future)
+
+        future = self._calls[key] = loop.create_future()
+        try:
+            result: Any = await afn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark it retrieved so an unshared failure does not log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            del self._calls[key]
@@ -0,0 +1,222 @@
+"""
+Structured, lazy and sampled logging for the hot tool paths
+
+    LOG = get_logger("fueleconomy")
+    LOG.info("http.response", url=url, status=resp.status, bytes=len(resp.text), body=preview(resp.text))
+
+An event is a name plus keyword fields, emitted through the stdlib logger
+of the same name so existing handlers keep working. Nothing is formatted
+unless a handler actually emits the record:
+- a disabled level returns after one `isEnabledFor` check
+- `lazy(fn)` and `preview(...)` fields are only evaluated when rendered
+- the text form ("http.response url=... status=200") is built by the handler
+
+Per-logger sampling keeps 1 in N INFO/DEBUG events (warnings and errors are
+always kept), configured with LOG_SAMPLE, e.g. "fueleconomy=0.1,nhtsa=0.05".
+
+`configure_json_sink(path)` (or LOG_JSON_PATH) adds a buffered JSON-lines
+handler that writes the fields as structured records instead of text.
+"""
+
+from typing import Any, Callable, Dict, Optional
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+
+
+PREVIEW_CHARS = 300
+
+
+class _Preview:
+    __slots__ = ("text", "limit")
+
+    def __init__(self, text: Optional[str], limit: int = PREVIEW_CHARS):
+        self.text = text
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = self.text or ""
+        if len(text) <= self.limit:
+            return text
+        return text[:self.limit] + f"... [truncated {len(text) - self.limit} chars]"
+
+
+def preview(text: Optional[str], limit: int = PREVIEW_CHARS) -> _Preview:
+    """Lazily truncated view of a (possibly large) text field."""
+    return _Preview(text, limit)
+
+
+class _Lazy:
+    __slots__ = ("fn",)
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+
+
+def lazy(fn: Callable[[], Any]) -> _Lazy:
+    """Field computed by `fn()` only if the event is emitted; other callables are logged as they are."""
+    return _Lazy(fn)
+
+
+def _render(value: Any) -> Any:
+    if isinstance(value, _Preview):
+        return str(value)
+    if isinstance(value, _Lazy):
+        return value.fn()
+    return value
+
+
+class _Event:
+    """Log message whose text is only built when a handler formats it."""
+
+    __slots__ = ("name", "fields")
+
+    def __init__(self, name: str, fields: Dict[str, Any]):
+        self.name = name
+        self.fields = fields
+
+    def rendered(self) -> Dict[str, Any]:
+        return {k: _render(v) for k, v in self.fields.items()}
+
+    def __str__(self) -> str:
+        parts = [self.name]
+        parts.extend(f"{k}={v!r}" if isinstance(v, str) else f"{k}={v}" for k, v in self.rendered().items())
+        return " ".join(parts)
+
+
+def _parse_sampling(spec: str) -> Dict[str, float]:
+    rates = {}
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        name, _, rate = item.partition("=")
+        try:
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+_SAMPLING = _parse_sampling(os.getenv("LOG_SAMPLE", ""))
+
+
+def sample_rate(name: str) -> float:
+    # The most specific configured prefix wins: "fueleconomy.agent" falls back to "fueleconomy"
+    while name:
+        if name in _SAMPLING:
+            return _SAMPLING[name]
+        name = name.rpartition(".")[0]
+    return _SAMPLING.get("*", 1.0)
+
+
+class StructuredLogger:
+    def __init__(self, name: str, sample: Optional[float] = None):
+        self.logger = logging.getLogger(name)
+        rate = sample_rate(name) if sample is None else sample
+        self._every = 0 if rate <= 0 else max(1, round(1 / rate))
+        self._counter = itertools.count()
+
+    def _sampled_out(self, level: int) -> bool:
+        if level >= logging.WARNING or self._every == 1:
+            return False
+        return self._every == 0 or next(self._counter) % self._every != 0
+
+    def _log(self, level: int, event: str, exc_info: bool, fields: Dict[str, Any]) -> None:
+        if not self.logger.isEnabledFor(level) or self._sampled_out(level):
+            return
+        # Every public method calls this directly, so the record points at their caller:
+        # 1 = _log, 2 = the public method, 3 = the call site
+        self.logger.log(level, _Event(event, fields), exc_info=exc_info, stacklevel=3)
+
+    def log(self, level: int, event: str, exc_info: bool = False, **fields: Any) -> None:
+        self._log(level, event, exc_info, fields)
+
+    def debug(self, event: str, **fields: Any) -> None:
+        self._log(logging.DEBUG, event, False, fields)
+
+    def info(self, event: str, **fields: Any) -> None:
+        self._log(logging.INFO, event, False, fields)
+
+    def warning(self, event: str, **fields: Any) -> None:
+        self._log(logging.WARNING, event, False, fields)
+
+    def error(self, event: str, **fields: Any) -> None:
+        self._log(logging.ERROR, event, False, fields)
+
+    def exception(self, event: str, **fields: Any) -> None:
+        self._log(logging.ERROR, event, True, fields)
+
+
+_loggers: Dict[str, StructuredLogger] = {}
+
+
+def get_logger(name: str) -> StructuredLogger:
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers.setdefault(name, StructuredLogger(name))
+    return logger
+
+
+# ---------- JSON-lines sink ----------
+
+
+class JsonLinesHandler(logging.Handler):
+    """Writes one JSON object per record; structured events keep their fields."""
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        super().__init__()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8", buffering=1 << 16)
+        self._flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._write_lock = threading.Lock()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            entry = {"ts": round(record.created, 6), "level": record.levelname, "logger": record.name}
+            if isinstance(record.msg, _Event):
+                entry["event"] = record.msg.name
+                entry.update(record.msg.rendered())
+            else:
+                entry["message"] = record.getMessage()
+            if record.exc_info:
+                entry["exc"] = logging.Formatter().formatException(record.exc_info)
+            line = json.dumps(entry, default=str, separators=(",", ":"))
+            with self._write_lock:
+                self._file.write(line + "\n")
+                now = time.monotonic()
+                if now - self._last_flush >= self._flush_interval or record.levelno >= logging.WARNING:
+                    self._file.flush()
+                    self._last_flush = now
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        with self._write_lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self) -> None:
+        with self._write_lock:
+            if not self._file.closed:
+                self._file.close()
+        super().close()
+
+
+def configure_json_sink(path: Optional[str] = None, level: int = logging.INFO) -> Optional[JsonLinesHandler]:
+    """Send records at `level` and above to a JSON-lines file, without making the console noisier."""
+    path = path or os.getenv("LOG_JSON_PATH")
+    if not path:
+        return None
+    root = logging.getLogger()
+    console_level = root.getEffectiveLevel()
+    for handler in root.handlers:
+        if handler.level == logging.NOTSET:
+            handler.setLevel(console_level)
+    handler = JsonLinesHandler(path)
+    handler.setLevel(level)
+    root.addHandler(handler)
+    root.setLevel(min(console_level, level))
+    return handler
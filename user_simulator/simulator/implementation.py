@@ -1,4 +1,4 @@
-from litellm import completion
+from llm_provider.provider import complete, acomplete
 from prompts.user_prompts import USER_SIMULATION_SYSTEM_PROMPT, CarState
 from typing import Optional
 from user_simulator.user_interface import IUserSimulator
@@ -8,6 +8,8 @@ import random
 from pathlib import Path
 import logging
 
+SIMULATOR_MODEL = "openai/gpt-4o"
+
 
 class UserImplementation(IUserSimulator):
     def __init__(self, args, persona: str, raw_review: str, goal: str):
@@ -55,12 +57,19 @@ class UserImplementation(IUserSimulator):
     def chat(self, new_message: Optional[str] = None) -> str:
         if new_message:
             self.messages.append({"role": "user", "content": new_message})
-        response = completion(
-            model="openai/gpt-4o",
-            messages=self.messages
-        )
+        content = complete(SIMULATOR_MODEL, self.messages)
+        self.messages.append({
+            "role": "assistant",
+            "content": content
+        })
+        return content
+
+    async def achat(self, new_message: Optional[str] = None) -> str:
+        if new_message:
+            self.messages.append({"role": "user", "content": new_message})
+        content = await acomplete(SIMULATOR_MODEL, self.messages)
         self.messages.append({
             "role": "assistant",
-            "content": response.choices[0].message.content
+            "content": content
         })
-        return response.choices[0].message.content
+        return content
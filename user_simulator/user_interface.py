@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from typing import Optional
+import asyncio
 
 
 class IUserSimulator(ABC):
@@ -11,6 +12,10 @@ class IUserSimulator(ABC):
     def chat(self, text: Optional[str]) -> str:
         pass
 
+    async def achat(self, text: Optional[str]) -> str:
+        """Async chat; defaults to running `chat` in a worker thread."""
+        return await asyncio.to_thread(self.chat, text)
+
     def get_persona(self) -> str:
         return self.persona
 